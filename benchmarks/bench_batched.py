@@ -0,0 +1,68 @@
+"""
+Report the realtime factor of the batched decoding engine at several batch sizes.
+
+The realtime factor is processing seconds per second of audio, so lower is
+better and 0.1 means ten times faster than realtime. The stock
+``model.transcribe`` is included as the baseline.
+
+Usage:
+    python -m benchmarks.bench_batched [--model tiny] [--input FILE] [--duration SECONDS]
+                                       [--batch-sizes 1,4,8,16]
+"""
+
+import argparse
+import json
+import time
+from functools import partial
+from pathlib import Path
+
+import numpy as np
+import torch
+import whisper
+
+from src.chunking import SAMPLE_RATE
+from src.transcriber import BatchedEngine
+
+
+def synthetic_audio(duration: float) -> np.ndarray:
+    """Tone bursts separated by short pauses, so the window splitter has places to cut."""
+    t = np.arange(int(duration * SAMPLE_RATE)) / SAMPLE_RATE
+    audio = 0.3 * np.sin(2 * np.pi * 220 * t) * (np.sin(2 * np.pi * 0.2 * t) > -0.9)
+    return audio.astype(np.float32)
+
+
+def realtime_factor(fn, duration: float) -> float:
+    start = time.perf_counter()
+    with torch.no_grad():
+        fn()
+    return round((time.perf_counter() - start) / duration, 4)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--model", default="tiny")
+    parser.add_argument("--input", type=Path, help="Audio file to use instead of a synthetic one")
+    parser.add_argument("--duration", type=float, default=300, help="Synthetic audio seconds")
+    parser.add_argument("--batch-sizes", default="1,4,8,16")
+    parser.add_argument("--language", default="en")
+    args = parser.parse_args()
+
+    audio = whisper.load_audio(str(args.input)) if args.input else synthetic_audio(args.duration)
+    duration = len(audio) / SAMPLE_RATE
+    model = whisper.load_model(args.model, device="cpu")
+
+    report = {"model": args.model, "audio_seconds": round(duration, 1), "rtf": {}}
+    report["rtf"]["stock"] = realtime_factor(
+        lambda: model.transcribe(audio, language=args.language, fp16=False), duration
+    )
+    for batch_size in (int(b) for b in args.batch_sizes.split(",")):
+        engine = BatchedEngine(model, batch_size=batch_size, language=args.language)
+        report["rtf"][f"batched_{batch_size}"] = realtime_factor(
+            partial(engine.transcribe, audio), duration
+        )
+
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""
+Compare the forced mp3 re-encode against keeping the native audio stream.
+
+For each path this measures what happens after yt-dlp has fetched the stream:
+the FFmpegExtractAudio transcode (mp3 path only) followed by Whisper's decode
+to 16 kHz PCM. Wall time and CPU seconds include the ffmpeg subprocesses.
+
+Usage:
+    python -m benchmarks.bench_codec [--input FILE] [--duration SECONDS]
+"""
+
+import argparse
+import json
+import resource
+import subprocess
+import tempfile
+import time
+from pathlib import Path
+
+from whisper.audio import load_audio
+
+
+def _cpu_seconds() -> float:
+    total = 0.0
+    for who in (resource.RUSAGE_SELF, resource.RUSAGE_CHILDREN):
+        usage = resource.getrusage(who)
+        total += usage.ru_utime + usage.ru_stime
+    return total
+
+
+def measure(fn) -> dict:
+    cpu = _cpu_seconds()
+    start = time.perf_counter()
+    fn()
+    return {
+        "wall_s": round(time.perf_counter() - start, 3),
+        "cpu_s": round(_cpu_seconds() - cpu, 3),
+    }
+
+
+def generate_native_audio(path: Path, duration: float) -> Path:
+    """Write a synthetic opus stream in webm, the format YouTube serves as bestaudio."""
+    subprocess.run(
+        [
+            "ffmpeg",
+            "-nostdin",
+            "-y",
+            "-loglevel",
+            "error",
+            "-f",
+            "lavfi",
+            "-i",
+            f"sine=frequency=440:duration={duration}",
+            "-c:a",
+            "libopus",
+            "-b:a",
+            "128k",
+            str(path),
+        ],
+        check=True,
+    )
+    return path
+
+
+def transcode_mp3(source: Path, target: Path) -> None:
+    # Mirrors yt-dlp's FFmpegExtractAudio with preferredcodec=mp3 and default quality
+    subprocess.run(
+        [
+            "ffmpeg",
+            "-nostdin",
+            "-y",
+            "-loglevel",
+            "error",
+            "-i",
+            str(source),
+            "-vn",
+            "-acodec",
+            "libmp3lame",
+            "-q:a",
+            "5",
+            str(target),
+        ],
+        check=True,
+    )
+
+
+def run(source: Path, workdir: Path) -> dict:
+    mp3_path = workdir / "episode.mp3"
+
+    native = measure(lambda: load_audio(str(source)))
+    transcode = measure(lambda: transcode_mp3(source, mp3_path))
+    decode = measure(lambda: load_audio(str(mp3_path)))
+
+    return {
+        "input": str(source),
+        "native": native,
+        "mp3": {
+            "transcode": transcode,
+            "decode": decode,
+            "wall_s": round(transcode["wall_s"] + decode["wall_s"], 3),
+            "cpu_s": round(transcode["cpu_s"] + decode["cpu_s"], 3),
+        },
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--input", type=Path, help="Audio file to use instead of a synthetic one")
+    parser.add_argument("--duration", type=float, default=600, help="Synthetic audio seconds")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        workdir = Path(tmp)
+        source = args.input or generate_native_audio(workdir / "episode.webm", args.duration)
+        print(json.dumps(run(source, workdir), indent=2))
+
+
+if __name__ == "__main__":
+    main()
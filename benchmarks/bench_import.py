@@ -0,0 +1,98 @@
+"""
+Cold-start budget for the CLI.
+
+Runs ``python -X importtime -m src <args>`` (``--help`` by default) in fresh
+interpreters and reports the best wall time, the cumulative import time of
+each top-level module and whether any of the heavy modules (torch, whisper,
+yt_dlp) were imported. Exits non-zero when the best wall time exceeds
+``--budget`` seconds or a heavy module shows up, so it can gate CI.
+
+Usage:
+    python -m benchmarks.bench_import [--budget 1.0] [--repeat 5] [--top 10]
+                                      [-- --version]
+"""
+
+import argparse
+import json
+import re
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).parent.parent
+HEAVY_MODULES = ("torch", "whisper", "yt_dlp")
+_LINE_RE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+
+def parse_importtime(stderr: str) -> dict[str, int]:
+    """Cumulative microseconds of every module imported at the top level."""
+    top_level = {}
+    for line in stderr.splitlines():
+        match = _LINE_RE.match(line)
+        # Top-level imports are indented by exactly one space
+        if match and len(match.group(3)) == 1:
+            top_level[match.group(4)] = int(match.group(2))
+    return top_level
+
+
+def run_once(args: list[str]) -> tuple[float, str]:
+    started = time.perf_counter()
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-m", "src", *args],
+        cwd=REPO_ROOT,
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    wall = time.perf_counter() - started
+    if completed.returncode != 0:
+        raise RuntimeError(f"podcast-ai-agent {' '.join(args)} failed: {completed.stderr[-2000:]}")
+    return wall, completed.stderr
+
+
+def heavy_imports(stderr: str) -> list[str]:
+    imported = set()
+    for line in stderr.splitlines():
+        match = _LINE_RE.match(line)
+        if match:
+            imported.add(match.group(4).split(".")[0])
+    return sorted(imported & set(HEAVY_MODULES))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--budget", type=float, default=1.0, help="Allowed wall seconds")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--top", type=int, default=10, help="Slowest modules to list")
+    parser.add_argument("cli_args", nargs="*", default=["--help"])
+    args = parser.parse_args()
+
+    runs = [run_once(args.cli_args) for _ in range(args.repeat)]
+    wall, stderr = min(runs, key=lambda r: r[0])
+    modules = parse_importtime(stderr)
+    heavy = heavy_imports(stderr)
+
+    report = {
+        "command": ["podcast-ai-agent", *args.cli_args],
+        "wall_s": round(wall, 4),
+        "import_s": round(sum(modules.values()) / 1e6, 4),
+        "budget_s": args.budget,
+        "heavy_modules": heavy,
+        "slowest": {
+            name: round(us / 1e6, 4)
+            for name, us in sorted(modules.items(), key=lambda m: -m[1])[: args.top]
+        },
+    }
+    print(json.dumps(report, indent=2))
+
+    if heavy:
+        print(f"\nHeavy modules imported at startup: {', '.join(heavy)}")
+        sys.exit(1)
+    if wall > args.budget:
+        print(f"\nCold start took {wall:.3f}s, over the {args.budget:.3f}s budget")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+Compare fp32 against dynamically quantized int8 Whisper models on CPU.
+
+For every model size this transcribes the same audio once per precision, each
+in a fresh process so peak RSS is not shared between runs, and reports:
+
+- ``load_s``: model load time (for int8, from the on-disk quantized cache
+  after the first run; ``--requantize`` measures the one-off quantization)
+- ``rtf``: decode wall time divided by the audio duration
+- ``peak_rss_mb``: peak resident set size of the process
+- ``word_agreement``: share of fp32 words reproduced by int8, from a word-level
+  alignment (1.0 = identical transcripts)
+
+Agreement only means something on real speech, so pass ``--input`` with a
+podcast excerpt; the synthetic corpus file used by default only exercises the
+timing path.
+
+Usage:
+    python -m benchmarks.bench_quantization [--models tiny,base,small]
+                                            [--input FILE] [--language en]
+"""
+
+import argparse
+import difflib
+import json
+import multiprocessing
+import resource
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from benchmarks.corpus import DEFAULT_DIR, ensure_corpus
+
+
+def _run(model: str, precision: str, audio_path: str, language: str, requantize: bool) -> dict:
+    from whisper.audio import SAMPLE_RATE, load_audio
+
+    from src.config import WhisperConfig
+    from src.quantization import quantized_cache_path
+    from src.transcriber import Transcriber
+
+    if requantize:
+        quantized_cache_path(model).unlink(missing_ok=True)
+
+    config = WhisperConfig(model=model, device="cpu", precision=precision, language=language)
+    transcriber = Transcriber(config)
+    started = time.perf_counter()
+    transcriber._load_model()
+    load_s = time.perf_counter() - started
+
+    audio = load_audio(audio_path)
+    started = time.perf_counter()
+    result = transcriber.transcribe(Path(audio_path))
+    decode_s = time.perf_counter() - started
+
+    return {
+        "load_s": round(load_s, 3),
+        "rtf": round(decode_s / (len(audio) / SAMPLE_RATE), 4),
+        "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        "text": result["text"],
+    }
+
+
+def word_agreement(reference: str, hypothesis: str) -> float:
+    ref = reference.lower().split()
+    hyp = hypothesis.lower().split()
+    if not ref:
+        return 1.0 if not hyp else 0.0
+    matcher = difflib.SequenceMatcher(a=ref, b=hyp, autojunk=False)
+    matched = sum(block.size for block in matcher.get_matching_blocks())
+    return round(matched / max(len(ref), len(hyp)), 4)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--models", default="tiny,base,small")
+    parser.add_argument("--input", type=Path, help="Audio file (default: 60 s synthetic)")
+    parser.add_argument("--language", default="en")
+    parser.add_argument("--requantize", action="store_true", help="Time quantization too")
+    args = parser.parse_args()
+
+    audio_path = args.input or ensure_corpus([60.0], DEFAULT_DIR)[0]
+    context = multiprocessing.get_context("spawn")
+
+    report = {}
+    for model in args.models.split(","):
+        runs = {}
+        for precision in ("fp32", "int8"):
+            with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+                runs[precision] = pool.submit(
+                    _run, model, precision, str(audio_path), args.language, args.requantize
+                ).result()
+        report[model] = {
+            precision: {k: v for k, v in run.items() if k != "text"}
+            for precision, run in runs.items()
+        }
+        report[model]["word_agreement"] = word_agreement(runs["fp32"]["text"], runs["int8"]["text"])
+        print(f"{model}: {json.dumps(report[model])}", file=sys.stderr)
+
+    print(json.dumps({"audio": str(audio_path), "models": report}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,284 @@
+"""
+Offline benchmark suite with stored baselines for regression checks.
+
+Runs without network access on a synthetic corpus (see ``benchmarks.corpus``)
+and times:
+
+- ``validate``: ``validate_audio_file`` (ffprobe) per corpus file
+- ``decode``: Whisper's ffmpeg decode to 16 kHz PCM per corpus file
+- ``load``: loading the ``--load-model`` model in a fresh process from Whisper's
+  checkpoint, from its mappable copy the first time (``mmap_cold``, which
+  includes writing the copy) and from the existing copy (``mmap_warm``)
+- ``transcribe``: ``Transcriber.transcribe`` with the ``tiny`` model on files up
+  to ``--transcribe-max`` seconds
+- ``output``: every ``OutputWriter`` format on 1k, 10k and 100k segment lists
+- ``process``: a full ``cli.process`` run with the downloader stubbed out
+
+Each benchmark reports the best wall time and its CPU seconds over
+``--repeat`` runs. ``--save NAME`` stores the results as
+``benchmarks/baselines/NAME.json``; ``--compare NAME`` flags benchmarks slower
+than that baseline by more than ``--threshold`` and exits non-zero. Baselines
+only make sense on the machine that recorded them.
+
+Usage:
+    python -m benchmarks.bench_suite [--quick] [--durations 60,600,3600,10800]
+                                     [--only validate,decode,...] [--repeat 3]
+                                     [--load-model tiny]
+                                     [--save NAME] [--compare NAME]
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import resource
+import sys
+import tempfile
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from pathlib import Path
+from unittest.mock import patch
+
+import yaml
+from whisper.audio import load_audio
+
+from benchmarks.bench_codec import measure
+from benchmarks.corpus import DEFAULT_DIR, ensure_corpus, synthetic_segments
+from src.config import CacheConfig, WhisperConfig
+from src.output import OutputWriter
+from src.transcriber import Transcriber
+from src.utils import validate_audio_file
+
+BASELINE_DIR = Path(__file__).parent / "baselines"
+REPO_ROOT = Path(__file__).parent.parent
+BENCHMARKS = ("validate", "decode", "load", "transcribe", "output", "process")
+SEGMENT_COUNTS = (1_000, 10_000, 100_000)
+
+
+def best_of(fn: Callable[[], None], repeat: int) -> dict:
+    runs = [measure(fn) for _ in range(repeat)]
+    return min(runs, key=lambda r: r["wall_s"])
+
+
+def bench_validate(corpus: list[Path], repeat: int) -> dict[str, dict]:
+    return {
+        f"validate/{path.stem}": best_of(partial(validate_audio_file, path), repeat)
+        for path in corpus
+    }
+
+
+def bench_decode(corpus: list[Path], repeat: int) -> dict[str, dict]:
+    return {
+        f"decode/{path.stem}": best_of(partial(load_audio, str(path)), repeat) for path in corpus
+    }
+
+
+def _load_in_process(model: str, fast_load: bool, fresh: bool) -> dict:
+    from src.weight_cache import mmap_cache_path
+
+    if fresh:
+        mmap_cache_path(model).unlink(missing_ok=True)
+    config = WhisperConfig(model=model, device="cpu", fast_load=fast_load)
+    result = measure(lambda: Transcriber(config)._load_model())
+    result["peak_rss_mb"] = round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+    return result
+
+
+def bench_load(model: str, repeat: int) -> dict[str, dict]:
+    context = multiprocessing.get_context("spawn")
+
+    def load(fast_load: bool, fresh: bool = False) -> dict:
+        # A new interpreter each time, so the model registry starts empty
+        with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+            return pool.submit(_load_in_process, model, fast_load, fresh).result()
+
+    def best(fast_load: bool) -> dict:
+        return min((load(fast_load) for _ in range(repeat)), key=lambda r: r["wall_s"])
+
+    return {
+        f"load/{model}_checkpoint": best(fast_load=False),
+        f"load/{model}_mmap_cold": load(fast_load=True, fresh=True),
+        f"load/{model}_mmap_warm": best(fast_load=True),
+    }
+
+
+def bench_transcribe(
+    corpus: list[Path], durations: list[float], repeat: int, max_seconds: float
+) -> dict[str, dict]:
+    config = WhisperConfig(model="tiny", language="en")
+    cache = CacheConfig(audio_enabled=False, results_enabled=False)
+    transcriber = Transcriber(config, cache)
+    transcriber._load_model()  # Keep the one-off model load out of the timings
+
+    results = {}
+    for path, duration in zip(corpus, durations):
+        if duration > max_seconds:
+            continue
+        results[f"transcribe/{path.stem}"] = best_of(partial(transcriber.transcribe, path), repeat)
+    return results
+
+
+def bench_output(repeat: int) -> dict[str, dict]:
+    results = {}
+    for count in SEGMENT_COUNTS:
+        segments = synthetic_segments(count)
+        result = {
+            "text": "".join(s["text"] for s in segments),
+            "segments": segments,
+            "language": "en",
+        }
+        # Writer method and its argument, per format
+        writers = {
+            "txt": (OutputWriter.write_txt, result["text"]),
+            "json": (OutputWriter.write_json, result),
+            "srt": (OutputWriter.write_srt, segments),
+            "vtt": (OutputWriter.write_vtt, segments),
+            "jsonl": (OutputWriter.write_jsonl, segments),
+        }
+        for fmt, (write, data) in writers.items():
+
+            def run(write=write, data=data):
+                with tempfile.TemporaryDirectory() as tmp:
+                    write(OutputWriter(Path(tmp) / "episode", {"url": "bench"}), data)
+
+            results[f"output/{fmt}_{count}"] = best_of(run, repeat)
+    return results
+
+
+def bench_process(corpus: list[Path], repeat: int) -> dict[str, dict]:
+    from typer.testing import CliRunner
+
+    from src.cli import app
+
+    source = corpus[0]
+    runner = CliRunner()
+
+    def run():
+        with (
+            tempfile.TemporaryDirectory() as tmp,
+            patch("src.jobs.download_audio", return_value=source),
+        ):
+            # The default config logs to the working directory; keep the log in tmp
+            settings = yaml.safe_load((REPO_ROOT / "config" / "default.yaml").read_text())
+            settings["logging"]["file"] = str(Path(tmp) / "podcast_ai_agent.log")
+            config_path = Path(tmp) / "config.yaml"
+            config_path.write_text(yaml.safe_dump(settings))
+            outcome = runner.invoke(
+                app,
+                [
+                    "process",
+                    "--url",
+                    "https://www.youtube.com/watch?v=benchmark0",
+                    "--output",
+                    tmp,
+                    "--model",
+                    "tiny",
+                    "--language",
+                    "en",
+                    "--format",
+                    "srt",
+                    "--config",
+                    str(config_path),
+                    # Never hand the run to a daemon that happens to be listening
+                    "--local",
+                ],
+            )
+            if outcome.exit_code != 0:
+                raise RuntimeError(f"cli.process failed: {outcome.output}")
+
+    # The first run loads the model; later runs reuse the process-wide registry
+    results = {f"process/{source.stem}_cold": measure(run)}
+    results[f"process/{source.stem}_warm"] = best_of(run, repeat)
+    return results
+
+
+def compare(results: dict[str, dict], baseline: dict[str, dict], threshold: float) -> list[str]:
+    """Print a comparison table and return the benchmarks that regressed."""
+    regressions = []
+    print(f"{'benchmark':<40} {'baseline':>10} {'current':>10} {'change':>8}")
+    for name, current in sorted(results.items()):
+        before = baseline.get(name)
+        if before is None or not before["wall_s"]:
+            print(f"{name:<40} {'-':>10} {current['wall_s']:>10.3f} {'new':>8}")
+            continue
+        change = current["wall_s"] / before["wall_s"] - 1
+        flag = ""
+        # Ignore sub-10ms timings, which are mostly noise
+        if change > threshold and current["wall_s"] - before["wall_s"] > 0.01:
+            regressions.append(name)
+            flag = "  REGRESSION"
+        print(
+            f"{name:<40} {before['wall_s']:>10.3f} {current['wall_s']:>10.3f} "
+            f"{change:>+8.1%}{flag}"
+        )
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--durations", default="60,600,3600,10800", help="Corpus seconds")
+    parser.add_argument("--quick", action="store_true", help="Only the 1 minute file, 1 run")
+    parser.add_argument("--only", default=",".join(BENCHMARKS), help="Benchmarks to run")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument(
+        "--transcribe-max", type=float, default=600, help="Longest file to transcribe, seconds"
+    )
+    parser.add_argument("--load-model", default="tiny", help="Model for the load benchmark")
+    parser.add_argument("--corpus-dir", type=Path, default=DEFAULT_DIR)
+    parser.add_argument("--save", metavar="NAME", help="Store results as a baseline")
+    parser.add_argument("--compare", metavar="NAME", help="Compare against a stored baseline")
+    parser.add_argument("--threshold", type=float, default=0.10, help="Allowed slowdown")
+    args = parser.parse_args()
+
+    durations = [60.0] if args.quick else [float(d) for d in args.durations.split(",")]
+    repeat = 1 if args.quick else args.repeat
+    selected = set(args.only.split(","))
+    unknown = selected - set(BENCHMARKS)
+    if unknown:
+        parser.error(f"Unknown benchmarks: {', '.join(sorted(unknown))}")
+
+    corpus = ensure_corpus(durations, args.corpus_dir)
+    results: dict[str, dict] = {}
+    if "validate" in selected:
+        results.update(bench_validate(corpus, repeat))
+    if "decode" in selected:
+        results.update(bench_decode(corpus, repeat))
+    if "load" in selected:
+        results.update(bench_load(args.load_model, repeat))
+    if "transcribe" in selected:
+        results.update(bench_transcribe(corpus, durations, repeat, args.transcribe_max))
+    if "output" in selected:
+        results.update(bench_output(repeat))
+    if "process" in selected:
+        results.update(bench_process(corpus, repeat))
+
+    report = {
+        "machine": {
+            "platform": platform.platform(),
+            "processor": platform.processor() or platform.machine(),
+            "cpu_count": os.cpu_count(),
+            "python": platform.python_version(),
+        },
+        "results": results,
+    }
+
+    if args.save:
+        BASELINE_DIR.mkdir(exist_ok=True)
+        path = BASELINE_DIR / f"{args.save}.json"
+        path.write_text(json.dumps(report, indent=2) + "\n")
+        print(f"Saved baseline to {path}")
+
+    if args.compare:
+        baseline = json.loads((BASELINE_DIR / f"{args.compare}.json").read_text())
+        regressions = compare(results, baseline["results"], args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} benchmark(s) regressed by more than {args.threshold:.0%}")
+            sys.exit(1)
+    elif not args.save:
+        print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Synthetic speech-like audio for offline benchmarks.
+
+Files are 16 kHz mono 16-bit WAV, written block by block with the ``wave``
+module so hours of audio never sit in memory at once. The signal is a set of
+harmonic "syllables" with pauses between phrases, which gives the silence
+splitter and Whisper's no-speech detection realistic material. Generation is
+deterministic, so every machine benchmarks the same samples.
+"""
+
+import wave
+from collections.abc import Iterable
+from pathlib import Path
+
+import numpy as np
+
+SAMPLE_RATE = 16000
+BLOCK_SECONDS = 60
+DEFAULT_DIR = Path(__file__).parent / ".corpus"
+
+
+def _block(index: int, seconds: float) -> np.ndarray:
+    rng = np.random.default_rng(index)
+    t = np.arange(int(seconds * SAMPLE_RATE)) / SAMPLE_RATE
+
+    # Phrases of about 4 s separated by 0.6 s pauses, with 5 Hz syllable rate
+    phrase = ((t + index * 0.37) % 4.6) < 4.0
+    syllables = 0.5 + 0.5 * np.sin(2 * np.pi * 5 * t) ** 2
+    pitch = 120 + 30 * np.sin(2 * np.pi * 0.3 * t + index)
+    phase = 2 * np.pi * np.cumsum(pitch) / SAMPLE_RATE
+    voice = sum(np.sin(k * phase) / k for k in range(1, 6))
+
+    signal = 0.25 * voice * syllables * phrase + 0.005 * rng.standard_normal(len(t))
+    return (np.clip(signal, -1, 1) * 32767).astype(np.int16)
+
+
+def write_audio(path: Path, duration: float) -> Path:
+    """Write ``duration`` seconds of synthetic audio to ``path``."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(".tmp")
+    with wave.open(str(tmp_path), "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(SAMPLE_RATE)
+        remaining = duration
+        index = 0
+        while remaining > 0:
+            seconds = min(BLOCK_SECONDS, remaining)
+            wav.writeframes(_block(index, seconds).tobytes())
+            remaining -= seconds
+            index += 1
+    tmp_path.replace(path)
+    return path
+
+
+def ensure_corpus(durations: Iterable[float], directory: Path = DEFAULT_DIR) -> list[Path]:
+    """Return one file per duration, generating the ones not cached in ``directory``."""
+    paths = []
+    for duration in durations:
+        path = directory / f"synthetic_{int(duration)}s.wav"
+        if not path.exists():
+            write_audio(path, duration)
+        paths.append(path)
+    return paths
+
+
+def synthetic_segments(count: int) -> list[dict]:
+    """Whisper-shaped segments of about 4 s each, for output writer benchmarks."""
+    words = "the quick brown fox jumps over the lazy dog while podcasts keep on talking".split()
+    segments = []
+    for i in range(count):
+        start = i * 4.6
+        text = " " + " ".join(words[(i + k) % len(words)] for k in range(12))
+        segments.append(
+            {
+                "id": i,
+                "seek": int(start * 100),
+                "start": round(start, 3),
+                "end": round(start + 4.0, 3),
+                "text": text,
+                "tokens": list(range(50364, 50376)),
+                "temperature": 0.0,
+                "avg_logprob": -0.3,
+                "compression_ratio": 1.4,
+                "no_speech_prob": 0.01,
+            }
+        )
+    return segments
@@ -0,0 +1,78 @@
+import logging
+import os
+import threading
+from pathlib import Path
+
+import numpy as np
+from whisper.audio import SAMPLE_RATE, load_audio
+
+from .utils import file_sha256
+
+logger = logging.getLogger("podcast_ai_agent")
+
+
+class AudioCache:
+    """
+    Cache of decoded 16 kHz mono float32 audio stored as ``.npy`` files.
+
+    Entries live in ``audio/`` under the cache directory and are keyed by the
+    file's content hash, so reruns with another model or task skip ffmpeg
+    entirely. Arrays are returned memory-mapped copy-on-write: pages are only
+    read from disk as they are used and are shared with the page cache.
+    """
+
+    def __init__(self, directory: Path, max_mb: int):
+        self.directory = Path(directory) / "audio"
+        self.max_bytes = max_mb * 1024 * 1024
+        self._lock = threading.Lock()
+
+    def path_for(self, digest: str) -> Path:
+        return self.directory / f"{digest}.npy"
+
+    def load(self, audio_path: Path, digest: str | None = None) -> np.ndarray:
+        digest = digest or file_sha256(audio_path)
+        cached = self.path_for(digest)
+
+        if cached.exists():
+            logger.debug(f"Decoded audio cache hit for {audio_path.name}")
+            os.utime(cached)
+            return np.load(cached, mmap_mode="c")
+
+        logger.debug(f"Decoding {audio_path.name} to {SAMPLE_RATE} Hz PCM...")
+        audio = load_audio(str(audio_path))
+
+        cached.parent.mkdir(parents=True, exist_ok=True)
+        tmp = cached.with_name(f"{cached.stem}.{os.getpid()}.{threading.get_ident()}.tmp")
+        with tmp.open("wb") as f:
+            np.save(f, audio)
+        os.replace(tmp, cached)
+        del audio
+
+        self.evict(keep=cached)
+        return np.load(cached, mmap_mode="c")
+
+    def evict(self, keep: Path | None = None) -> int:
+        """Remove least recently used entries until the directory fits the size cap."""
+        with self._lock:
+            entries = []
+            for entry in self.directory.glob("*.npy"):
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, entry))
+
+            total = sum(size for _, size, _ in entries)
+            removed = 0
+            for _, size, entry in sorted(entries, key=lambda e: e[0]):
+                if total <= self.max_bytes:
+                    break
+                if entry == keep:
+                    continue
+                entry.unlink(missing_ok=True)
+                total -= size
+                removed += 1
+
+            if removed:
+                logger.debug(f"Evicted {removed} decoded audio files from {self.directory}")
+            return removed
@@ -0,0 +1,115 @@
+import copy
+from collections import Counter
+from collections.abc import Sequence
+from typing import Any
+
+import numpy as np
+
+SAMPLE_RATE = 16000
+
+
+def frame_energy_db(audio: np.ndarray, frame_samples: int) -> np.ndarray:
+    """RMS energy in dB of consecutive non-overlapping frames."""
+    n_frames = len(audio) // frame_samples
+    if n_frames == 0:
+        return np.zeros(0, dtype=np.float32)
+    frames = np.asarray(audio[: n_frames * frame_samples], dtype=np.float32)
+    frames = frames.reshape(n_frames, frame_samples)
+    rms = np.sqrt(np.mean(frames * frames, axis=1))
+    return 20 * np.log10(np.maximum(rms, 1e-10))
+
+
+def find_split_points(
+    audio: np.ndarray,
+    chunk_seconds: float,
+    search_seconds: float = 30.0,
+    frame_ms: int = 30,
+    sample_rate: int = SAMPLE_RATE,
+) -> list[int]:
+    """
+    Choose sample offsets near every ``chunk_seconds`` boundary to cut the audio at.
+
+    Each cut is placed in the middle of the quietest run of frames found within
+    ``search_seconds`` of the nominal boundary, so chunks end in a pause instead
+    of mid-word.
+    """
+    frame = int(sample_rate * frame_ms / 1000)
+    energy = frame_energy_db(audio, frame)
+    chunk_frames = int(chunk_seconds * sample_rate / frame)
+    search_frames = int(search_seconds * sample_rate / frame)
+
+    if chunk_frames <= 0 or len(energy) <= chunk_frames:
+        return []
+
+    # Smooth over ~300 ms so a single quiet frame inside a word does not win
+    window = max(1, 300 // frame_ms)
+    smoothed = np.convolve(energy, np.ones(window) / window, mode="same")
+
+    points = []
+    last = 0
+    target = chunk_frames
+    while target < len(smoothed) - search_frames // 2:
+        lo = max(last + 1, target - search_frames)
+        hi = min(len(smoothed), target + search_frames)
+        window_energy = smoothed[lo:hi]
+        quietest = window_energy.min()
+        # Among equally quiet frames, prefer the one closest to the target
+        candidates = np.flatnonzero(window_energy <= quietest + 1.0) + lo
+        cut = int(candidates[np.argmin(np.abs(candidates - target))])
+        points.append(cut * frame + frame // 2)
+        last = cut
+        target = cut + chunk_frames
+    return points
+
+
+def split_audio(
+    audio: np.ndarray, points: Sequence[int], sample_rate: int = SAMPLE_RATE
+) -> list[tuple[float, np.ndarray]]:
+    """Cut audio at the given sample offsets, returning (start seconds, chunk) pairs."""
+    bounds = [0, *points, len(audio)]
+    return [
+        (start / sample_rate, audio[start:end])
+        for start, end in zip(bounds, bounds[1:])
+        if end > start
+    ]
+
+
+def merge_results(chunks: Sequence[tuple[float, dict[str, Any]]]) -> dict[str, Any]:
+    """
+    Merge per-chunk Whisper results into one result with global timestamps.
+
+    Segment ids are renumbered across the whole file and word timestamps, when
+    present, are shifted along with their segment.
+    """
+    segments: list[dict] = []
+    texts = []
+    languages: Counter = Counter()
+
+    for offset, result in chunks:
+        texts.append(result.get("text", "").strip())
+        if result.get("language"):
+            languages[result["language"]] += len(result.get("segments", [])) or 1
+
+        for seg in result.get("segments", []):
+            seg = copy.copy(seg)
+            seg["id"] = len(segments)
+            seg["start"] = round(seg["start"] + offset, 3)
+            seg["end"] = round(seg["end"] + offset, 3)
+            if "seek" in seg:
+                seg["seek"] = seg["seek"] + int(offset * 100)
+            if seg.get("words"):
+                seg["words"] = [
+                    {
+                        **w,
+                        "start": round(w["start"] + offset, 3),
+                        "end": round(w["end"] + offset, 3),
+                    }
+                    for w in seg["words"]
+                ]
+            segments.append(seg)
+
+    return {
+        "text": " ".join(t for t in texts if t),
+        "segments": segments,
+        "language": languages.most_common(1)[0][0] if languages else None,
+    }
@@ -1,17 +1,35 @@
+import itertools
+import signal
+import threading
+from collections.abc import Callable, Iterable, Iterator
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Optional
+from typing import TYPE_CHECKING, Annotated, cast
 
 import typer
+import yaml
 from rich.console import Console
-from typing_extensions import Annotated
 
-from .config import Config
-from .downloader import DiskSpaceError, DownloadError, download_audio
+from . import memory, profiling
+from .config import Config, OutputFormat
+from .constants import OUTPUT_FORMATS
+from .exceptions import DiskSpaceError, DownloadError, TranscriptionError
+from .jobs import JournaledJob, run_item, stream_output, write_output
 from .logger import setup_logging
-from .output import OutputWriter
-from .transcriber import Transcriber, TranscriptionError
+from .model_cache import get_registry
+from .output import OutputWriter, StreamingWriter, read_result
+from .pipeline import ItemResult, Pipeline
+from .playlist import expand_urls, is_collection_url
+from .result_cache import ResultCache
+from .server import ServerError, TranscriptionServer, ping, request_shutdown, submit_jobs
 from .utils import check_ffmpeg
 
+# yt-dlp, torch and Whisper take seconds to import, so the modules that need
+# them are imported by the commands that run a download or the model. That
+# keeps --help, --version and config errors fast.
+if TYPE_CHECKING:
+    from .transcriber import ProgressCallback, TranscriptionProgress
+
 app = typer.Typer(
     name="podcast-ai-agent",
     help="Download and transcribe audio from YouTube videos.",
@@ -19,6 +37,9 @@ app = typer.Typer(
 )
 console = Console()
 
+cache_app = typer.Typer(help="Inspect and manage the transcription cache.")
+app.add_typer(cache_app, name="cache")
+
 
 def version_callback(value: bool):
     if value:
@@ -35,21 +56,323 @@ def common(
 ):
     pass
 
+
 @app.command()
-def tui():
+def tui(
+    workers: Annotated[int, typer.Option("--workers", "-w", min=1, help="Jobs to run at once")] = 2,
+    config_path: Annotated[
+        Path, typer.Option("--config", "-c", help="Configuration file path", exists=True)
+    ] = Path("config/default.yaml"),
+):
+    """Queue URLs in a terminal UI and watch the jobs run."""
+    config = _load_config(config_path)
+    memory.configure(config.memory)
+    # The same cache location as `process` writing to the configured output directory
+    if config.cache.directory is None:
+        config.cache.directory = config.output.directory / ".cache"
+
     from .tui import PodcastAgentApp
-    app = PodcastAgentApp()
-    app.run()
 
+    PodcastAgentApp(config, workers=workers).run()
+
+
+def _load_config(config_path: Path) -> Config:
+    try:
+        return Config.from_yaml(config_path)
+    except (OSError, ValueError, TypeError, AttributeError, yaml.YAMLError) as e:
+        # Unreadable file, bad YAML, or sections of the wrong shape or values
+        console.print(f"[red]Error loading config:[/red] {e}")
+        raise typer.Exit(code=1)
+
+
+def _daemon_error(result: dict) -> Exception:
+    """Rebuild a job failure reported by the daemon as the matching local exception."""
+    from . import exceptions
+
+    error_type = getattr(exceptions, result.get("error_type") or "", None)
+    if isinstance(error_type, type) and issubclass(error_type, Exception):
+        return error_type(result.get("error", ""))
+    return RuntimeError(result.get("error", "unknown error"))
+
+
+def _process_with_daemon(
+    config: Config, socket_path: Path, urls: list[str], resume: bool, logger
+) -> None:
+    counts = {"done": 0, "failed": 0, "skipped": 0}
+    index = itertools.count(1)
+
+    def on_result(result: dict) -> None:
+        url: str = result.get("url", "")
+        console.print(f"\n[bold cyan]Item {next(index)}:[/bold cyan] {url}")
+        status = result.get("status")
+        if status == "done":
+            _report_success(logger, url, [Path(p) for p in result["output_paths"]])
+            counts["done"] += 1
+        elif status == "skipped":
+            console.print("[yellow]Finished by an earlier run.[/yellow]")
+            counts["skipped"] += 1
+        elif status == "rejected":
+            console.print(f"[red]Rejected by daemon:[/red] {result.get('error')}")
+            logger.error(f"Daemon rejected {url}: {result.get('error')}")
+            counts["failed"] += 1
+        else:
+            _report_failure(logger, url, _daemon_error(result))
+            counts["failed"] += 1
+
+    def expansion_failed(source: str, error: Exception) -> None:
+        console.print(f"[red]Failed to list {source}:[/red] {error}")
+        counts["failed"] += 1
+
+    console.print(f"[bold]Submitting to daemon at {socket_path}...[/bold]")
+    try:
+        submit_jobs(
+            socket_path,
+            config,
+            expand_urls(urls, config.download, on_error=expansion_failed),
+            on_result,
+            resume=resume,
+        )
+    except OSError as e:
+        console.print(f"[red]Lost connection to daemon:[/red] {e}")
+        raise typer.Exit(code=1)
+
+    if len(urls) > 1 or counts["failed"] + counts["done"] + counts["skipped"] > 1:
+        summary = f"{counts['done']} succeeded, {counts['failed']} failed"
+        if counts["skipped"]:
+            summary += f", {counts['skipped']} already done"
+        console.print(f"\n[bold]Summary:[/bold] {summary}.")
+
+    if counts["failed"]:
+        raise typer.Exit(code=1)
+
+
+def _parse_formats(value: str) -> list[OutputFormat]:
+    formats = list(dict.fromkeys(f.strip().lower() for f in value.split(",") if f.strip()))
+    unknown = [f for f in formats if f not in OUTPUT_FORMATS]
+    if unknown or not formats:
+        raise typer.BadParameter(
+            f"unsupported format {', '.join(unknown) or value!r}; "
+            f"choose from {', '.join(OUTPUT_FORMATS)}",
+            param_hint="--format",
+        )
+    return cast(list[OutputFormat], formats)
+
+
+def _profiled(fn, stage: str | None = None):
+    """Wrap a pipeline stage so its profile records are attributed to its URL."""
+
+    def run(url, *args):
+        with profiling.item(url):
+            if stage is None:
+                return fn(url, *args)
+            with profiling.stage(stage):
+                return fn(url, *args)
+
+    return run
+
+
+def _write_profile(profile_path: Path | None, metrics_path: Path | None, logger) -> None:
+    profiler = profiling.get_profiler()
+    if profiler is None:
+        return
+    try:
+        if profile_path is not None:
+            profiler.write_json(profile_path)
+            console.print(f"Profile written to [underline]{profile_path}[/underline]")
+        if metrics_path is not None:
+            profiler.write_prometheus(metrics_path)
+    except OSError as e:
+        logger.error(f"Failed to write profile: {e}")
+
+
+def _format_seconds(seconds: float | None) -> str:
+    if seconds is None:
+        return "--:--"
+    minutes, seconds = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}:{minutes:02d}:{seconds:02d}" if hours else f"{minutes}:{seconds:02d}"
+
+
+@contextmanager
+def _item_progress(
+    description: str, show_download: bool = True
+) -> Iterator[tuple[Callable[[dict], None] | None, "ProgressCallback"]]:
+    """
+    Show one progress bar for an item: the download, then the audio seconds
+    transcribed with realtime factor and ETA. Yields the download hook (None
+    without ``show_download``) and the transcription progress callback.
+    """
+    from rich.progress import BarColumn, Progress, SpinnerColumn, TaskProgressColumn, TextColumn
+
+    with Progress(
+        SpinnerColumn(),
+        TextColumn("[progress.description]{task.description}"),
+        BarColumn(),
+        TaskProgressColumn(),
+        TextColumn("{task.fields[detail]}"),
+        console=console,
+        transient=True,
+    ) as progress:
+        task = progress.add_task("Downloading...", total=None, detail="")
+
+        def download_hook(d: dict) -> None:
+            if d["status"] == "downloading":
+                total = d.get("total_bytes") or d.get("total_bytes_estimate")
+                downloaded = d.get("downloaded_bytes", 0)
+                label = "Downloading..."
+                if total and total > 0:
+                    label = f"Downloading... {int((downloaded / total) * 100)}%"
+                progress.update(task, total=total, completed=downloaded, description=label)
+            elif d["status"] == "finished":
+                progress.update(
+                    task, description="Processing audio...", completed=d.get("total_bytes")
+                )
+
+        def update(p: "TranscriptionProgress") -> None:
+            detail = f"{_format_seconds(p.processed_seconds)}/{_format_seconds(p.total_seconds)}"
+            if p.segments is not None:
+                detail += f" · {p.segments} segments"
+            if p.realtime_factor is not None:
+                detail += f" · RTF {p.realtime_factor:.2f}"
+            detail += f" · ETA {_format_seconds(p.eta_seconds)}"
+            progress.update(
+                task,
+                description=description,
+                total=p.total_seconds,
+                completed=p.processed_seconds,
+                detail=detail,
+            )
+
+        yield (download_hook if show_download else None), update
+
+
+def _report_success(logger, url: str, output_paths: list[Path]) -> None:
+    saved = ", ".join(f"[underline]{path}[/underline]" for path in output_paths)
+    console.print(f"[green bold]Success![/green bold] Saved to: {saved}")
+    logger.info(f"Successfully processed {url}")
+
+
+def _report_failure(logger, url: str, error: Exception) -> None:
+    if isinstance(error, DiskSpaceError):
+        console.print(f"[red]Disk Space Error:[/red] {error}")
+        logger.error(f"Disk space error for {url}: {error}")
+    elif isinstance(error, DownloadError):
+        console.print(f"[red]Download Failed:[/red] {error}")
+        logger.error(f"Download failed for {url}: {error}")
+    elif isinstance(error, TranscriptionError):
+        console.print(f"[red]Transcription Failed:[/red] {error}")
+        logger.error(f"Transcription failed for {url}: {error}")
+    else:
+        console.print(f"[red]Unexpected Error:[/red] {error}")
+        logger.error(f"Unexpected error for {url}", exc_info=error)
+
+
+def _item_label(index: int, total: int | None) -> str:
+    # Playlists and channels are enumerated lazily, so their size is unknown up front
+    return f"Item {index}/{total}" if total is not None else f"Item {index}"
+
+
+def _run_pipeline(
+    config: Config, urls: Iterable[str], logger, job: JournaledJob, total: int | None = None
+) -> list:
+    def report(item: ItemResult):
+        console.print(f"\n[bold cyan]{_item_label(item.index, total)}:[/bold cyan] {item.url}")
+        if item.error is None:
+            # Both write stages return the list of written paths
+            assert isinstance(item.output_path, list)
+            _report_success(logger, item.url, item.output_path)
+        else:
+            job.failed(item.url, item.error)
+            _report_failure(logger, item.url, item.error)
+
+    from .transcriber import Transcriber
+    from .worker_pool import TranscriptionPool
+
+    pipeline_config = config.pipeline.model_copy()
+    transcriber: Transcriber | TranscriptionPool
+    if config.whisper.workers > 1:
+        # Keep every worker process fed with an item
+        pipeline_config.transcribe_workers = max(
+            pipeline_config.transcribe_workers, config.whisper.workers
+        )
+        try:
+            transcriber = TranscriptionPool(config.whisper, config.cache).start()
+        except TranscriptionError as e:
+            console.print(f"[red]Failed to start transcription workers:[/red] {e}")
+            raise typer.Exit(code=1)
+    else:
+        transcriber = Transcriber(config.whisper, config.cache)
+
+    if config.output.stream:
+        # Segments reach disk during transcription, so the write stage only reports the paths
+        def transcribe(url, audio_path):
+            output_paths = stream_output(
+                config, transcriber, url, audio_path, on_existing=job.on_existing(url)
+            )
+            job.transcribed(url)
+            return {"output_paths": output_paths}
+
+        def write(url, audio_path, result):
+            job.written(url, result["output_paths"])
+            return result["output_paths"]
+
+    else:
+
+        def transcribe(url, audio_path):
+            result = transcriber.transcribe(audio_path)
+            job.transcribed(url)
+            return result
+
+        def write(url, audio_path, result):
+            output_paths = write_output(config, url, audio_path, result, job.on_existing(url))
+            job.written(url, output_paths)
+            return output_paths
+
+    runner = Pipeline(
+        download=_profiled(job.download, stage="download"),
+        transcribe=_profiled(transcribe, stage="transcribe"),
+        write=_profiled(write),
+        config=pipeline_config,
+    )
+    try:
+        return runner.run(urls, on_result=report)
+    finally:
+        transcriber.close()
 
 
 @app.command()
 def process(
-    url: Annotated[Optional[str], typer.Option("--url", "-u", help="YouTube video URL")] = None,
+    url: Annotated[
+        str | None, typer.Option("--url", "-u", help="YouTube video, playlist or channel URL")
+    ] = None,
     batch_file: Annotated[
-        Optional[Path],
+        Path | None,
         typer.Option("--batch-file", "-f", help="File containing URLs (one per line)", exists=True),
     ] = None,
+    date_after: Annotated[
+        str | None,
+        typer.Option(
+            "--date-after", help="Only playlist/channel videos uploaded on or after YYYYMMDD"
+        ),
+    ] = None,
+    date_before: Annotated[
+        str | None,
+        typer.Option(
+            "--date-before", help="Only playlist/channel videos uploaded on or before YYYYMMDD"
+        ),
+    ] = None,
+    min_duration: Annotated[
+        float | None,
+        typer.Option(
+            "--min-duration", min=0, help="Skip playlist/channel videos shorter than this (seconds)"
+        ),
+    ] = None,
+    max_duration: Annotated[
+        float | None,
+        typer.Option(
+            "--max-duration", min=0, help="Skip playlist/channel videos longer than this (seconds)"
+        ),
+    ] = None,
     output_dir: Annotated[Path, typer.Option("--output", "-o", help="Output directory")] = Path(
         "./output"
     ),
@@ -64,8 +387,15 @@ def process(
     ] = "auto",
     translate: Annotated[bool, typer.Option("--translate", help="Translate to English")] = False,
     format: Annotated[
-        str, typer.Option("--format", help="Output format (txt, json, srt, vtt)")
+        str,
+        typer.Option(
+            "--format", help="Output formats, comma-separated (txt, json, srt, vtt, jsonl)"
+        ),
     ] = "txt",
+    stream: Annotated[
+        bool,
+        typer.Option("--stream", help="Write segments as they are decoded (txt, srt, vtt, jsonl)"),
+    ] = False,
     verbose: Annotated[
         bool, typer.Option("--verbose", "-v", help="Enable verbose logging")
     ] = False,
@@ -75,16 +405,47 @@ def process(
     skip_download: Annotated[
         bool, typer.Option("--skip-download", help="Skip download if audio file exists")
     ] = False,
+    pipeline: Annotated[
+        bool | None,
+        typer.Option(
+            "--pipeline/--sequential",
+            help="Overlap downloads with transcription in batch runs (default from config)",
+        ),
+    ] = None,
+    workers: Annotated[
+        int | None,
+        typer.Option(
+            "--workers", "-w", min=1, help="Number of transcription processes (default from config)"
+        ),
+    ] = None,
+    resume: Annotated[
+        bool,
+        typer.Option(
+            "--resume/--fresh",
+            help="Skip or resume items recorded in the output directory's job journal",
+        ),
+    ] = True,
+    daemon: Annotated[
+        bool | None,
+        typer.Option(
+            "--daemon/--local",
+            help="Submit to a running `serve` daemon (default: whenever one is listening)",
+        ),
+    ] = None,
+    profile: Annotated[
+        Path | None,
+        typer.Option("--profile", help="Write per-stage wall/CPU time, peak RSS and bytes as JSON"),
+    ] = None,
+    metrics_file: Annotated[
+        Path | None,
+        typer.Option("--metrics-file", help="Write the profile as Prometheus text metrics"),
+    ] = None,
 ):
     if not check_ffmpeg():
         console.print("[red bold]Error:[/red bold] ffmpeg not found. Please install ffmpeg.")
         raise typer.Exit(code=1)
 
-    try:
-        config = Config.from_yaml(config_path)
-    except Exception as e:
-        console.print(f"[red]Error loading config:[/red] {e}")
-        raise typer.Exit(code=1)
+    config = _load_config(config_path)
 
     if verbose:
         config.logging.level = "DEBUG"
@@ -97,13 +458,46 @@ def process(
             if isinstance(config.logging.rotation, str)
             else config.logging.rotation
         ),
+        json_file=config.logging.json_file,
     )
+    memory.configure(config.memory)
 
     config.whisper.model = model
     config.whisper.language = language
     config.whisper.translate = translate
     config.output.directory = output_dir
-    config.output.format = format
+    config.output.format = _parse_formats(format)
+    if stream:
+        config.output.stream = True
+    unstreamable = [f for f in config.output.format if f not in StreamingWriter.FORMATS]
+    if config.output.stream and unstreamable:
+        console.print(
+            f"[red]Error:[/red] --stream supports {', '.join(StreamingWriter.FORMATS)}, "
+            f"not {', '.join(unstreamable)}"
+        )
+        raise typer.Exit(code=1)
+    if config.cache.directory is None:
+        config.cache.directory = output_dir / ".cache"
+    if pipeline is not None:
+        config.pipeline.enabled = pipeline
+    if workers is not None:
+        config.whisper.workers = workers
+    try:
+        filters = {
+            "date_after": date_after,
+            "date_before": date_before,
+            "min_duration": min_duration,
+            "max_duration": max_duration,
+        }
+        config.download = config.download.model_validate(
+            {
+                **config.download.model_dump(),
+                **{k: v for k, v in filters.items() if v is not None},
+            }
+        )
+    except ValueError as e:
+        console.print(f"[red]Error:[/red] invalid playlist filter: {e}")
+        raise typer.Exit(code=1)
 
     urls = []
     if url:
@@ -123,110 +517,322 @@ def process(
         console.print("[yellow]No URLs to process.[/yellow]")
         raise typer.Exit()
 
+    socket_path = config.server.socket.expanduser()
+    if daemon is None:
+        # Profiles describe this process, so they always mean a local run
+        daemon = profile is None and metrics_file is None and ping(socket_path) is not None
+    elif daemon and ping(socket_path) is None:
+        console.print(
+            f"[red]Error:[/red] no daemon is listening on {socket_path}. "
+            "Start one with `podcast-ai-agent serve`."
+        )
+        raise typer.Exit(code=1)
+    if daemon:
+        _process_with_daemon(config, socket_path, urls, resume, logger)
+        return
+
+    if profile is not None or metrics_file is not None:
+        profiling.enable()
+
+    job = JournaledJob(config, resume=resume)
+    collections = [u for u in urls if is_collection_url(u)]
+    is_batch = len(urls) > 1 or bool(collections)
+    expansion_failures = []
+    skipped = []
+
+    def expansion_failed(source: str, error: Exception) -> None:
+        console.print(f"[red]Failed to list {source}:[/red] {error}")
+        expansion_failures.append(source)
+
+    def pending_urls() -> Iterator[str]:
+        # Playlists and channels are expanded page by page while earlier items are
+        # processed; finished items are dropped before any download or model work
+        for item_url in expand_urls(urls, config.download, on_error=expansion_failed):
+            if job.start(item_url) is None:
+                yield item_url
+            else:
+                skipped.append(item_url)
+                logger.info(f"Skipping {item_url}, finished by an earlier run")
+
+    total = None
+    pending: Iterable[str]
+    if not collections:
+        pending = list(pending_urls())
+        total = len(pending)
+        if skipped:
+            console.print(
+                f"[yellow]Skipping {len(skipped)} items finished by an earlier run.[/yellow]"
+            )
+        console.print(f"[bold]Processing {total} items...[/bold]")
+    else:
+        pending = pending_urls()
+        console.print(f"[bold]Processing items from {len(urls)} sources...[/bold]")
+
     success_count = 0
     fail_count = 0
 
-    console.print(f"[bold]Processing {len(urls)} items...[/bold]")
+    if (config.pipeline.enabled or config.whisper.workers > 1) and is_batch:
+        results = _run_pipeline(config, pending, logger, job, total)
+        success_count = sum(1 for r in results if r.ok)
+        fail_count = len(results) - success_count
+    else:
+        from .transcriber import Transcriber
+
+        description = "Transcribing (streaming)..." if config.output.stream else "Transcribing..."
+        # One transcriber for the run, so chunk workers are started once
+        with Transcriber(config.whisper, config.cache) as transcriber:
+            for i, current_url in enumerate(pending, 1):
+                console.print(f"\n[bold cyan]{_item_label(i, total)}:[/bold cyan] {current_url}")
+
+                with profiling.item(current_url):
+                    try:
+                        with _item_progress(description, not skip_download) as (
+                            download_hook,
+                            on_progress,
+                        ):
+                            output_paths = run_item(
+                                config,
+                                job,
+                                current_url,
+                                transcriber,
+                                progress_hook=download_hook,
+                                progress_callback=on_progress,
+                            )
+                        _report_success(logger, current_url, output_paths)
+                        success_count += 1
+
+                    except Exception as e:
+                        job.failed(current_url, e)
+                        _report_failure(logger, current_url, e)
+                        fail_count += 1
+
+    _write_profile(profile, metrics_file, logger)
+
+    cache_stats = get_registry().stats()
+    logger.debug(
+        f"Model cache: {cache_stats['hits']} hits, {cache_stats['misses']} misses, "
+        f"{cache_stats['load_seconds']}s loading"
+    )
 
-    for i, current_url in enumerate(urls, 1):
-        console.print(f"\n[bold cyan]Item {i}/{len(urls)}:[/bold cyan] {current_url}")
+    fail_count += len(expansion_failures)
+    if is_batch:
+        summary = f"{success_count} succeeded, {fail_count} failed"
+        if skipped:
+            summary += f", {len(skipped)} already done"
+        console.print(f"\n[bold]Summary:[/bold] {summary}.")
 
-        try:
-            if not skip_download:
-                from rich.progress import (
-                    BarColumn,
-                    Progress,
-                    SpinnerColumn,
-                    TaskProgressColumn,
-                    TextColumn,
-                    TimeRemainingColumn,
-                )
-                
-                with Progress(
-                    SpinnerColumn(),
-                    TextColumn("[progress.description]{task.description}"),
-                    BarColumn(),
-                    TaskProgressColumn(),
-                    TimeRemainingColumn(),
-                    console=console,
-                    transient=True,
-                ) as progress:
-                    download_task = progress.add_task("Downloading...", total=None)
-
-                    def update_progress(d):
-                        if d["status"] == "downloading":
-                            total = d.get("total_bytes") or d.get("total_bytes_estimate")
-                            downloaded = d.get("downloaded_bytes", 0)
-                            progress.update(download_task, total=total, completed=downloaded)
-                            if total and total > 0:
-                                pct = int((downloaded / total) * 100)
-                                progress.update(download_task, description=f"Downloading... {pct}%")
-                        elif d["status"] == "finished":
-                            progress.update(download_task, description="Processing audio...", completed=d.get("total_bytes"))
-
-                    audio_path = download_audio(
-                        current_url, config.output.directory, config.download, progress_hook=update_progress
-                    )
-                console.print(f"[green]Downloaded:[/green] {audio_path.name}")
-            else:
-                with console.status("Checking/Downloading...", spinner="dots"):
-                    audio_path = download_audio(
-                        current_url, config.output.directory, config.download
-                    )
+    if fail_count > 0:
+        raise typer.Exit(code=1)
 
 
-            transcriber = Transcriber(config.whisper)
-            with console.status("Transcribing...", spinner="dots"):
-                result = transcriber.transcribe(audio_path)
+@app.command()
+def serve(
+    socket_path: Annotated[
+        Path | None,
+        typer.Option("--socket", help="Unix socket to listen on (default from config)"),
+    ] = None,
+    workers: Annotated[
+        int | None,
+        typer.Option("--workers", "-w", min=1, help="Jobs to run at once (default from config)"),
+    ] = None,
+    max_queue: Annotated[
+        int | None,
+        typer.Option("--max-queue", min=1, help="Jobs allowed to wait (default from config)"),
+    ] = None,
+    preload: Annotated[
+        str | None,
+        typer.Option("--preload", help="Whisper model to load before accepting jobs"),
+    ] = None,
+    stop: Annotated[
+        bool, typer.Option("--stop", help="Ask the running daemon to finish its jobs and exit")
+    ] = False,
+    verbose: Annotated[
+        bool, typer.Option("--verbose", "-v", help="Enable verbose logging")
+    ] = False,
+    config_path: Annotated[
+        Path, typer.Option("--config", "-c", help="Configuration file path", exists=True)
+    ] = Path("config/default.yaml"),
+):
+    """Keep Whisper models loaded and run jobs submitted by `process` over a Unix socket."""
+    config = _load_config(config_path)
+
+    if socket_path is not None:
+        config.server.socket = socket_path
+    if workers is not None:
+        config.server.workers = workers
+    if max_queue is not None:
+        config.server.max_queue = max_queue
+    if verbose:
+        config.logging.level = "DEBUG"
 
-            metadata = {
-                "url": current_url,
-                "model": config.whisper.model,
-                "language": config.whisper.language,
-                "translate": config.whisper.translate,
-            }
+    if stop:
+        if not request_shutdown(config.server.socket.expanduser()):
+            console.print(f"[red]Error:[/red] no daemon is listening on {config.server.socket}")
+            raise typer.Exit(code=1)
+        console.print("Daemon is shutting down after its current jobs.")
+        return
 
-            writer = OutputWriter(config.output.directory / audio_path.stem, metadata=metadata)
-            if config.output.format == "txt":
-                output_path = writer.write_txt(result["text"])
-            elif config.output.format == "json":
-                output_path = writer.write_json(result)
-            elif config.output.format == "srt":
-                output_path = writer.write_srt(result["segments"])
-            elif config.output.format == "vtt":
-                output_path = writer.write_vtt(result["segments"])
-            else:
-                raise ValueError(f"Unsupported format: {config.output.format}")
+    if not check_ffmpeg():
+        console.print("[red bold]Error:[/red bold] ffmpeg not found. Please install ffmpeg.")
+        raise typer.Exit(code=1)
 
-            console.print(
-                f"[green bold]Success![/green bold] Saved to: [underline]{output_path}[/underline]"
-            )
-            logger.info(f"Successfully processed {current_url}")
-            success_count += 1
-
-        except DiskSpaceError as e:
-            console.print(f"[red]Disk Space Error:[/red] {e}")
-            logger.error(f"Disk space error for {current_url}: {e}")
-            fail_count += 1
-        except DownloadError as e:
-            console.print(f"[red]Download Failed:[/red] {e}")
-            logger.error(f"Download failed for {current_url}: {e}")
-            fail_count += 1
-        except TranscriptionError as e:
-            console.print(f"[red]Transcription Failed:[/red] {e}")
-            logger.error(f"Transcription failed for {current_url}: {e}")
-            fail_count += 1
-        except Exception as e:
-            console.print(f"[red]Unexpected Error:[/red] {e}")
-            logger.exception(f"Unexpected error for {current_url}")
-            fail_count += 1
+    setup_logging(
+        level=config.logging.level,
+        log_file=config.logging.file,
+        rotation_size=(
+            10 * 1024 * 1024
+            if isinstance(config.logging.rotation, str)
+            else config.logging.rotation
+        ),
+        json_file=config.logging.json_file,
+    )
+    memory.configure(config.memory)
 
-    if len(urls) > 1:
-        console.print(f"\n[bold]Summary:[/bold] {success_count} succeeded, {fail_count} failed.")
+    if preload:
+        from .transcriber import Transcriber
 
-    if fail_count > 0:
+        whisper_config = config.whisper.model_copy(update={"model": preload})
+        with console.status(f"Loading Whisper model {preload}...", spinner="dots"):
+            try:
+                Transcriber(whisper_config)._load_model()
+            except TranscriptionError as e:
+                console.print(f"[red]Failed to load {preload}:[/red] {e}")
+                raise typer.Exit(code=1)
+
+    daemon = TranscriptionServer(config)
+    try:
+        daemon.start()
+    except (ServerError, OSError) as e:
+        console.print(f"[red]Error:[/red] {e}")
         raise typer.Exit(code=1)
 
+    def stop_gracefully(signum, frame):
+        # Shutting down joins the workers, which must not happen inside the handler
+        threading.Thread(target=daemon.shutdown, name="server-shutdown", daemon=True).start()
+
+    signal.signal(signal.SIGINT, stop_gracefully)
+    signal.signal(signal.SIGTERM, stop_gracefully)
+    console.print(
+        f"[bold]Listening on {daemon.socket_path}[/bold] "
+        f"({config.server.workers} workers, queue of {config.server.max_queue}). "
+        "Ctrl+C stops after the queued jobs."
+    )
+    while not daemon.wait(0.5):
+        pass
+    console.print("Daemon stopped.")
+
+
+@app.command()
+def render(
+    result_path: Annotated[
+        Path,
+        typer.Argument(help="JSON result saved with --format json", exists=True, dir_okay=False),
+    ],
+    format: Annotated[
+        str,
+        typer.Option(
+            "--format", help="Output formats, comma-separated (txt, json, srt, vtt, jsonl)"
+        ),
+    ] = "srt",
+    output_dir: Annotated[
+        Path | None,
+        typer.Option("--output", "-o", help="Output directory (default: next to the JSON file)"),
+    ] = None,
+):
+    """Regenerate output formats from a stored JSON result without running the model."""
+    formats = _parse_formats(format)
+    try:
+        result, metadata = read_result(result_path)
+    except (OSError, ValueError, KeyError) as e:
+        console.print(f"[red]Error reading result:[/red] {e}")
+        raise typer.Exit(code=1)
+
+    directory = output_dir or result_path.parent
+    directory.mkdir(parents=True, exist_ok=True)
+    output_paths = OutputWriter(directory / result_path.stem, metadata).write(result, formats)
+    saved = ", ".join(f"[underline]{path}[/underline]" for path in output_paths)
+    console.print(f"[green bold]Rendered:[/green bold] {saved}")
+
+
+def _open_result_cache(config_path: Path, output_dir: Path) -> ResultCache:
+    config = _load_config(config_path)
+    return ResultCache(config.cache.directory or output_dir / ".cache")
+
+
+CacheOutputOption = Annotated[
+    Path, typer.Option("--output", "-o", help="Output directory holding the cache")
+]
+CacheConfigOption = Annotated[Path, typer.Option("--config", "-c", help="Configuration file path")]
+
+
+@cache_app.command("info")
+def cache_info(
+    output_dir: CacheOutputOption = Path("./output"),
+    config_path: CacheConfigOption = Path("config/default.yaml"),
+):
+    """Show the location and size of the transcription cache."""
+    stats = _open_result_cache(config_path, output_dir).stats()
+    console.print(f"[bold]Directory:[/bold] {stats['directory']}")
+    console.print(f"[bold]Entries:[/bold] {stats['entries']}")
+    console.print(f"[bold]Size:[/bold] {stats['size_bytes'] / (1024**2):.1f} MB")
+
+
+@cache_app.command("list")
+def cache_list(
+    output_dir: CacheOutputOption = Path("./output"),
+    config_path: CacheConfigOption = Path("config/default.yaml"),
+    limit: Annotated[int, typer.Option("--limit", "-n", help="Maximum entries to show")] = 20,
+):
+    """List cached transcriptions, most recently used first."""
+    from datetime import datetime
+
+    from rich.table import Table
+
+    table = Table("Key", "Audio", "Model", "Language", "Task", "Size", "Last used")
+    for entry in _open_result_cache(config_path, output_dir).entries()[:limit]:
+        table.add_row(
+            entry["key"][:12],
+            entry["audio_hash"][:12],
+            entry["model"],
+            entry["language"],
+            "translate" if entry["translate"] else "transcribe",
+            f"{entry['size_bytes'] / 1024:.1f} KB",
+            datetime.fromtimestamp(entry["accessed_at"]).strftime("%Y-%m-%d %H:%M"),
+        )
+    console.print(table)
+
+
+@cache_app.command("prune")
+def cache_prune(
+    output_dir: CacheOutputOption = Path("./output"),
+    config_path: CacheConfigOption = Path("config/default.yaml"),
+    max_mb: Annotated[
+        float | None, typer.Option("--max-mb", help="Shrink the cache to this size")
+    ] = None,
+    older_than: Annotated[
+        float | None,
+        typer.Option("--older-than", help="Remove entries unused for this many days"),
+    ] = None,
+):
+    """Remove old or least recently used transcriptions."""
+    if max_mb is None and older_than is None:
+        console.print("[red]Error:[/red] Provide --max-mb and/or --older-than")
+        raise typer.Exit(code=1)
+
+    max_bytes = int(max_mb * 1024 * 1024) if max_mb is not None else None
+    removed = _open_result_cache(config_path, output_dir).prune(max_bytes, older_than)
+    console.print(f"Removed {removed} cached transcriptions.")
+
+
+@cache_app.command("clear")
+def cache_clear(
+    output_dir: CacheOutputOption = Path("./output"),
+    config_path: CacheConfigOption = Path("config/default.yaml"),
+):
+    """Remove every cached transcription."""
+    removed = _open_result_cache(config_path, output_dir).clear()
+    console.print(f"Removed {removed} cached transcriptions.")
+
 
 if __name__ == "__main__":
     app()
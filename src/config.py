@@ -2,26 +2,59 @@ from pathlib import Path
 from typing import Literal
 
 import yaml
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_validator
 
 from .constants import (
+    DEFAULT_AUDIO_CACHE_ENABLED,
+    DEFAULT_AUDIO_CACHE_MAX_MB,
+    DEFAULT_BATCH_SIZE,
+    DEFAULT_CACHE_DIRECTORY,
+    DEFAULT_CHUNK_SECONDS,
+    DEFAULT_CHUNK_WORKERS,
     DEFAULT_CONFIG_PATH,
+    DEFAULT_CPU_AFFINITY,
     DEFAULT_DOWNLOAD_CODEC,
     DEFAULT_DOWNLOAD_FORMAT,
+    DEFAULT_DOWNLOAD_WORKERS,
+    DEFAULT_FAST_LOAD,
+    DEFAULT_HOST_BURST,
+    DEFAULT_HOST_CONCURRENCY,
+    DEFAULT_HOST_RATE,
     DEFAULT_LOG_FILE,
+    DEFAULT_LOG_JSON_FILE,
     DEFAULT_LOG_LEVEL,
     DEFAULT_LOG_ROTATION,
+    DEFAULT_MEMORY_HEADROOM_MB,
+    DEFAULT_MEMORY_LIMIT_MB,
+    DEFAULT_MEMORY_MEASUREMENTS,
+    DEFAULT_MEMORY_WAIT_SECONDS,
+    DEFAULT_MODEL_CACHE_MB,
     DEFAULT_ON_EXISTING,
     DEFAULT_OUTPUT_DIRECTORY,
     DEFAULT_OUTPUT_FORMAT,
+    DEFAULT_OUTPUT_STREAM,
+    DEFAULT_PIPELINE_ENABLED,
+    DEFAULT_QUEUE_DEPTH,
+    DEFAULT_RESULT_CACHE_ENABLED,
+    DEFAULT_RESULT_CACHE_MAX_MB,
     DEFAULT_RETRIES,
     DEFAULT_RETRY_BACKOFF,
+    DEFAULT_RETRY_BACKOFF_MAX,
     DEFAULT_SANITIZE_FILENAMES,
+    DEFAULT_SERVER_MAX_QUEUE,
+    DEFAULT_SERVER_SOCKET,
+    DEFAULT_SERVER_WORKERS,
     DEFAULT_SOCKET_TIMEOUT,
+    DEFAULT_THREADS_PER_WORKER,
+    DEFAULT_TRANSCRIBE_WORKERS,
+    DEFAULT_WHISPER_DEVICE,
+    DEFAULT_WHISPER_ENGINE,
     DEFAULT_WHISPER_LANGUAGE,
     DEFAULT_WHISPER_MODEL,
+    DEFAULT_WHISPER_PRECISION,
     DEFAULT_WHISPER_TEMPERATURE,
     DEFAULT_WHISPER_TRANSLATE,
+    DEFAULT_WHISPER_WORKERS,
 )
 
 
@@ -30,6 +63,17 @@ class WhisperConfig(BaseModel):
     language: str = DEFAULT_WHISPER_LANGUAGE
     translate: bool = DEFAULT_WHISPER_TRANSLATE
     temperature: float = DEFAULT_WHISPER_TEMPERATURE
+    device: str = DEFAULT_WHISPER_DEVICE
+    precision: Literal["auto", "fp32", "fp16", "int8"] = DEFAULT_WHISPER_PRECISION
+    model_cache_mb: int = DEFAULT_MODEL_CACHE_MB
+    fast_load: bool = DEFAULT_FAST_LOAD
+    workers: int = Field(default=DEFAULT_WHISPER_WORKERS, ge=1)
+    threads_per_worker: int = Field(default=DEFAULT_THREADS_PER_WORKER, ge=0)
+    cpu_affinity: bool = DEFAULT_CPU_AFFINITY
+    engine: Literal["stock", "batched"] = DEFAULT_WHISPER_ENGINE
+    batch_size: int = Field(default=DEFAULT_BATCH_SIZE, ge=1)
+    chunk_seconds: float = Field(default=DEFAULT_CHUNK_SECONDS, ge=0)
+    chunk_workers: int = Field(default=DEFAULT_CHUNK_WORKERS, ge=1)
 
 
 class DownloadConfig(BaseModel):
@@ -38,26 +82,90 @@ class DownloadConfig(BaseModel):
     socket_timeout: int = DEFAULT_SOCKET_TIMEOUT
     retries: int = DEFAULT_RETRIES
     retry_backoff: float = DEFAULT_RETRY_BACKOFF
+    retry_backoff_max: float = Field(default=DEFAULT_RETRY_BACKOFF_MAX, ge=0)
+    # Shared by every download thread talking to the same host
+    host_rate: float = Field(default=DEFAULT_HOST_RATE, ge=0)
+    host_burst: int = Field(default=DEFAULT_HOST_BURST, ge=1)
+    host_concurrency: int = Field(default=DEFAULT_HOST_CONCURRENCY, ge=1)
+    # Filters for videos enumerated from playlist and channel URLs
+    date_after: str | None = Field(default=None, pattern=r"^\d{8}$")
+    date_before: str | None = Field(default=None, pattern=r"^\d{8}$")
+    min_duration: float | None = Field(default=None, ge=0)
+    max_duration: float | None = Field(default=None, ge=0)
+
+    @field_validator("date_after", "date_before", mode="before")
+    @classmethod
+    def _date_as_text(cls, value):
+        # YAML reads an unquoted 20240131 as an integer
+        return str(value) if isinstance(value, int) else value
+
+
+class PipelineConfig(BaseModel):
+    enabled: bool = DEFAULT_PIPELINE_ENABLED
+    download_workers: int = Field(default=DEFAULT_DOWNLOAD_WORKERS, ge=1)
+    transcribe_workers: int = Field(default=DEFAULT_TRANSCRIBE_WORKERS, ge=1)
+    queue_depth: int = Field(default=DEFAULT_QUEUE_DEPTH, ge=1)
+
+
+OutputFormat = Literal["txt", "srt", "json", "vtt", "jsonl"]
 
 
 class OutputConfig(BaseModel):
     directory: Path = Field(default_factory=lambda: Path(DEFAULT_OUTPUT_DIRECTORY))
-    format: Literal["txt", "srt", "json", "vtt"] = DEFAULT_OUTPUT_FORMAT
+    format: list[OutputFormat] = Field(
+        default_factory=lambda: [DEFAULT_OUTPUT_FORMAT], min_length=1
+    )
+    stream: bool = DEFAULT_OUTPUT_STREAM
     sanitize_filenames: bool = DEFAULT_SANITIZE_FILENAMES
     on_existing: Literal["skip", "overwrite", "rename"] = DEFAULT_ON_EXISTING
 
+    @field_validator("format", mode="before")
+    @classmethod
+    def _split_formats(cls, value):
+        """Accept a single format or a comma-separated string as well as a list."""
+        if isinstance(value, str):
+            value = value.split(",")
+        return list(dict.fromkeys(fmt.strip().lower() for fmt in value if fmt.strip()))
+
+
+class CacheConfig(BaseModel):
+    directory: Path | None = DEFAULT_CACHE_DIRECTORY
+    audio_enabled: bool = DEFAULT_AUDIO_CACHE_ENABLED
+    audio_max_mb: int = Field(default=DEFAULT_AUDIO_CACHE_MAX_MB, ge=0)
+    results_enabled: bool = DEFAULT_RESULT_CACHE_ENABLED
+    results_max_mb: int = Field(default=DEFAULT_RESULT_CACHE_MAX_MB, ge=0)
+
 
 class LoggingConfig(BaseModel):
     level: str = DEFAULT_LOG_LEVEL
     file: str | None = DEFAULT_LOG_FILE
     rotation: str = DEFAULT_LOG_ROTATION
+    json_file: str | None = DEFAULT_LOG_JSON_FILE
+
+
+class ServerConfig(BaseModel):
+    socket: Path = Path(DEFAULT_SERVER_SOCKET)
+    workers: int = Field(default=DEFAULT_SERVER_WORKERS, ge=1)
+    max_queue: int = Field(default=DEFAULT_SERVER_MAX_QUEUE, ge=1)
+
+
+class MemoryConfig(BaseModel):
+    # None keeps measurements in memory for this process only
+    measurements: Path | None = Path(DEFAULT_MEMORY_MEASUREMENTS)
+    headroom_mb: int = Field(default=DEFAULT_MEMORY_HEADROOM_MB, ge=0)
+    limit_mb: int = Field(default=DEFAULT_MEMORY_LIMIT_MB, ge=0)
+    wait_seconds: float = Field(default=DEFAULT_MEMORY_WAIT_SECONDS, ge=0)
 
 
 class Config(BaseModel):
     whisper: WhisperConfig = Field(default_factory=WhisperConfig)
     download: DownloadConfig = Field(default_factory=DownloadConfig)
+    pipeline: PipelineConfig = Field(default_factory=PipelineConfig)
     output: OutputConfig = Field(default_factory=OutputConfig)
+    cache: CacheConfig = Field(default_factory=CacheConfig)
     logging: LoggingConfig = Field(default_factory=LoggingConfig)
+    server: ServerConfig = Field(default_factory=ServerConfig)
+    memory: MemoryConfig = Field(default_factory=MemoryConfig)
 
     @classmethod
     def from_yaml(cls, path: Path | str = DEFAULT_CONFIG_PATH) -> "Config":
@@ -71,11 +179,15 @@ class Config(BaseModel):
         return cls(
             whisper=WhisperConfig(**data.get("whisper", {})),
             download=DownloadConfig(**data.get("download", {})),
+            pipeline=PipelineConfig(**data.get("pipeline", {})),
             output=OutputConfig(
                 directory=Path(
                     data.get("output", {}).get("directory", str(DEFAULT_OUTPUT_DIRECTORY))
                 ),
                 **{k: v for k, v in data.get("output", {}).items() if k != "directory"},
             ),
+            cache=CacheConfig(**data.get("cache", {})),
             logging=LoggingConfig(**data.get("logging", {})),
+            server=ServerConfig(**data.get("server", {})),
+            memory=MemoryConfig(**data.get("memory", {})),
         )
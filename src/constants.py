@@ -3,24 +3,79 @@ DEFAULT_WHISPER_MODEL = "base"
 DEFAULT_WHISPER_LANGUAGE = "auto"
 DEFAULT_WHISPER_TRANSLATE = False
 DEFAULT_WHISPER_TEMPERATURE = 0.0
+DEFAULT_WHISPER_DEVICE = "auto"
+DEFAULT_WHISPER_PRECISION = "auto"  # fp16 on GPU, fp32 on CPU (Whisper's own default)
+DEFAULT_MODEL_CACHE_MB = 8000
+DEFAULT_FAST_LOAD = False
+DEFAULT_WHISPER_WORKERS = 1
+DEFAULT_THREADS_PER_WORKER = 0  # 0 = split available CPUs evenly between workers
+DEFAULT_CPU_AFFINITY = False
+DEFAULT_WHISPER_ENGINE = "stock"
+DEFAULT_BATCH_SIZE = 8
+DEFAULT_CHUNK_SECONDS = 0.0  # 0 = transcribe long files in one pass
+DEFAULT_CHUNK_WORKERS = 2
 
 # Download
 DEFAULT_DOWNLOAD_FORMAT = "bestaudio/best"
-DEFAULT_DOWNLOAD_CODEC = "mp3"
+DEFAULT_DOWNLOAD_CODEC = "mp3"  # or "native" to keep the original stream
+NATIVE_CODEC = "native"
+AUDIO_EXTENSIONS = ("mp3", "m4a", "opus", "webm", "ogg", "aac", "flac", "wav", "mp4")
 DEFAULT_SOCKET_TIMEOUT = 30
 DEFAULT_RETRIES = 3
 DEFAULT_RETRY_BACKOFF = 2.0
+DEFAULT_RETRY_BACKOFF_MAX = 60.0
+DEFAULT_HOST_RATE = 1.0  # Download starts per second per host
+DEFAULT_HOST_BURST = 3
+DEFAULT_HOST_CONCURRENCY = 4
+
+# Pipeline
+DEFAULT_PIPELINE_ENABLED = False
+DEFAULT_DOWNLOAD_WORKERS = 2
+DEFAULT_TRANSCRIBE_WORKERS = 1
+DEFAULT_QUEUE_DEPTH = 2
 
 # Output
 DEFAULT_OUTPUT_DIRECTORY = "./output"
 DEFAULT_OUTPUT_FORMAT = "txt"
+OUTPUT_FORMATS = ("txt", "json", "srt", "vtt", "jsonl")
+DEFAULT_OUTPUT_STREAM = False
 DEFAULT_SANITIZE_FILENAMES = True
 DEFAULT_ON_EXISTING = "skip"
 
+# Cache
+DEFAULT_CACHE_DIRECTORY = None  # None = <output directory>/.cache
+DEFAULT_AUDIO_CACHE_ENABLED = True
+DEFAULT_AUDIO_CACHE_MAX_MB = 4096
+DEFAULT_RESULT_CACHE_ENABLED = True
+DEFAULT_RESULT_CACHE_MAX_MB = 1024
+
 # Logging
 DEFAULT_LOG_LEVEL = "INFO"
 DEFAULT_LOG_FILE = None
 DEFAULT_LOG_ROTATION = "10 MB"
+DEFAULT_LOG_JSON_FILE = None  # One JSON object per record, for log shippers
+
+# Server
+DEFAULT_SERVER_SOCKET = "~/.cache/podcast-ai-agent/server.sock"
+DEFAULT_SERVER_WORKERS = 1
+DEFAULT_SERVER_MAX_QUEUE = 100
+
+# Memory
+DEFAULT_MEMORY_MEASUREMENTS = "~/.cache/podcast-ai-agent/memory.json"
+DEFAULT_MEMORY_HEADROOM_MB = 512  # Always left free for the rest of the system
+DEFAULT_MEMORY_LIMIT_MB = 0  # 0 = no cap on this process beyond available RAM
+DEFAULT_MEMORY_WAIT_SECONDS = 300.0
+DEFAULT_RAM_REQUIREMENT_MB = 1000  # For models missing from config/models.yaml
+# Used where config/models.yaml is not available, e.g. when installed as a package
+MODEL_RAM_REQUIREMENTS_MB = {
+    "tiny": 200,
+    "base": 1000,
+    "small": 2000,
+    "medium": 5000,
+    "large": 8000,
+    "large-v2": 8000,
+    "large-v3": 8000,
+}
 
 # Config
 DEFAULT_CONFIG_PATH = "config/default.yaml"
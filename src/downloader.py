@@ -1,31 +1,23 @@
 import logging
+import threading
 from pathlib import Path
 from time import sleep
+from typing import Any
+from urllib.parse import urlparse
 
 import yt_dlp
 
+from . import profiling
 from .config import DownloadConfig
+from .constants import AUDIO_EXTENSIONS, NATIVE_CODEC
+from .exceptions import DiskSpaceError, DownloadError, NetworkTimeoutError, RateLimitError
+from .rate_limit import HostLimiter, backoff_delay, parse_retry_after
+from .url_index import UrlIndex, youtube_video_id
 from .utils import check_disk_space, sanitize_filename
 
 logger = logging.getLogger("podcast_ai_agent")
 
 
-class DownloadError(Exception):
-    """Base exception for download failures"""
-
-
-class RateLimitError(DownloadError):
-    """Raised when rate limited 429"""
-
-
-class NetworkTimeoutError(DownloadError):
-    """Raised when network times out"""
-
-
-class DiskSpaceError(DownloadError):
-    """Raised when insufficient disk space"""
-
-
 class YtDlpLogger:
     def debug(self, msg):
         if msg.startswith('[debug] '):
@@ -50,19 +42,163 @@ def download_audio(
     config: DownloadConfig,
     progress_hook=None,
 ) -> Path:
+    index = UrlIndex.for_directory(output_dir)
+    with index.lock_for(url):
+        with profiling.stage("download.resolve"):
+            cached = _resolve_offline(url, output_dir, config, index)
+        if cached is not None:
+            logger.info(f"File already exists: {cached}")
+            return cached
+
+        output_path, video_id = _download_with_retries(url, output_dir, config, progress_hook)
+        index.record(url, video_id, output_path)
+        return output_path
+
+
+def _resolve_offline(
+    url: str, output_dir: Path, config: DownloadConfig, index: UrlIndex
+) -> Path | None:
+    """Find an existing download for the URL without any network request."""
+    path = index.lookup(url)
+    if path is not None:
+        return path
+
+    video_id = youtube_video_id(url)
+    if video_id:
+        path = _existing_audio(output_dir, sanitize_filename(video_id), config)
+        if path is not None:
+            index.record(url, video_id, path)
+            return path
+
+    return None
+
+
+def _existing_audio(output_dir: Path, filename_base: str, config: DownloadConfig) -> Path | None:
+    if config.codec != NATIVE_CODEC:
+        path = output_dir / f"{filename_base}.{config.codec}"
+        return path if path.exists() else None
+
+    # The extension of a native download depends on the stream that was picked
+    for ext in AUDIO_EXTENSIONS:
+        path = output_dir / f"{filename_base}.{ext}"
+        if path.exists():
+            return path
+    return None
+
+
+def _downloaded_path(result, output_dir: Path, filename_base: str, config: DownloadConfig) -> Path:
+    if config.codec != NATIVE_CODEC:
+        return output_dir / f"{filename_base}.{config.codec}"
+
+    downloads = result.get("requested_downloads") if isinstance(result, dict) else None
+    if downloads and downloads[0].get("filepath"):
+        return Path(downloads[0]["filepath"])
+
+    path = _existing_audio(output_dir, filename_base, config)
+    if path is None:
+        raise DownloadError(f"Downloaded audio for {filename_base} not found in {output_dir}")
+    return path
+
+
+class _DownloadTimers:
+    """Splits yt-dlp's download call into the transfer and ffmpeg postprocessing."""
+
+    def __init__(self):
+        self.fetch = profiling.start_stage("download.fetch")
+        self.postprocess = None
+
+    def progress_hook(self, d: dict) -> None:
+        if d.get("status") == "downloading":
+            self.fetch.bytes = d.get("downloaded_bytes") or 0
+        elif d.get("status") == "finished" and self.postprocess is None:
+            self.fetch.bytes = d.get("total_bytes") or d.get("downloaded_bytes") or 0
+            self.fetch.stop()
+            self.postprocess = profiling.start_stage("download.postprocess")
+
+    def written(self, path: Path) -> None:
+        if self.postprocess is not None and path.exists():
+            self.postprocess.add_bytes(path.stat().st_size)
+
+    def stop(self) -> None:
+        self.fetch.stop()
+        if self.postprocess is not None:
+            self.postprocess.stop()
+
+
+_limiters: dict[str, HostLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def host_limiter(url: str, config: DownloadConfig) -> HostLimiter:
+    """The process-wide limiter for the host of ``url``, shared by all download threads."""
+    if youtube_video_id(url):
+        host = "youtube.com"  # youtu.be, music. and m. links hit the same API
+    else:
+        host = (urlparse(url).hostname or "").lower().removeprefix("www.")
+    with _limiters_lock:
+        if host not in _limiters:
+            _limiters[host] = HostLimiter(
+                config.host_rate, config.host_burst, config.host_concurrency
+            )
+        return _limiters[host]
+
+
+def _download_with_retries(
+    url: str, output_dir: Path, config: DownloadConfig, progress_hook=None
+) -> tuple[Path, str]:
+    """
+    Run ``_download`` inside the host's limiter, retrying 429s.
+
+    The retry wait happens outside the host slot, so one throttled item does
+    not hold up downloads from other hosts or the rest of the batch. Only 429s
+    shrink the host's concurrency; timeouts and other errors are raised right
+    away without touching the limiter.
+    """
+    limiter = host_limiter(url, config)
+    attempt = 0
+    while True:
+        try:
+            with limiter.slot():
+                result = _download(url, output_dir, config, progress_hook)
+            limiter.succeeded()
+            return result
+        except RateLimitError as e:
+            retry_after = e.retry_after
+            limiter.throttled(retry_after)
+            if attempt >= config.retries:
+                raise
+            wait_time = max(
+                backoff_delay(attempt, config.retry_backoff, config.retry_backoff_max),
+                retry_after or 0,
+            )
+            logger.warning(
+                f"Rate limited on {url}. Retrying in {wait_time:.1f}s "
+                f"({attempt + 1}/{config.retries})..."
+            )
+            sleep(wait_time)
+            attempt += 1
+
+
+def _retry_after(error: Exception) -> float | None:
+    """Retry-After of the HTTP response behind a yt-dlp error, if there is one."""
+    cause = (getattr(error, "exc_info", None) or (None, None))[1]
+    response = getattr(cause, "response", None)
+    headers = getattr(response, "headers", None)
+    return parse_retry_after(headers.get("Retry-After")) if headers is not None else None
+
+
+def _download(
+    url: str, output_dir: Path, config: DownloadConfig, progress_hook=None
+) -> tuple[Path, str]:
+    """One download attempt; failures are mapped to this module's exceptions."""
     if not check_disk_space(output_dir, 0.1):
         raise DiskSpaceError(f"Insufficient disk space in {output_dir}")
 
     output_dir.mkdir(parents=True, exist_ok=True)
-    
-    ydl_opts = {
+
+    ydl_opts: dict[str, Any] = {
         "format": config.format,
-        "postprocessors": [
-            {
-                "key": "FFmpegExtractAudio",
-                "preferredcodec": config.codec,
-            }
-        ],
+        "postprocessors": [],
         "socket_timeout": config.socket_timeout,
         "quiet": True,
         "no_warnings": True,
@@ -70,6 +206,14 @@ def download_audio(
         "logger": YtDlpLogger(),
     }
 
+    if config.codec != NATIVE_CODEC:
+        ydl_opts["postprocessors"].append(
+            {
+                "key": "FFmpegExtractAudio",
+                "preferredcodec": config.codec,
+            }
+        )
+
     import shutil
     if shutil.which("deno"):
         pass
@@ -80,49 +224,46 @@ def download_audio(
     if progress_hook:
         ydl_opts["progress_hooks"] = [progress_hook]
 
-    retry_count = 0
-    backoff = config.retry_backoff
-
-    while retry_count <= config.retries:
-        try:
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+    try:
+        with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+            with profiling.stage("download.extract"):
                 info = ydl.extract_info(url, download=False)
-                video_id = info.get("id", "unknown_id")
-
-                if video_id == "unknown_id":
-                     title = info.get("title", "audio")
-                     filename_base = sanitize_filename(title)
-                else:
-                     filename_base = sanitize_filename(video_id)
-
-                output_path = output_dir / f"{filename_base}.{config.codec}"
-                
-                if output_path.exists():
-                    logger.info(f"File already exists: {output_path}")
-                    return output_path
-
-                ydl_opts["outtmpl"] = str(output_dir / f"{filename_base}.%(ext)s")
-
-                with yt_dlp.YoutubeDL(ydl_opts) as ydl_final:
-                    ydl_final.download([url])
-
-                return output_path
-
-        except yt_dlp.utils.DownloadError as e:
-            error_msg = str(e).lower()
-            if "429" in error_msg or "too many requests" in error_msg:
-                if retry_count < config.retries:
-                    wait_time = backoff**retry_count
-                    logger.warning(f"Rate limited. Waiting {wait_time:.1f}s...")
-                    sleep(wait_time)
-                    retry_count += 1
-                    continue
-                raise RateLimitError(f"Rate limit exceeded: {e}")
-            raise DownloadError(f"Download failed: {e}")
-
-        except Exception as e:
-            if "timeout" in str(e).lower():
-                raise NetworkTimeoutError(f"Network timeout: {e}")
-            raise DownloadError(f"Unexpected error: {e}")
-
-    raise DownloadError("Max retries exceeded")
+            video_id = info.get("id", "unknown_id")
+
+            if video_id == "unknown_id":
+                 title = info.get("title", "audio")
+                 filename_base = sanitize_filename(title)
+            else:
+                 filename_base = sanitize_filename(video_id)
+
+            output_path = _existing_audio(output_dir, filename_base, config)
+
+            if output_path is not None:
+                logger.info(f"File already exists: {output_path}")
+                return output_path, video_id
+
+            # Download from the metadata we already have instead of extracting again
+            outtmpl = str(output_dir / filename_base).replace("%", "%%") + ".%(ext)s"
+            ydl.params["outtmpl"]["default"] = outtmpl
+            timers = _DownloadTimers()
+            ydl.add_progress_hook(timers.progress_hook)
+            try:
+                result = ydl.process_ie_result(info, download=True)
+                output_path = _downloaded_path(result, output_dir, filename_base, config)
+                timers.written(output_path)
+            finally:
+                timers.stop()
+            return output_path, video_id
+
+    except yt_dlp.utils.DownloadError as e:
+        error_msg = str(e).lower()
+        if "429" in error_msg or "too many requests" in error_msg:
+            raise RateLimitError(f"Rate limit exceeded: {e}", retry_after=_retry_after(e))
+        if "timed out" in error_msg or "timeout" in error_msg:
+            raise NetworkTimeoutError(f"Network timeout: {e}")
+        raise DownloadError(f"Download failed: {e}")
+
+    except Exception as e:
+        if "timeout" in str(e).lower():
+            raise NetworkTimeoutError(f"Network timeout: {e}")
+        raise DownloadError(f"Unexpected error: {e}")
@@ -0,0 +1,38 @@
+"""
+Exceptions shared across stages.
+
+Kept free of heavy imports so the CLI can handle errors without loading
+yt-dlp, torch or Whisper. ``downloader`` and ``transcriber`` re-export them.
+"""
+
+
+class DownloadError(Exception):
+    """Base exception for download failures"""
+
+
+class RateLimitError(DownloadError):
+    """Raised when rate limited 429"""
+
+    def __init__(self, message: str, retry_after: float | None = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class NetworkTimeoutError(DownloadError):
+    """Raised when network times out"""
+
+
+class DiskSpaceError(DownloadError):
+    """Raised when insufficient disk space"""
+
+
+class TranscriptionError(Exception):
+    """Base exception for transcription failures"""
+
+
+class InsufficientMemoryError(TranscriptionError):
+    """Raised when insufficient RAM for model"""
+
+
+class InvalidAudioError(TranscriptionError):
+    """Raised when audio file is invalid"""
@@ -0,0 +1,323 @@
+"""
+In-process job queue behind the TUI.
+
+URLs are queued in order and picked up by a fixed number of worker threads.
+Each job's stage and progress live on its ``QueuedJob``, which the workers
+update and the UI polls through ``JobQueue.jobs``. Nothing here calls back
+into the UI, so a slow or busy UI never holds up a worker, and the UI thread
+never waits on a download or decode.
+
+Queued jobs can be cancelled or moved within the queue. Running jobs are
+cancelled cooperatively: the next progress report from the download or the
+decoder raises ``JobCancelled``.
+"""
+
+import contextlib
+import dataclasses
+import logging
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, Optional
+
+from .config import Config
+from .jobs import JournaledJob, run_item
+
+if TYPE_CHECKING:
+    from .transcriber import Transcriber
+
+logger = logging.getLogger("podcast_ai_agent")
+
+QUEUED = "queued"
+DOWNLOADING = "downloading"
+TRANSCRIBING = "transcribing"
+DONE = "done"
+FAILED = "failed"
+CANCELLED = "cancelled"
+FINISHED_STAGES = (DONE, FAILED, CANCELLED)
+
+
+class JobCancelled(Exception):
+    """Raised from a running job's progress report once it has been cancelled"""
+
+
+@dataclass(eq=False)
+class QueuedJob:
+    id: int
+    url: str
+    transcribe: bool = True
+    stage: str = QUEUED
+    percent: float = 0.0
+    bytes_per_second: float | None = None
+    realtime_factor: float | None = None
+    downloaded_bytes: int = 0
+    audio_seconds: float = 0.0
+    error: str | None = None
+    output_paths: list[Path] = field(default_factory=list)
+    started: float | None = None
+    finished: float | None = None
+    _cancel: threading.Event = field(default_factory=threading.Event, repr=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    @property
+    def done(self) -> bool:
+        return self.stage in FINISHED_STAGES
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel.is_set()
+
+    def report(self, **fields) -> None:
+        """Update progress fields; raises ``JobCancelled`` if the job was cancelled."""
+        if self._cancel.is_set():
+            raise JobCancelled(f"Job {self.id} cancelled")
+        with self._lock:
+            for name, value in fields.items():
+                setattr(self, name, value)
+
+    def snapshot(self) -> "QueuedJob":
+        with self._lock:
+            return dataclasses.replace(self)
+
+
+Runner = Callable[[Config, QueuedJob], list[Path]]
+
+
+def parse_urls(text: str) -> list[str]:
+    """URLs from pasted text: one or more per line, ``#`` comments and blanks skipped."""
+    urls = []
+    for line in text.splitlines():
+        line = line.strip()
+        if line and not line.startswith("#"):
+            urls.extend(line.split())
+    return urls
+
+
+def run_job(
+    config: Config, job: QueuedJob, transcriber: Optional["Transcriber"] = None
+) -> list[Path]:
+    """
+    Download (and transcribe) ``job.url`` with the same journaled steps as
+    ``process``. Download progress fills the first half of ``percent`` when
+    the job also transcribes. Without a ``transcriber``, one is created for
+    this job.
+    """
+    from .transcriber import Transcriber, TranscriptionProgress
+
+    share = 50.0 if job.transcribe else 100.0
+
+    def download_hook(d: dict) -> None:
+        if d.get("status") != "downloading":
+            job.report()
+            return
+        total = d.get("total_bytes") or d.get("total_bytes_estimate")
+        downloaded = d.get("downloaded_bytes") or 0
+        job.report(
+            stage=DOWNLOADING,
+            downloaded_bytes=downloaded,
+            bytes_per_second=d.get("speed"),
+            percent=share * downloaded / total if total else job.percent,
+        )
+
+    def transcription_progress(p: TranscriptionProgress) -> None:
+        job.report(
+            stage=TRANSCRIBING,
+            bytes_per_second=None,
+            percent=share + p.fraction * (100.0 - share),
+            realtime_factor=p.realtime_factor,
+            audio_seconds=p.processed_seconds,
+        )
+
+    journaled = JournaledJob(config, resume=True)
+    outputs = journaled.start(job.url)
+    if outputs is not None:
+        logger.info(f"Already done: {job.url}")
+        return outputs
+    try:
+        if not job.transcribe:
+            return [journaled.download(job.url, progress_hook=download_hook)]
+
+        with contextlib.ExitStack() as stack:
+            if transcriber is None:
+                transcriber = stack.enter_context(Transcriber(config.whisper, config.cache))
+            return run_item(
+                config,
+                journaled,
+                job.url,
+                transcriber,
+                progress_hook=download_hook,
+                progress_callback=transcription_progress,
+            )
+    except Exception as e:
+        journaled.failed(job.url, e)
+        raise
+
+
+class JobQueue:
+    """
+    FIFO of ``QueuedJob`` run by ``workers`` threads.
+
+    ``runner`` does the work of one job and reports progress through
+    ``QueuedJob.report``; it defaults to ``run_job`` with one transcriber
+    shared by every job, so chunk workers are started once.
+    """
+
+    def __init__(self, config: Config, workers: int = 2, runner: Runner | None = None):
+        self.config = config
+        self.runner = runner or self._run_job
+        self._transcriber: Transcriber | None = None
+        self._cond = threading.Condition()
+        self._jobs: dict[int, QueuedJob] = {}
+        self._pending: list[QueuedJob] = []
+        self._next_id = 1
+        self._closed = False
+        self._started = time.monotonic()
+        self._workers = [
+            threading.Thread(target=self._work, name=f"job-queue-{i}", daemon=True)
+            for i in range(max(1, workers))
+        ]
+        for worker in self._workers:
+            worker.start()
+
+    def submit(self, urls: list[str], transcribe: bool = True) -> list[QueuedJob]:
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("Job queue is closed")
+            jobs = []
+            for url in urls:
+                job = QueuedJob(self._next_id, url, transcribe)
+                self._next_id += 1
+                self._jobs[job.id] = job
+                self._pending.append(job)
+                jobs.append(job)
+            self._cond.notify(len(jobs))
+        for job in jobs:
+            logger.info(f"Queued job {job.id}: {job.url}")
+        return jobs
+
+    def cancel(self, job_id: int) -> bool:
+        """Cancel a queued or running job; False if it has already finished."""
+        with self._cond:
+            job = self._jobs.get(job_id)
+            if job is None or job.done:
+                return False
+            job._cancel.set()
+            if job in self._pending:
+                self._pending.remove(job)
+                self._finish(job, CANCELLED)
+        logger.info(f"Cancelled job {job_id}: {job.url}")
+        return True
+
+    def move(self, job_id: int, offset: int) -> bool:
+        """
+        Move a queued job ``offset`` places towards the front (negative) or back
+        of the queue. Returns False if the job is no longer queued.
+        """
+        with self._cond:
+            job = self._jobs.get(job_id)
+            if job not in self._pending:
+                return False
+            index = self._pending.index(job)
+            self._pending.pop(index)
+            self._pending.insert(max(0, min(len(self._pending), index + offset)), job)
+            return True
+
+    def position(self, job_id: int) -> int | None:
+        """Zero-based place of a queued job in the queue."""
+        with self._cond:
+            job = self._jobs.get(job_id)
+            return self._pending.index(job) if job in self._pending else None
+
+    def positions(self) -> dict[int, int]:
+        """Zero-based place of every queued job, by job id."""
+        with self._cond:
+            return {job.id: index for index, job in enumerate(self._pending)}
+
+    def jobs(self) -> list[QueuedJob]:
+        """Consistent copies of every job, in submission order."""
+        with self._cond:
+            jobs = list(self._jobs.values())
+        return [job.snapshot() for job in jobs]
+
+    def stats(self) -> dict:
+        """Counts per stage and the aggregate throughput of the running jobs."""
+        jobs = self.jobs()
+        counts = {stage: 0 for stage in (QUEUED, DOWNLOADING, TRANSCRIBING, *FINISHED_STAGES)}
+        for job in jobs:
+            counts[job.stage] += 1
+        downloading = [j for j in jobs if j.stage == DOWNLOADING and j.bytes_per_second]
+        factors = [j.realtime_factor for j in jobs if j.stage == TRANSCRIBING and j.realtime_factor]
+        done_audio = sum(j.audio_seconds for j in jobs if j.stage == DONE)
+        return {
+            **counts,
+            "bytes_per_second": sum(j.bytes_per_second for j in downloading),
+            # Summed over running jobs; above 1.0 is faster than real time
+            "audio_seconds_per_second": sum(1 / factor for factor in factors if factor),
+            "audio_seconds_done": done_audio,
+            "elapsed_seconds": time.monotonic() - self._started,
+        }
+
+    def close(self, cancel: bool = True, timeout: float | None = None) -> None:
+        """Stop accepting jobs; with ``cancel``, cancel everything not yet finished."""
+        with self._cond:
+            self._closed = True
+            ids = [job.id for job in self._jobs.values() if not job.done]
+            self._cond.notify_all()
+        if cancel:
+            for job_id in ids:
+                self.cancel(job_id)
+        for worker in self._workers:
+            worker.join(timeout)
+        # Workers still finishing a cancelled job keep using the transcriber
+        if self._transcriber is not None and not any(w.is_alive() for w in self._workers):
+            self._transcriber.close()
+
+    def _run_job(self, config: Config, job: QueuedJob) -> list[Path]:
+        return run_job(config, job, self._shared_transcriber() if job.transcribe else None)
+
+    def _shared_transcriber(self) -> "Transcriber":
+        from .transcriber import Transcriber
+
+        with self._cond:
+            if self._transcriber is None:
+                self._transcriber = Transcriber(self.config.whisper, self.config.cache)
+            return self._transcriber
+
+    def _finish(self, job: QueuedJob, stage: str, error: str | None = None) -> None:
+        with job._lock:
+            job.stage = stage
+            job.error = error
+            job.bytes_per_second = None
+            job.finished = time.monotonic()
+            if stage == DONE:
+                job.percent = 100.0
+
+    def _work(self) -> None:
+        while True:
+            with self._cond:
+                while not self._pending and not self._closed:
+                    self._cond.wait()
+                if not self._pending:
+                    return
+                job = self._pending.pop(0)
+                job.started = time.monotonic()
+            self._run(job)
+
+    def _run(self, job: QueuedJob) -> None:
+        try:
+            job.report(stage=DOWNLOADING)
+            output_paths = self.runner(self.config, job)
+        except Exception as e:  # noqa: BLE001 - recorded on the job
+            # Cancellation surfaces as whatever the downloader or decoder wraps it in
+            if job.cancelled:
+                self._finish(job, CANCELLED)
+            else:
+                logger.error(f"Job {job.id} failed for {job.url}: {e}")
+                self._finish(job, FAILED, str(e))
+            return
+        with job._lock:
+            job.output_paths = list(output_paths)
+        self._finish(job, DONE)
+        logger.info(f"Job {job.id} done: {job.url}")
@@ -0,0 +1,177 @@
+"""
+Per-item job steps shared by the CLI, the pipeline and the daemon.
+
+Nothing here imports yt-dlp, torch or Whisper at module level; the downloader
+and transcriber are imported by the steps that run them.
+"""
+
+from pathlib import Path
+from typing import TYPE_CHECKING, Optional
+
+from . import profiling
+from .config import Config
+from .journal import JobJournal
+from .output import OutputWriter
+from .url_index import youtube_video_id
+
+if TYPE_CHECKING:
+    from .transcriber import ProgressCallback
+
+
+def download_audio(url: str, output_dir: Path, config, progress_hook=None) -> Path:
+    from .downloader import download_audio
+
+    return download_audio(url, output_dir, config, progress_hook=progress_hook)
+
+
+def output_writer(
+    config: Config, url: str, audio_path: Path, on_existing: str | None = None
+) -> OutputWriter:
+    metadata = {
+        "url": url,
+        "model": config.whisper.model,
+        "language": config.whisper.language,
+        "translate": config.whisper.translate,
+    }
+    return OutputWriter(
+        config.output.directory / audio_path.stem,
+        metadata=metadata,
+        on_existing=on_existing or config.output.on_existing,
+    )
+
+
+def write_output(
+    config: Config, url: str, audio_path: Path, result: dict, on_existing: str | None = None
+) -> list[Path]:
+    writer = output_writer(config, url, audio_path, on_existing)
+    with profiling.stage("write") as timer:
+        output_paths = writer.write(result, config.output.format)
+        timer.add_bytes(sum(path.stat().st_size for path in output_paths))
+    return output_paths
+
+
+def stream_output(
+    config: Config,
+    transcriber,
+    url: str,
+    audio_path: Path,
+    progress_callback: Optional["ProgressCallback"] = None,
+    on_existing: str | None = None,
+) -> list[Path]:
+    writer = output_writer(config, url, audio_path, on_existing)
+    if progress_callback is None:
+        return transcriber.transcribe_to_files(audio_path, writer, config.output.format)
+    return transcriber.transcribe_to_files(
+        audio_path, writer, config.output.format, progress_callback
+    )
+
+
+class JournaledJob:
+    """
+    Download and checkpoint steps shared by the sequential and pipelined runs.
+
+    Each completed stage is recorded in the output directory's job journal.
+    With ``resume``, items an earlier run finished are skipped and partial
+    items pick up from their downloaded audio (and, through the result
+    cache, their transcription).
+    """
+
+    def __init__(self, config: Config, resume: bool):
+        self.config = config
+        self.resume = resume
+        self.journal = JobJournal.for_directory(config.output.directory)
+        self.resumed: set = set()
+
+    @property
+    def settings(self) -> dict:
+        """
+        What the written outputs depend on. An item an earlier run wrote with
+        other formats, another model or other decoding settings is redone.
+        """
+        whisper = self.config.whisper
+        return {
+            "formats": sorted(self.config.output.format),
+            **whisper.model_dump(
+                include={
+                    "model",
+                    "language",
+                    "translate",
+                    "temperature",
+                    "precision",
+                    "engine",
+                    "batch_size",
+                    "chunk_seconds",
+                }
+            ),
+        }
+
+    def start(self, url: str) -> list[Path] | None:
+        """Register ``url``; returns its outputs if an earlier run finished it."""
+        if self.resume:
+            outputs = self.journal.finished_outputs(url, self.settings)
+            if outputs is not None:
+                return outputs
+            if self.journal.stage(url) is not None:
+                self.resumed.add(url)
+                return None
+        self.journal.record(url, "resolved", video_id=youtube_video_id(url))
+        return None
+
+    def on_existing(self, url: str) -> str | None:
+        # Files left by an interrupted run of this very item may be incomplete
+        return "overwrite" if url in self.resumed else None
+
+    def download(self, url: str, progress_hook=None) -> Path:
+        if self.resume:
+            audio_path = self.journal.downloaded_audio(url)
+            if audio_path is not None:
+                return audio_path
+        audio_path = download_audio(
+            url, self.config.output.directory, self.config.download, progress_hook=progress_hook
+        )
+        self.journal.record(url, "downloaded", audio_path=str(audio_path))
+        return audio_path
+
+    def transcribed(self, url: str) -> None:
+        self.journal.record(url, "transcribed")
+
+    def written(self, url: str, output_paths: list[Path]) -> None:
+        self.journal.record(
+            url, "written", output_paths=[str(p) for p in output_paths], settings=self.settings
+        )
+
+    def failed(self, url: str, error: Exception) -> None:
+        self.journal.record_failure(url, error)
+
+
+def run_item(
+    config: Config,
+    job: JournaledJob,
+    url: str,
+    transcriber,
+    progress_hook=None,
+    progress_callback: Optional["ProgressCallback"] = None,
+) -> list[Path]:
+    """Download, transcribe and write one URL, checkpointing each stage in the journal."""
+    with profiling.stage("download"):
+        audio_path = job.download(url, progress_hook=progress_hook)
+
+    if config.output.stream:
+        with profiling.stage("transcribe"):
+            output_paths = stream_output(
+                config,
+                transcriber,
+                url,
+                audio_path,
+                progress_callback,
+                on_existing=job.on_existing(url),
+            )
+        job.transcribed(url)
+    else:
+        with profiling.stage("transcribe"):
+            result = transcriber.transcribe(audio_path, progress_callback=progress_callback)
+        job.transcribed(url)
+        output_paths = write_output(config, url, audio_path, result, job.on_existing(url))
+
+    job.written(url, output_paths)
+    return output_paths
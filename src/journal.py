@@ -0,0 +1,120 @@
+import json
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+
+from .url_index import canonicalize_url
+
+logger = logging.getLogger("podcast_ai_agent")
+
+JOURNAL_FILE_NAME = ".journal.jsonl"
+
+STAGES = ("resolved", "downloaded", "transcribed", "written")
+
+
+class JobJournal:
+    """
+    Append-only record of how far each URL of a batch got.
+
+    Every stage transition (resolved, downloaded, transcribed, written) is
+    appended as one JSON line and fsynced, so after a crash the journal lists
+    exactly the stages that completed. Replaying it on the next run lets
+    finished items be skipped and partial ones resume from their last stage.
+    A torn final line from a crash is ignored. Use ``for_directory`` so every
+    caller working on the same output directory shares one instance.
+    """
+
+    _instances: dict[Path, "JobJournal"] = {}
+    _instances_lock = threading.Lock()
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._entries: dict[str, dict] = {}
+        if path.exists():
+            self._replay()
+
+    @classmethod
+    def for_directory(cls, output_dir: Path) -> "JobJournal":
+        path = (Path(output_dir) / JOURNAL_FILE_NAME).resolve()
+        with cls._instances_lock:
+            if path not in cls._instances:
+                cls._instances[path] = cls(path)
+            return cls._instances[path]
+
+    def _replay(self) -> None:
+        try:
+            lines = self.path.read_text(encoding="utf-8").splitlines()
+        except OSError as e:
+            logger.warning(f"Ignoring unreadable job journal {self.path}: {e}")
+            return
+
+        for number, line in enumerate(lines, 1):
+            try:
+                record = json.loads(line)
+                self._apply(record)
+            except (ValueError, KeyError, TypeError):
+                logger.warning(f"Skipping damaged line {number} of {self.path}")
+
+    def _apply(self, record: dict) -> None:
+        entry = self._entries.setdefault(record["url"], {})
+        if "error" in record:
+            entry["error"] = record["error"]
+            return
+        if record["stage"] not in STAGES:
+            raise KeyError(record["stage"])
+        entry.update(record)
+        entry.pop("error", None)
+
+    def record(self, url: str, stage: str, **fields) -> None:
+        """Append a completed stage for ``url`` with optional details (paths, ids)."""
+        if stage not in STAGES:
+            raise ValueError(f"Unknown journal stage: {stage}")
+        self._append({"url": canonicalize_url(url), "stage": stage, "time": time.time(), **fields})
+
+    def record_failure(self, url: str, error: Exception) -> None:
+        """Note a failure; the last completed stage is kept for the next resume."""
+        self._append({"url": canonicalize_url(url), "error": str(error), "time": time.time()})
+
+    def _append(self, record: dict) -> None:
+        line = json.dumps(record, ensure_ascii=False, default=str) + "\n"
+        with self._lock:
+            self._apply(record)
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with self.path.open("a", encoding="utf-8") as f:
+                f.write(line)
+                f.flush()
+                os.fsync(f.fileno())
+
+    def stage(self, url: str) -> str | None:
+        """Last completed stage of ``url``, or None if it never got anywhere."""
+        with self._lock:
+            entry = self._entries.get(canonicalize_url(url))
+        return entry.get("stage") if entry else None
+
+    def finished_outputs(self, url: str, settings: dict | None = None) -> list[Path] | None:
+        """
+        Output files of a fully written item, if all of them still exist and
+        were written with ``settings`` (when given).
+        """
+        with self._lock:
+            entry = dict(self._entries.get(canonicalize_url(url)) or {})
+        if entry.get("stage") != "written":
+            return None
+        if settings is not None and entry.get("settings") != settings:
+            return None
+        paths = [Path(p) for p in entry.get("output_paths", [])]
+        if not paths or not all(p.exists() for p in paths):
+            return None
+        return paths
+
+    def downloaded_audio(self, url: str) -> Path | None:
+        """Audio file recorded for ``url`` by an earlier run, if it still exists."""
+        with self._lock:
+            entry = self._entries.get(canonicalize_url(url)) or {}
+            audio_path = entry.get("audio_path")
+        if audio_path and Path(audio_path).exists():
+            return Path(audio_path)
+        return None
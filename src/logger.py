@@ -1,58 +1,223 @@
+"""
+Logging setup.
+
+Records are put on a queue by a ``QueueHandler`` on the calling thread and
+written by a ``QueueListener`` thread, so a download or decode never waits
+on a terminal, a file or the TUI. Setting up again replaces the previous
+pipeline instead of adding handlers next to it.
+"""
+
+import atexit
+import copy
+import json
 import logging
+import os
+import queue
 import sys
-from logging.handlers import RotatingFileHandler
+import threading
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from pathlib import Path
 
+LOGGER_NAME = "podcast_ai_agent"
+DATE_FORMAT = "%Y-%m-%d %H:%M:%S%z"
+
+# Attributes every LogRecord has; anything else came in through ``extra``
+_RECORD_ATTRIBUTES = frozenset(vars(logging.LogRecord("", logging.INFO, "", 0, "", None, None)))
+_RECORD_ATTRIBUTES |= {"message", "asctime"}
+
+
+class ColoredFormatter(logging.Formatter):
+    GRAY = "\033[90m"
+    GREEN = "\033[92m"
+    YELLOW = "\033[93m"
+    RED = "\033[91m"
+    ORANGE = "\033[38;5;208m"
+    RESET = "\033[0m"
+
+    def __init__(self):
+        super().__init__(datefmt=DATE_FORMAT)
+        colors = {
+            logging.DEBUG: self.ORANGE,
+            logging.INFO: self.GREEN,
+            logging.WARNING: self.YELLOW,
+            logging.ERROR: self.RED,
+            logging.CRITICAL: self.RED,
+        }
+        self._formatters = {
+            levelno: self._formatter(color + "%(levelname)-8s" + self.RESET)
+            for levelno, color in colors.items()
+        }
+        self._default = self._formatter("%(levelname)-8s")
+
+    def _formatter(self, level_fmt: str) -> logging.Formatter:
+        timestamp_fmt = self.GRAY + "[%(asctime)s]" + self.RESET
+        fmt = f"\n{timestamp_fmt} {level_fmt} %(message)s"
+        return logging.Formatter(fmt, datefmt=DATE_FORMAT)
+
+    def format(self, record):
+        return self._formatters.get(record.levelno, self._default).format(record)
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per record, with any ``extra`` fields at the top level."""
+
+    def format(self, record):
+        entry = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "thread": record.threadName,
+            "process": record.process,
+        }
+        for name, value in vars(record).items():
+            if name not in _RECORD_ATTRIBUTES and not name.startswith("_"):
+                entry[name] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exception"] = record.exc_text
+        if record.stack_info:
+            entry["stack"] = record.stack_info
+        return json.dumps(entry, default=str)
+
+
+class _ConsoleHandler(logging.StreamHandler):
+    """Writes to ``sys.stderr`` as it is when the record is written, not at setup."""
+
+    def __init__(self):
+        logging.Handler.__init__(self)
+
+    @property
+    def stream(self):
+        return sys.stderr
+
+
+class _PreparedQueueHandler(QueueHandler):
+    """
+    Resolves the message and traceback on the calling thread, because the
+    arguments may change or go away before the listener formats the record.
+    Unlike ``QueueHandler``, the traceback is kept apart from the message so
+    the JSON file can store it as its own field.
+    """
+
+    def prepare(self, record):
+        message = record.getMessage()
+        record = copy.copy(record)
+        record.message = message
+        record.msg = message
+        record.args = None
+        if record.exc_info:
+            if not record.exc_text:
+                record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+class _Pipeline:
+    def __init__(self, handlers: list[logging.Handler]):
+        self.handlers = handlers
+        self.queue_handler = _PreparedQueueHandler(queue.SimpleQueue())
+        self.listener = QueueListener(
+            self.queue_handler.queue, *handlers, respect_handler_level=True
+        )
+        self.started = False
+
+    def start(self) -> None:
+        self.listener.start()
+        self.started = True
+
+    def stop(self) -> None:
+        # Writes everything already queued before returning
+        if self.started:
+            self.listener.stop()
+            self.started = False
+        for handler in self.handlers:
+            handler.close()
+
+    def restart_in_child(self) -> None:
+        # The listener thread was not forked; give the child its own
+        self.queue_handler.queue = queue.SimpleQueue()
+        self.listener = QueueListener(
+            self.queue_handler.queue, *self.handlers, respect_handler_level=True
+        )
+        self.listener.start()
+        self.started = True
+
+
+_lock = threading.Lock()
+_pipeline: _Pipeline | None = None
+
+
+def install_handlers(handlers: list[logging.Handler], level: str = "INFO") -> logging.Logger:
+    """
+    Send the application's records to ``handlers`` through the logging queue,
+    replacing the handlers of any earlier setup.
+    """
+    global _pipeline
+    logger = logging.getLogger(LOGGER_NAME)
+    logger.setLevel(getattr(logging, level.upper()))
+    with _lock:
+        _remove_pipeline(logger)
+        _pipeline = _Pipeline(handlers)
+        _pipeline.start()
+        logger.addHandler(_pipeline.queue_handler)
+    return logger
+
+
+def stop_logging() -> None:
+    """Write out queued records and remove the handlers installed here."""
+    with _lock:
+        _remove_pipeline(logging.getLogger(LOGGER_NAME))
+
+
+def _remove_pipeline(logger: logging.Logger) -> None:
+    global _pipeline
+    if _pipeline is None:
+        return
+    logger.removeHandler(_pipeline.queue_handler)
+    _pipeline.stop()
+    _pipeline = None
+
+
+def _after_fork_in_child() -> None:
+    if _pipeline is not None:
+        _pipeline.restart_in_child()
+
+
+atexit.register(stop_logging)
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_after_fork_in_child)
+
+
+def file_handlers(
+    log_file: str | None = None,
+    json_file: str | None = None,
+    rotation_size: int = 10 * 1024 * 1024,
+) -> list[logging.Handler]:
+    """Rotating handlers for the plain-text and JSON log files that are set."""
+    handlers: list[logging.Handler] = []
+    for path, formatter in (
+        (log_file, logging.Formatter("[%(asctime)s] %(levelname)-8s %(message)s", DATE_FORMAT)),
+        (json_file, JsonFormatter()),
+    ):
+        if not path:
+            continue
+        log_path = Path(path)
+        log_path.parent.mkdir(parents=True, exist_ok=True)
+        handler = RotatingFileHandler(log_path, maxBytes=rotation_size, backupCount=3)
+        handler.setFormatter(formatter)
+        handlers.append(handler)
+    return handlers
+
 
 def setup_logging(
     level: str = "INFO",
     log_file: str | None = None,
     rotation_size: int = 10 * 1024 * 1024,
+    json_file: str | None = None,
 ) -> logging.Logger:
-    logger = logging.getLogger("podcast_ai_agent")
-    logger.setLevel(getattr(logging, level.upper()))
-
-    class ColoredFormatter(logging.Formatter):
-        GRAY = "\033[90m"
-        GREEN = "\033[92m"
-        YELLOW = "\033[93m"
-        RED = "\033[91m"
-        ORANGE = "\033[38;5;208m"
-        RESET = "\033[0m"
-
-        def format(self, record):
-            timestamp_fmt = self.GRAY + "[%(asctime)s]" + self.RESET
-            
-            level_fmt = ""
-            if record.levelno == logging.DEBUG:
-                level_fmt = self.ORANGE + "%(levelname)-8s" + self.RESET
-            elif record.levelno == logging.INFO:
-                level_fmt = self.GREEN + "%(levelname)-8s" + self.RESET
-            elif record.levelno == logging.WARNING:
-                level_fmt = self.YELLOW + "%(levelname)-8s" + self.RESET
-            elif record.levelno == logging.ERROR:
-                level_fmt = self.RED + "%(levelname)-8s" + self.RESET
-            elif record.levelno == logging.CRITICAL:
-                level_fmt = self.RED + "%(levelname)-8s" + self.RESET
-            else:
-                level_fmt = "%(levelname)-8s"
-                
-            fmt = f"\n{timestamp_fmt} {level_fmt} %(message)s"
-            formatter = logging.Formatter(fmt, datefmt="%Y-%m-%d %H:%M:%S%z")
-            return formatter.format(record)
-
-    console = logging.StreamHandler(sys.stderr)
+    console = _ConsoleHandler()
     console.setFormatter(ColoredFormatter())
-    logger.addHandler(console)
-
-    if log_file:
-        file_formatter = logging.Formatter(
-            "[%(asctime)s] %(levelname)-8s %(message)s", datefmt="%Y-%m-%d %H:%M:%S%z"
-        )
-        log_path = Path(log_file)
-        log_path.parent.mkdir(parents=True, exist_ok=True)
-        file_handler = RotatingFileHandler(log_path, maxBytes=rotation_size, backupCount=3)
-        file_handler.setFormatter(file_formatter)
-        logger.addHandler(file_handler)
-
-    return logger
+    return install_handlers([console, *file_handlers(log_file, json_file, rotation_size)], level)
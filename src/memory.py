@@ -0,0 +1,364 @@
+"""
+Memory admission control based on measured footprints.
+
+Every model load and every decode is measured: the process RSS is sampled
+while it runs, and the growth over the starting RSS is recorded per
+(model, device, precision). Decode peaks are kept together with the audio
+duration, because the decoded PCM, STFT and mel spectrogram all grow with
+the length of the episode. Measurements are persisted, so later runs (and
+other processes on the same machine) start from real numbers instead of the
+static guesses in ``config/models.yaml``.
+
+Before loading a model or decoding a file, the caller reserves the expected
+peak with ``MemoryGovernor.admit``. A reservation waits until the memory
+available to the system, minus a headroom and minus what other jobs of this
+process have reserved but not yet allocated, covers it.
+"""
+
+import contextlib
+import itertools
+import json
+import logging
+import os
+import threading
+import time
+from collections.abc import Iterator
+from dataclasses import dataclass
+from pathlib import Path
+
+import psutil
+
+from .config import MemoryConfig
+from .constants import (
+    DEFAULT_MEMORY_HEADROOM_MB,
+    DEFAULT_MEMORY_LIMIT_MB,
+    DEFAULT_MEMORY_WAIT_SECONDS,
+)
+from .exceptions import InsufficientMemoryError
+from .utils import estimate_ram_requirement
+
+logger = logging.getLogger("podcast_ai_agent")
+
+ModelKey = tuple[str, str, str]
+
+MB = 1024**2
+# Decoded audio is 16 kHz float32; the STFT, magnitudes and mel spectrogram
+# of the whole file add about four times that again
+PRIOR_DECODE_MB_PER_SECOND = 16000 * 4 * 5 / MB
+# Share of the static model estimate assumed for decoding before any measurement
+PRIOR_DECODE_FIXED_SHARE = 0.25
+# Duration assumed when sizing a job whose length is unknown
+ASSUMED_AUDIO_SECONDS = 3600.0
+MAX_DECODE_SAMPLES = 16
+SAMPLE_INTERVAL = 0.02
+
+
+def rss_mb() -> float:
+    return psutil.Process().memory_info().rss / MB
+
+
+def available_mb() -> float:
+    return psutil.virtual_memory().available / MB
+
+
+def _key_name(key: ModelKey) -> str:
+    return "/".join(key)
+
+
+@dataclass
+class MemoryUsage:
+    """RSS of this process before, at the peak of, and after a measured block."""
+
+    start_mb: float
+    peak_mb: float = 0.0
+    end_mb: float = 0.0
+
+    @property
+    def peak_delta_mb(self) -> float:
+        return max(0.0, self.peak_mb - self.start_mb)
+
+    @property
+    def resident_delta_mb(self) -> float:
+        return max(0.0, self.end_mb - self.start_mb)
+
+
+class _PeakSampler:
+    def __init__(self, usage: MemoryUsage, interval: float):
+        self.usage = usage
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="memory-sampler", daemon=True)
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.usage.peak_mb = max(self.usage.peak_mb, rss_mb())
+
+    def __enter__(self) -> MemoryUsage:
+        self._thread.start()
+        return self.usage
+
+    def __exit__(self, *exc) -> None:
+        self._stop.set()
+        self._thread.join()
+        self.usage.end_mb = rss_mb()
+        self.usage.peak_mb = max(self.usage.peak_mb, self.usage.end_mb)
+
+
+class MemoryGovernor:
+    """
+    Admits model loads and decodes only when their measured peak fits.
+
+    ``headroom_mb`` is always left free for the rest of the system. With a
+    ``limit_mb``, this process is also kept below that RSS. A reservation that
+    does not fit waits for jobs of this process to finish; when none are
+    running, it waits up to ``wait_seconds`` for other processes to free
+    memory and then raises ``InsufficientMemoryError``.
+
+    Measurements taken while several jobs run in one process include each
+    other's allocations, so they err on the high side.
+    """
+
+    def __init__(
+        self,
+        headroom_mb: int = DEFAULT_MEMORY_HEADROOM_MB,
+        limit_mb: int = DEFAULT_MEMORY_LIMIT_MB,
+        wait_seconds: float = DEFAULT_MEMORY_WAIT_SECONDS,
+        path: Path | None = None,
+        poll_interval: float = 1.0,
+    ):
+        self.headroom_mb = headroom_mb
+        self.limit_mb = limit_mb
+        self.wait_seconds = wait_seconds
+        self.poll_interval = poll_interval
+        self.path = Path(path).expanduser() if path is not None else None
+        self._cond = threading.Condition()
+        self._ids = itertools.count()
+        # Reservation id -> (reserved MB, RSS when admitted)
+        self._reservations: dict[int, tuple[float, float]] = {}
+        self._models: dict[str, dict] = self._read()
+        self.waits = 0
+
+    def _after_fork(self) -> None:
+        # Reservations belong to the parent's jobs, which do not run in the child
+        self._cond = threading.Condition()
+        self._reservations = {}
+
+    def config(self) -> MemoryConfig:
+        """The settings in effect, e.g. to configure a worker process the same way."""
+        return MemoryConfig(
+            measurements=self.path,
+            headroom_mb=self.headroom_mb,
+            limit_mb=self.limit_mb,
+            wait_seconds=self.wait_seconds,
+        )
+
+    def configure(self, config: MemoryConfig) -> None:
+        with self._cond:
+            self.headroom_mb = config.headroom_mb
+            self.limit_mb = config.limit_mb
+            self.wait_seconds = config.wait_seconds
+            self.path = (
+                Path(config.measurements).expanduser() if config.measurements is not None else None
+            )
+            self._models.update(self._read())
+
+    # Estimates
+
+    def load_mb(self, key: ModelKey) -> float:
+        """Peak RSS growth while loading the model, measured or from ``models.yaml``."""
+        measured = self._models.get(_key_name(key), {}).get("load_peak_mb")
+        return measured if measured is not None else float(estimate_ram_requirement(key[0]))
+
+    def resident_mb(self, key: ModelKey) -> float | None:
+        """Measured RSS growth that stays after the model has loaded."""
+        return self._models.get(_key_name(key), {}).get("resident_mb")
+
+    def decode_mb(self, key: ModelKey, seconds: float | None = None) -> float:
+        """
+        Expected peak RSS growth for decoding ``seconds`` of audio with a loaded model.
+
+        The estimate is a line over the recorded (duration, peak) samples,
+        raised until it is at or above every one of them.
+        """
+        samples = self._models.get(_key_name(key), {}).get("decode", [])
+        if seconds is None:
+            seconds = max([s for s, _ in samples], default=ASSUMED_AUDIO_SECONDS)
+
+        if not samples:
+            fixed = estimate_ram_requirement(key[0]) * PRIOR_DECODE_FIXED_SHARE
+            return fixed + PRIOR_DECODE_MB_PER_SECOND * seconds
+
+        slope = _slope(samples)
+        if slope is None:
+            slope = PRIOR_DECODE_MB_PER_SECOND
+        fixed = max(peak - slope * s for s, peak in samples)
+        return max(0.0, fixed + slope * seconds)
+
+    # Admission
+
+    def _headroom(self) -> tuple[float, float]:
+        """MB that can still be reserved, and the process RSS it was computed at."""
+        rss = rss_mb()
+        unrealized = sum(
+            max(0.0, reserved - max(0.0, rss - admitted_rss))
+            for reserved, admitted_rss in self._reservations.values()
+        )
+        free = available_mb() - self.headroom_mb - unrealized
+        if self.limit_mb:
+            free = min(free, self.limit_mb - rss - unrealized)
+        return free, rss
+
+    @contextlib.contextmanager
+    def admit(self, mb: float, what: str) -> Iterator[None]:
+        """Hold a reservation of ``mb`` for the duration of the block."""
+        deadline = None
+        logged = False
+        with self._cond:
+            while True:
+                free, rss = self._headroom()
+                if mb <= free:
+                    break
+                if self._reservations:
+                    # Jobs of this process will release memory; wait for them
+                    deadline = None
+                    timeout = self.poll_interval
+                else:
+                    now = time.monotonic()
+                    if deadline is None:
+                        deadline = now + self.wait_seconds
+                    if now >= deadline:
+                        raise InsufficientMemoryError(
+                            f"Insufficient RAM: {max(0.0, free):.0f}MB available, "
+                            f"{mb:.0f}MB required for {what}"
+                        )
+                    timeout = min(self.poll_interval, deadline - now)
+                if not logged:
+                    logger.info(
+                        f"Waiting for memory: {mb:.0f}MB needed for {what}, "
+                        f"{max(0.0, free):.0f}MB available"
+                    )
+                    self.waits += 1
+                    logged = True
+                self._cond.wait(timeout)
+            token = next(self._ids)
+            self._reservations[token] = (mb, rss)
+        try:
+            yield
+        finally:
+            with self._cond:
+                del self._reservations[token]
+                self._cond.notify_all()
+
+    def workers_that_fit(
+        self,
+        key: ModelKey,
+        requested: int,
+        seconds: float | None = None,
+        model_mb: float = 0.0,
+    ) -> int:
+        """
+        How many of ``requested`` worker processes, each loading ``model_mb`` of
+        model and decoding ``seconds`` of audio, fit. Always at least one.
+        """
+        per_worker = model_mb + self.decode_mb(key, seconds)
+        with self._cond:
+            free, _ = self._headroom()
+        if per_worker <= 0:
+            return requested
+        return max(1, min(requested, int(free // per_worker)))
+
+    # Measurement
+
+    @contextlib.contextmanager
+    def measure(self) -> Iterator[MemoryUsage]:
+        """Sample the RSS of this process while the block runs."""
+        start = rss_mb()
+        with _PeakSampler(MemoryUsage(start, peak_mb=start), SAMPLE_INTERVAL) as usage:
+            yield usage
+
+    def record_load(self, key: ModelKey, usage: MemoryUsage) -> None:
+        def update(entry: dict) -> None:
+            entry["load_peak_mb"] = round(usage.peak_delta_mb, 1)
+            entry["resident_mb"] = round(usage.resident_delta_mb, 1)
+
+        self._record(key, update)
+
+    def record_decode(self, key: ModelKey, seconds: float, usage: MemoryUsage) -> None:
+        def update(entry: dict) -> None:
+            samples = entry.setdefault("decode", [])
+            samples.append([round(seconds, 1), round(usage.peak_delta_mb, 1)])
+            del samples[:-MAX_DECODE_SAMPLES]
+
+        self._record(key, update)
+
+    def _record(self, key: ModelKey, update) -> None:
+        name = _key_name(key)
+        with self._cond:
+            # Start from what other processes have written since we last read
+            models = {**self._models, **self._read()}
+            entry = models.setdefault(name, {})
+            update(entry)
+            entry["updated"] = int(time.time())
+            self._models = models
+            self._write()
+
+    # Persistence
+
+    def _read(self) -> dict[str, dict]:
+        if self.path is None or not self.path.exists():
+            return {}
+        try:
+            models = json.loads(self.path.read_text()).get("models", {})
+        except (OSError, ValueError, AttributeError) as e:
+            logger.warning(f"Ignoring unreadable memory measurements {self.path}: {e}")
+            return {}
+        return models if isinstance(models, dict) else {}
+
+    def _write(self) -> None:
+        if self.path is None:
+            return
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_name(f".{self.path.name}.{os.getpid()}.tmp")
+            tmp_path.write_text(json.dumps({"models": self._models}, indent=2, sort_keys=True))
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.warning(f"Could not save memory measurements to {self.path}: {e}")
+
+    def stats(self) -> dict:
+        with self._cond:
+            free, rss = self._headroom()
+            return {
+                "rss_mb": round(rss, 1),
+                "free_mb": round(max(0.0, free), 1),
+                "reserved_mb": round(sum(mb for mb, _ in self._reservations.values()), 1),
+                "reservations": len(self._reservations),
+                "waits": self.waits,
+            }
+
+
+def _slope(samples: list[list[float]]) -> float | None:
+    """Least-squares MB per second of audio, or None without two distinct durations."""
+    n = len(samples)
+    mean_s = sum(s for s, _ in samples) / n
+    mean_p = sum(p for _, p in samples) / n
+    var = sum((s - mean_s) ** 2 for s, _ in samples)
+    if var == 0:
+        return None
+    cov = sum((s - mean_s) * (p - mean_p) for s, p in samples)
+    return max(0.0, cov / var)
+
+
+_governor = MemoryGovernor()
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=lambda: _governor._after_fork())
+
+
+def get_governor() -> MemoryGovernor:
+    return _governor
+
+
+def configure(config: MemoryConfig) -> MemoryGovernor:
+    """Apply ``config`` to the process-wide governor, loading its saved measurements."""
+    _governor.configure(config)
+    return _governor
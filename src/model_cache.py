@@ -0,0 +1,157 @@
+import logging
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from concurrent.futures import Future
+from typing import Any
+
+from .constants import DEFAULT_MODEL_CACHE_MB
+
+logger = logging.getLogger("podcast_ai_agent")
+
+ModelKey = tuple[str, str, str]
+
+
+def model_size_mb(model: Any) -> float:
+    """Resident size of a torch module's parameters and buffers in MB."""
+    try:
+        tensors = list(model.parameters()) + list(model.buffers())
+        total = sum(t.numel() * t.element_size() for t in tensors)
+    except (AttributeError, TypeError):
+        # Not a torch module, e.g. a stand-in model
+        return 0.0
+    return total / (1024**2)
+
+
+class ModelRegistry:
+    """
+    Process-wide cache of loaded Whisper models keyed by (name, device, precision).
+
+    Models are evicted least-recently-used first once the combined size of the
+    cached models exceeds the RAM budget. The most recently requested model is
+    always kept, even if it alone exceeds the budget.
+    """
+
+    def __init__(self, ram_budget_mb: int = DEFAULT_MODEL_CACHE_MB):
+        self.ram_budget_mb = ram_budget_mb
+        self._models: OrderedDict[ModelKey, Any] = OrderedDict()
+        self._sizes: dict[ModelKey, float] = {}
+        self._inference_locks: dict[ModelKey, threading.Lock] = {}
+        # Loads in progress, so concurrent misses on one key load it once
+        self._loading: dict[ModelKey, Future] = {}
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.load_seconds = 0.0
+
+    def get(
+        self,
+        key: ModelKey,
+        loader: Callable[[], Any],
+        ram_budget_mb: int | None = None,
+    ) -> Any:
+        """
+        The cached model for ``key``, calling ``loader`` on a miss.
+
+        The registry lock is not held while ``loader`` runs, so hits on other
+        models are not blocked by a slow load. Threads asking for a model that
+        is already being loaded wait for that load instead of starting another.
+        """
+        with self._lock:
+            if ram_budget_mb is not None:
+                self.ram_budget_mb = ram_budget_mb
+
+            if key in self._models:
+                self._models.move_to_end(key)
+                self.hits += 1
+                logger.debug(f"Model cache hit: {key}")
+                return self._models[key]
+
+            pending = self._loading.get(key)
+            owner = pending is None
+            if pending is None:
+                pending = self._loading[key] = Future()
+                self.misses += 1
+            else:
+                self.hits += 1
+
+        if not owner:
+            logger.debug(f"Waiting for {key} to finish loading")
+            return pending.result()
+
+        start = time.perf_counter()
+        try:
+            model = loader()
+        except BaseException as e:
+            with self._lock:
+                del self._loading[key]
+            pending.set_exception(e)
+            raise
+        elapsed = time.perf_counter() - start
+        logger.debug(f"Model cache miss: {key} loaded in {elapsed:.2f}s")
+
+        with self._lock:
+            self.load_seconds += elapsed
+            self._models[key] = model
+            self._sizes[key] = model_size_mb(model)
+            del self._loading[key]
+            self._evict()
+        pending.set_result(model)
+        return model
+
+    def _evict(self) -> None:
+        while len(self._models) > 1 and self.size_mb > self.ram_budget_mb:
+            key, _ = self._models.popitem(last=False)
+            self._sizes.pop(key, None)
+            self.evictions += 1
+            logger.info(f"Evicted {key[0]} model ({key[1]}, {key[2]}) from model cache")
+
+    def inference_lock(self, key: ModelKey) -> threading.Lock:
+        """
+        Lock serializing inference on a shared model.
+
+        Whisper installs kv-cache hooks on the model for the duration of a decode,
+        so two threads must not run ``transcribe`` on the same instance at once.
+        """
+        with self._lock:
+            return self._inference_locks.setdefault(key, threading.Lock())
+
+    @property
+    def size_mb(self) -> float:
+        return sum(self._sizes.values())
+
+    def __contains__(self, key: ModelKey) -> bool:
+        return key in self._models
+
+    def __len__(self) -> int:
+        return len(self._models)
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "load_seconds": round(self.load_seconds, 3),
+                "models": len(self._models),
+                "size_mb": round(self.size_mb, 1),
+                "ram_budget_mb": self.ram_budget_mb,
+            }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._models.clear()
+            self._sizes.clear()
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+            self.load_seconds = 0.0
+
+
+_registry = ModelRegistry()
+
+
+def get_registry() -> ModelRegistry:
+    return _registry
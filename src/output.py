@@ -1,57 +1,160 @@
 import json
+import logging
+import os
+import time
+from collections.abc import Iterable
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import IO, Any
+
+from .constants import OUTPUT_FORMATS
+
+logger = logging.getLogger("podcast_ai_agent")
+
+# A streamed file is synced to disk at most this often while it is written
+STREAM_CHECKPOINT_SECONDS = 5.0
+
+
+def read_result(path: Path) -> tuple[dict[str, Any], dict[str, Any]]:
+    """
+    Load a transcription result and its metadata from a JSON file.
+
+    Accepts files written by ``OutputWriter.write_json`` as well as bare
+    Whisper results such as transcription cache entries.
+    """
+    data = json.loads(Path(path).read_text(encoding="utf-8"))
+    if isinstance(data, dict) and isinstance(data.get("transcription"), dict):
+        result, metadata = data["transcription"], data.get("metadata") or {}
+    elif isinstance(data, dict) and "segments" in data:
+        result, metadata = data, {}
+    else:
+        raise ValueError(f"{path} does not contain a transcription result")
+
+    if "text" not in result:
+        result["text"] = "".join(seg["text"] for seg in result["segments"])
+    return result, metadata
 
 
 class OutputWriter:
-    def __init__(self, base_path: Path, metadata: Optional[Dict[str, Any]] = None):
+    """
+    Writes transcripts next to ``base_path`` with one extension per format.
+
+    ``on_existing`` decides what happens when the target file already exists:
+    ``skip`` keeps it, ``overwrite`` replaces it and ``rename`` writes a
+    numbered sibling (``episode_1.srt``). Files are written atomically, so an
+    existing file is always complete.
+    """
+
+    def __init__(
+        self,
+        base_path: Path,
+        metadata: dict[str, Any] | None = None,
+        on_existing: str = "rename",
+    ):
+        if on_existing not in ("skip", "overwrite", "rename"):
+            raise ValueError(f"Unsupported on_existing policy: {on_existing}")
         self.base_path = base_path
         self.metadata = metadata or {}
+        self.on_existing = on_existing
+
+    def existing(self, fmt: str) -> Path | None:
+        """The file to keep instead of writing ``fmt``, under the skip policy."""
+        path = self.base_path.with_suffix(f".{fmt}")
+        if self.on_existing == "skip" and path.exists():
+            return path
+        return None
+
+    def write(self, result: dict[str, Any], formats: Iterable[str]) -> list[Path]:
+        """
+        Write ``result`` in every requested format.
+
+        Segment text and timestamps are prepared once in a single pass over the
+        segments and shared by the srt, vtt and jsonl renderings.
+        """
+        formats = list(dict.fromkeys(formats))
+        unknown = [fmt for fmt in formats if fmt not in OUTPUT_FORMATS]
+        if unknown:
+            raise ValueError(f"Unsupported format: {', '.join(unknown)}")
+
+        rendered = self._render(result, formats)
+        return [self._write(fmt, rendered[fmt]) for fmt in formats]
 
     def write_txt(self, text: str) -> Path:
-        path = self._get_path("txt")
-        path.write_text(text, encoding="utf-8")
-        return path
+        return self._write("txt", text)
 
-    def write_json(self, result: Dict[str, Any]) -> Path:
-        path = self._get_path("json")
-        output = {
-            "metadata": self.metadata,
-            "transcription": result,
-            "generated_at": datetime.utcnow().isoformat(),
-        }
-        path.write_text(json.dumps(output, indent=2, ensure_ascii=False), encoding="utf-8")
-        return path
+    def write_json(self, result: dict[str, Any]) -> Path:
+        return self._write("json", self._render(result, ["json"])["json"])
+
+    def write_srt(self, segments: list[dict[str, Any]]) -> Path:
+        return self._write("srt", self._render({"segments": segments}, ["srt"])["srt"])
+
+    def write_vtt(self, segments: list[dict[str, Any]]) -> Path:
+        return self._write("vtt", self._render({"segments": segments}, ["vtt"])["vtt"])
+
+    def write_jsonl(self, segments: list[dict[str, Any]]) -> Path:
+        return self._write("jsonl", self._render({"segments": segments}, ["jsonl"])["jsonl"])
+
+    def _render(self, result: dict[str, Any], formats: list[str]) -> dict[str, str]:
+        segments = result.get("segments") or []
+        srt: list[str] | None = [] if "srt" in formats else None
+        vtt = ["WEBVTT\n"] if "vtt" in formats else None
+        jsonl = (
+            [json.dumps({"metadata": self.metadata}, ensure_ascii=False)]
+            if "jsonl" in formats
+            else None
+        )
 
-    def write_srt(self, segments: List[Dict[str, Any]]) -> Path:
-        path = self._get_path("srt")
-        lines = []
         for i, seg in enumerate(segments, 1):
+            if jsonl is not None:
+                jsonl.append(json.dumps(seg, ensure_ascii=False))
+            if srt is None and vtt is None:
+                continue
+            text = seg["text"].strip().replace("\n", " ")
             start = self._format_timestamp(seg["start"])
             end = self._format_timestamp(seg["end"])
-            text = seg["text"].strip().replace("\n", " ")
-            lines.append(f"{i}\n{start} --> {end}\n{text}\n")
+            if srt is not None:
+                srt.append(f"{i}\n{start} --> {end}\n{text}\n")
+            if vtt is not None:
+                # VTT timestamps only differ from SRT in the millisecond separator
+                vtt.append(f"\n{start.replace(',', '.')} --> {end.replace(',', '.')}\n{text}")
 
-        path.write_text("\n".join(lines), encoding="utf-8")
-        return path
+        rendered = {}
+        if "txt" in formats:
+            rendered["txt"] = result.get("text", "")
+        if "json" in formats:
+            output = {
+                "metadata": self.metadata,
+                "transcription": result,
+                "generated_at": datetime.utcnow().isoformat(),
+            }
+            rendered["json"] = json.dumps(output, indent=2, ensure_ascii=False)
+        if srt is not None:
+            rendered["srt"] = "\n".join(srt)
+        if vtt is not None:
+            rendered["vtt"] = "\n".join(vtt)
+        if jsonl is not None:
+            rendered["jsonl"] = "\n".join(jsonl) + "\n"
+        return rendered
 
-    def write_vtt(self, segments: List[Dict[str, Any]]) -> Path:
-        path = self._get_path("vtt")
-        lines = ["WEBVTT\n"]
-        for seg in segments:
-            start = self._format_timestamp(seg["start"], vtt=True)
-            end = self._format_timestamp(seg["end"], vtt=True)
-            text = seg["text"].strip().replace("\n", " ")
-            lines.append(f"\n{start} --> {end}\n{text}")
+    def _write(self, fmt: str, content: str) -> Path:
+        existing = self.existing(fmt)
+        if existing is not None:
+            logger.info(f"Keeping existing {existing.name}")
+            return existing
 
-        path.write_text("\n".join(lines), encoding="utf-8")
+        path = self._get_path(fmt)
+        tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        tmp_path.write_text(content, encoding="utf-8")
+        os.replace(tmp_path, path)
         return path
 
+    def open_stream(self, fmt: str) -> "StreamingWriter":
+        return StreamingWriter(self._get_path(fmt), fmt, self.metadata)
+
     def _get_path(self, ext: str) -> Path:
         path = self.base_path.with_suffix(f".{ext}")
 
-        if not path.exists():
+        if self.on_existing != "rename" or not path.exists():
             return path
 
         counter = 1
@@ -71,3 +174,91 @@ class OutputWriter:
         millis = int((seconds % 1) * 1000)
         sep = "." if vtt else ","
         return f"{hours:02}:{minutes:02}:{secs:02}{sep}{millis:03}"
+
+
+class StreamingWriter:
+    """
+    Appends segments to a txt, srt, vtt or jsonl file as they are transcribed.
+
+    Segments go to ``<name>.partial`` next to ``path``, which replaces
+    ``path`` only when the writer is closed without an error, so an
+    interrupted run never destroys an earlier complete transcript. Every
+    segment is flushed, and the file is fsynced at most every
+    ``checkpoint_seconds``, so after a crash the partial file holds the
+    segments decoded up to the last checkpoint. Nothing is kept in memory
+    between segments.
+    """
+
+    FORMATS = ("txt", "srt", "vtt", "jsonl")
+
+    def __init__(
+        self,
+        path: Path,
+        fmt: str,
+        metadata: dict[str, Any] | None = None,
+        checkpoint_seconds: float = STREAM_CHECKPOINT_SECONDS,
+    ):
+        if fmt not in self.FORMATS:
+            raise ValueError(f"Unsupported streaming format: {fmt}")
+        self.path = path
+        self.partial_path = path.with_name(f"{path.name}.partial")
+        self.format = fmt
+        self.count = 0
+        self.checkpoint_seconds = checkpoint_seconds
+        self._file: IO[str] = self.partial_path.open("w", encoding="utf-8")
+        self._synced = time.monotonic()
+
+        if fmt == "vtt":
+            self._write("WEBVTT\n")
+        elif fmt == "jsonl":
+            self._write(json.dumps({"metadata": metadata or {}}, ensure_ascii=False) + "\n")
+
+    def write_segment(self, seg: dict[str, Any]) -> None:
+        text = seg["text"].strip().replace("\n", " ")
+        if self.format == "txt":
+            entry = f"{text}\n"
+        elif self.format == "srt":
+            start = OutputWriter._format_timestamp(seg["start"])
+            end = OutputWriter._format_timestamp(seg["end"])
+            separator = "\n" if self.count else ""
+            entry = f"{separator}{self.count + 1}\n{start} --> {end}\n{text}\n"
+        elif self.format == "vtt":
+            start = OutputWriter._format_timestamp(seg["start"], vtt=True)
+            end = OutputWriter._format_timestamp(seg["end"], vtt=True)
+            entry = f"\n\n{start} --> {end}\n{text}"
+        else:
+            entry = json.dumps(seg, ensure_ascii=False) + "\n"
+
+        self._write(entry)
+        self.count += 1
+
+    def _write(self, data: str) -> None:
+        self._file.write(data)
+        self._file.flush()
+        if time.monotonic() - self._synced >= self.checkpoint_seconds:
+            self.checkpoint()
+
+    def checkpoint(self) -> None:
+        """Make everything written so far durable."""
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._synced = time.monotonic()
+
+    def close(self, complete: bool = True) -> Path:
+        """
+        Sync and close the file. When ``complete``, it replaces ``path``;
+        otherwise it is left as ``<name>.partial``.
+        """
+        if self._file.closed:
+            return self.path
+        self.checkpoint()
+        self._file.close()
+        if complete:
+            os.replace(self.partial_path, self.path)
+        return self.path
+
+    def __enter__(self) -> "StreamingWriter":
+        return self
+
+    def __exit__(self, exc_type, *exc) -> None:
+        self.close(complete=exc_type is None)
@@ -0,0 +1,164 @@
+import logging
+import queue
+import threading
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from .config import PipelineConfig
+
+logger = logging.getLogger("podcast_ai_agent")
+
+_DONE = object()
+
+
+@dataclass
+class ItemResult:
+    index: int
+    url: str
+    output_path: Path | list[Path] | None = None
+    error: Exception | None = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+@dataclass
+class _Item:
+    index: int
+    url: str
+    audio_path: Path | None = None
+    result: dict | None = None
+
+
+class Pipeline:
+    """
+    Runs download, transcription and output writing as concurrent stages.
+
+    Stages are connected by bounded queues, so download workers prefetch at most
+    ``queue_depth`` items ahead of transcription. A failing item is reported
+    immediately and skips the remaining stages; the other items keep flowing.
+    """
+
+    def __init__(
+        self,
+        download: Callable[[str], Path],
+        transcribe: Callable[[str, Path], dict],
+        write: Callable[[str, Path, dict], Path],
+        config: PipelineConfig,
+    ):
+        self.download = download
+        self.transcribe = transcribe
+        self.write = write
+        self.config = config
+
+    def run(
+        self,
+        urls: Iterable[str],
+        on_result: Callable[[ItemResult], None] | None = None,
+    ) -> list[ItemResult]:
+        depth = max(1, self.config.queue_depth)
+        pending: queue.Queue = queue.Queue(maxsize=depth)
+        downloaded: queue.Queue = queue.Queue(maxsize=depth)
+        transcribed: queue.Queue = queue.Queue(maxsize=depth)
+        results: queue.Queue = queue.Queue()
+
+        def feed():
+            try:
+                for index, url in enumerate(urls, 1):
+                    pending.put(_Item(index, url))
+            except Exception as e:
+                logger.exception(f"Failed to enumerate pipeline items: {e}")
+            finally:
+                pending.put(_DONE)
+
+        def download_step(item: _Item) -> _Item:
+            item.audio_path = self.download(item.url)
+            return item
+
+        def transcribe_step(item: _Item) -> _Item:
+            assert item.audio_path is not None
+            item.result = self.transcribe(item.url, item.audio_path)
+            return item
+
+        def write_step(item: _Item) -> None:
+            assert item.audio_path is not None and item.result is not None
+            output_path = self.write(item.url, item.audio_path, item.result)
+            results.put(ItemResult(item.index, item.url, output_path=output_path))
+
+        threading.Thread(target=feed, name="pipeline-feed", daemon=True).start()
+        self._start_stage(
+            "download", download_step, pending, downloaded, self.config.download_workers, results
+        )
+        self._start_stage(
+            "transcribe",
+            transcribe_step,
+            downloaded,
+            transcribed,
+            self.config.transcribe_workers,
+            results,
+        )
+        writer = self._start_stage("write", write_step, transcribed, None, 1, results)
+
+        def close_results():
+            writer.join()
+            results.put(_DONE)
+
+        threading.Thread(target=close_results, name="pipeline-close", daemon=True).start()
+
+        collected = []
+        while True:
+            item = results.get()
+            if item is _DONE:
+                break
+            collected.append(item)
+            if on_result:
+                on_result(item)
+
+        return sorted(collected, key=lambda r: r.index)
+
+    def _start_stage(
+        self,
+        name: str,
+        step: Callable[[_Item], Any],
+        inbox: queue.Queue,
+        outbox: queue.Queue | None,
+        workers: int,
+        results: queue.Queue,
+    ) -> threading.Thread:
+        """Start ``workers`` threads for a stage and return a thread that joins them."""
+
+        def work():
+            while True:
+                item = inbox.get()
+                if item is _DONE:
+                    # Leave the marker for the other workers of this stage
+                    inbox.put(_DONE)
+                    return
+                try:
+                    processed = step(item)
+                except Exception as e:  # noqa: BLE001 - reported as this item's result
+                    logger.debug(f"{name} failed for {item.url}: {e}")
+                    results.put(ItemResult(item.index, item.url, error=e))
+                    continue
+                if outbox is not None:
+                    outbox.put(processed)
+
+        threads = [
+            threading.Thread(target=work, name=f"pipeline-{name}-{i}", daemon=True)
+            for i in range(max(1, workers))
+        ]
+        for thread in threads:
+            thread.start()
+
+        def close():
+            for thread in threads:
+                thread.join()
+            if outbox is not None:
+                outbox.put(_DONE)
+
+        closer = threading.Thread(target=close, name=f"pipeline-{name}-close", daemon=True)
+        closer.start()
+        return closer
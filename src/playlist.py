@@ -0,0 +1,141 @@
+import logging
+import re
+from collections.abc import Callable, Iterable, Iterator
+from datetime import datetime, timezone
+from urllib.parse import urlparse
+
+from .config import DownloadConfig
+from .url_index import canonicalize_url, youtube_video_id
+
+logger = logging.getLogger("podcast_ai_agent")
+
+_YOUTUBE_HOSTS = {"youtube.com", "youtube-nocookie.com"}
+_COLLECTION_PATH_RE = re.compile(r"^/(playlist|@[^/]+|channel/[^/]+|c/[^/]+|user/[^/]+)(/|$)")
+_MAX_NESTING = 2
+
+
+def is_collection_url(url: str) -> bool:
+    """
+    True for YouTube playlist and channel URLs, without a request. A watch URL
+    that also carries ``list=`` is treated as the single video it points to.
+    """
+    if youtube_video_id(url):
+        return False
+    parsed = urlparse(url.strip())
+    host = (parsed.hostname or "").lower()
+    for prefix in ("www.", "m.", "music."):
+        host = host.removeprefix(prefix)
+    if host not in _YOUTUBE_HOSTS:
+        return False
+    return bool(_COLLECTION_PATH_RE.match(parsed.path))
+
+
+def _upload_date(entry: dict) -> str | None:
+    if entry.get("upload_date"):
+        return str(entry["upload_date"])
+    timestamp = entry.get("timestamp") or entry.get("release_timestamp")
+    if timestamp:
+        return datetime.fromtimestamp(timestamp, tz=timezone.utc).strftime("%Y%m%d")
+    return None
+
+
+def matches_filters(entry: dict, config: DownloadConfig) -> bool:
+    """
+    Apply the configured date and duration filters to a flat playlist entry.
+
+    Flat entries do not always carry a date or duration; a filter whose field
+    is missing lets the entry through.
+    """
+    duration = entry.get("duration")
+    if duration is not None:
+        if config.min_duration is not None and duration < config.min_duration:
+            return False
+        if config.max_duration is not None and duration > config.max_duration:
+            return False
+
+    date = _upload_date(entry)
+    if date is not None:
+        if config.date_after is not None and date < config.date_after:
+            return False
+        if config.date_before is not None and date > config.date_before:
+            return False
+    return True
+
+
+def _entry_url(entry: dict) -> str | None:
+    if entry.get("ie_key") == "Youtube" and entry.get("id"):
+        return f"https://www.youtube.com/watch?v={entry['id']}"
+    return entry.get("url") or entry.get("webpage_url")
+
+
+def _iter_entries(ydl, info: dict, depth: int = 0) -> Iterator[dict]:
+    if info.get("_type") not in ("playlist", "multi_video"):
+        yield info
+        return
+
+    # With process=False the entries are the extractor's own generator, so pages
+    # are only fetched as the caller asks for more items
+    for entry in info.get("entries") or []:
+        if not entry:
+            continue
+        if entry.get("_type") == "playlist" and depth < _MAX_NESTING:
+            yield from _iter_entries(ydl, entry, depth + 1)
+        elif entry.get("ie_key") == "YoutubeTab" and depth < _MAX_NESTING:
+            # Channel pages list their tabs (videos, shorts, live) as nested playlists
+            nested = ydl.extract_info(entry["url"], download=False, process=False)
+            yield from _iter_entries(ydl, nested, depth + 1)
+        else:
+            yield entry
+
+
+def iter_collection(url: str, config: DownloadConfig) -> Iterator[str]:
+    """Yield the video URLs of a playlist or channel as its pages are fetched."""
+    import yt_dlp
+
+    from .downloader import YtDlpLogger
+
+    ydl_opts = {
+        "extract_flat": "in_playlist",
+        "socket_timeout": config.socket_timeout,
+        "quiet": True,
+        "no_warnings": True,
+        "logger": YtDlpLogger(),
+    }
+    with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+        info = ydl.extract_info(url, download=False, process=False)
+        for entry in _iter_entries(ydl, info):
+            entry_url = _entry_url(entry)
+            if entry_url and matches_filters(entry, config):
+                yield entry_url
+
+
+def expand_urls(
+    urls: Iterable[str],
+    config: DownloadConfig,
+    on_error: Callable[[str, Exception], None] | None = None,
+) -> Iterator[str]:
+    """
+    Lazily replace playlist and channel URLs by the videos they contain.
+
+    Other URLs pass through untouched. Repeated videos are yielded once. A
+    collection that fails to enumerate is reported to ``on_error`` and the
+    remaining URLs keep flowing.
+    """
+    seen = set()
+    for url in urls:
+        if not is_collection_url(url):
+            candidates: Iterable[str] = [url]
+        else:
+            logger.info(f"Expanding {url}...")
+            candidates = iter_collection(url, config)
+
+        try:
+            for candidate in candidates:
+                key = canonicalize_url(candidate)
+                if key not in seen:
+                    seen.add(key)
+                    yield candidate
+        except Exception as e:  # noqa: BLE001 - reported to on_error
+            logger.error(f"Failed to expand {url}: {e}")
+            if on_error is not None:
+                on_error(url, e)
@@ -0,0 +1,258 @@
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+import psutil
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None  # type: ignore[assignment]
+
+logger = logging.getLogger("podcast_ai_agent")
+
+METRIC_PREFIX = "podcast_ai_agent"
+
+_current_item: ContextVar[str | None] = ContextVar("profile_item", default=None)
+
+
+def _cpu_seconds() -> float:
+    """User and system CPU time of this process and its finished children (ffmpeg)."""
+    if resource is None:
+        times = psutil.Process().cpu_times()
+        return times.user + times.system
+    own = resource.getrusage(resource.RUSAGE_SELF)
+    children = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return own.ru_utime + own.ru_stime + children.ru_utime + children.ru_stime
+
+
+def _peak_rss_bytes() -> int:
+    """High-water resident set size of this process or its largest child."""
+    if resource is None:
+        return psutil.Process().memory_info().rss
+    peak = max(
+        resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss,
+    )
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+@dataclass
+class StageRecord:
+    stage: str
+    item: str | None
+    wall_seconds: float
+    cpu_seconds: float
+    peak_rss_bytes: int
+    bytes: int
+
+
+class StageTimer:
+    """
+    A running stage. ``add_bytes`` counts data moved by it and ``stop`` records
+    it; stopping twice is harmless.
+    """
+
+    def __init__(self, profiler: "Profiler", stage: str, item: str | None):
+        self.profiler = profiler
+        self.stage = stage
+        self.item = item
+        self.bytes = 0
+        self._wall = time.perf_counter()
+        self._cpu = _cpu_seconds()
+        self._stopped = False
+
+    def add_bytes(self, count: int | None) -> None:
+        self.bytes += int(count or 0)
+
+    def stop(self) -> None:
+        if self._stopped:
+            return
+        self._stopped = True
+        self.profiler.add(
+            StageRecord(
+                stage=self.stage,
+                item=self.item,
+                wall_seconds=time.perf_counter() - self._wall,
+                cpu_seconds=_cpu_seconds() - self._cpu,
+                peak_rss_bytes=_peak_rss_bytes(),
+                bytes=self.bytes,
+            )
+        )
+
+
+class _NullTimer:
+    bytes = 0
+
+    def add_bytes(self, count: int | None) -> None:
+        pass
+
+    def stop(self) -> None:
+        pass
+
+
+class Profiler:
+    """
+    Collects stage records for one run and renders them as a JSON report or
+    a Prometheus text exposition.
+
+    CPU time is process-wide (every thread plus reaped subprocesses such as
+    ffmpeg), so stages that overlap in a pipelined run share it. Stages run
+    inside worker processes are not recorded; their parent-side stage covers
+    them.
+    """
+
+    def __init__(self):
+        self.records: list[StageRecord] = []
+        self.started = time.time()
+        self._wall = time.perf_counter()
+        self._lock = threading.Lock()
+
+    def start(self, stage: str, item: str | None = None) -> StageTimer:
+        return StageTimer(self, stage, item if item is not None else _current_item.get())
+
+    def add(self, record: StageRecord) -> None:
+        with self._lock:
+            self.records.append(record)
+
+    @staticmethod
+    def _aggregate(records: list[StageRecord]) -> dict[str, dict]:
+        stages: dict[str, dict] = {}
+        for record in records:
+            totals = stages.setdefault(
+                record.stage,
+                {
+                    "count": 0,
+                    "wall_seconds": 0.0,
+                    "cpu_seconds": 0.0,
+                    "bytes": 0,
+                    "peak_rss_bytes": 0,
+                },
+            )
+            totals["count"] += 1
+            totals["wall_seconds"] += record.wall_seconds
+            totals["cpu_seconds"] += record.cpu_seconds
+            totals["bytes"] += record.bytes
+            totals["peak_rss_bytes"] = max(totals["peak_rss_bytes"], record.peak_rss_bytes)
+        for totals in stages.values():
+            totals["wall_seconds"] = round(totals["wall_seconds"], 6)
+            totals["cpu_seconds"] = round(totals["cpu_seconds"], 6)
+        return stages
+
+    def report(self) -> dict:
+        with self._lock:
+            records = list(self.records)
+
+        items: dict[str, list[StageRecord]] = {}
+        for record in records:
+            if record.item is not None:
+                items.setdefault(record.item, []).append(record)
+
+        return {
+            "started": self.started,
+            "wall_seconds": round(time.perf_counter() - self._wall, 6),
+            "peak_rss_bytes": _peak_rss_bytes(),
+            "stages": self._aggregate(records),
+            "items": {item: self._aggregate(recs) for item, recs in items.items()},
+            "records": [asdict(r) for r in records],
+        }
+
+    def prometheus(self) -> str:
+        report = self.report()
+        metrics = [
+            ("stage_runs_total", "counter", "Number of times each stage ran.", "count"),
+            ("stage_wall_seconds_total", "counter", "Wall time spent per stage.", "wall_seconds"),
+            ("stage_cpu_seconds_total", "counter", "Process CPU time per stage.", "cpu_seconds"),
+            ("stage_bytes_total", "counter", "Bytes moved per stage.", "bytes"),
+            (
+                "stage_peak_rss_bytes",
+                "gauge",
+                "Peak RSS observed at the end of each stage.",
+                "peak_rss_bytes",
+            ),
+        ]
+
+        lines = []
+        for name, kind, help_text, field in metrics:
+            lines.append(f"# HELP {METRIC_PREFIX}_{name} {help_text}")
+            lines.append(f"# TYPE {METRIC_PREFIX}_{name} {kind}")
+            for stage, totals in sorted(report["stages"].items()):
+                lines.append(f'{METRIC_PREFIX}_{name}{{stage="{stage}"}} {totals[field]}')
+
+        lines.append(f"# HELP {METRIC_PREFIX}_run_wall_seconds Wall time of the whole run.")
+        lines.append(f"# TYPE {METRIC_PREFIX}_run_wall_seconds gauge")
+        lines.append(f"{METRIC_PREFIX}_run_wall_seconds {report['wall_seconds']}")
+        lines.append(f"# HELP {METRIC_PREFIX}_run_peak_rss_bytes Peak RSS of the whole run.")
+        lines.append(f"# TYPE {METRIC_PREFIX}_run_peak_rss_bytes gauge")
+        lines.append(f"{METRIC_PREFIX}_run_peak_rss_bytes {report['peak_rss_bytes']}")
+        return "\n".join(lines) + "\n"
+
+    def write_json(self, path: Path) -> None:
+        _write_atomic(path, json.dumps(self.report(), indent=2))
+
+    def write_prometheus(self, path: Path) -> None:
+        # Exporters may read the file at any moment, so never expose a partial one
+        _write_atomic(path, self.prometheus())
+
+
+def _write_atomic(path: Path, text: str) -> None:
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    tmp_path.write_text(text, encoding="utf-8")
+    os.replace(tmp_path, path)
+
+
+_active: Profiler | None = None
+
+
+def enable() -> Profiler:
+    """Start collecting stage records in this process."""
+    global _active
+    _active = Profiler()
+    return _active
+
+
+def disable() -> None:
+    global _active
+    _active = None
+
+
+def get_profiler() -> Profiler | None:
+    return _active
+
+
+def start_stage(name: str, item: str | None = None):
+    """Start timing a stage that does not fit a ``with`` block."""
+    if _active is None:
+        return _NullTimer()
+    return _active.start(name, item)
+
+
+@contextmanager
+def stage(name: str, item: str | None = None) -> Iterator[StageTimer]:
+    """Time the enclosed block as ``name``; a no-op while profiling is disabled."""
+    timer = start_stage(name, item)
+    try:
+        yield timer
+    finally:
+        timer.stop()
+
+
+@contextmanager
+def item(name: str) -> Iterator[None]:
+    """Attribute stages started in the enclosed block to the item ``name``."""
+    token = _current_item.set(name)
+    try:
+        yield
+    finally:
+        _current_item.reset(token)
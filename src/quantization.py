@@ -0,0 +1,81 @@
+import logging
+import os
+import warnings
+from collections.abc import Callable
+from pathlib import Path
+
+import torch
+import whisper
+from torch import nn
+
+from .result_cache import whisper_version
+from .weight_cache import UNREADABLE_CHECKPOINT_ERRORS, checkpoint_id, whisper_cache_dir
+
+logger = logging.getLogger("podcast_ai_agent")
+
+
+def _as_plain_linear(module: nn.Module) -> None:
+    """
+    Replace Whisper's ``Linear`` subclass with ``nn.Linear`` in place.
+
+    ``quantize_dynamic`` matches module types exactly, so the subclass (which
+    only adds a dtype cast for fp16) would otherwise be left in fp32.
+    """
+    for name, child in module.named_children():
+        if isinstance(child, nn.Linear) and type(child) is not nn.Linear:
+            plain = nn.Linear(child.in_features, child.out_features, bias=child.bias is not None)
+            plain.weight = child.weight
+            plain.bias = child.bias
+            # Hooks such as the decoder's kv-cache are installed per decode, not here
+            setattr(module, name, plain)
+        else:
+            _as_plain_linear(child)
+
+
+def quantize_int8(model: whisper.Whisper) -> whisper.Whisper:
+    """Dynamically quantize the linear layers of a CPU fp32 model to int8."""
+    model = model.cpu().float().eval()
+    _as_plain_linear(model)
+    return torch.ao.quantization.quantize_dynamic(model, {nn.Linear}, dtype=torch.qint8)
+
+
+def quantized_cache_path(name: str) -> Path:
+    """
+    Where the int8 variant of ``name`` is stored. Keyed by the checkpoint like
+    ``mmap_cache_path``; the file is a pickled module, so the Whisper and
+    torch versions are part of the name too.
+    """
+    stem = Path(name).stem if os.path.isfile(name) else name
+    torch_version = torch.__version__.split("+")[0]
+    engine = torch.backends.quantized.engine
+    file_name = (
+        f"{stem}-{checkpoint_id(name)}-int8-{engine}-w{whisper_version()}-t{torch_version}.pt"
+    )
+    return whisper_cache_dir() / file_name
+
+
+def load_int8(name: str, load_fp32: Callable[[], whisper.Whisper]) -> whisper.Whisper:
+    """
+    The int8 variant of model ``name``, quantizing ``load_fp32()`` only when no
+    cached copy exists. A damaged cache file is replaced.
+    """
+    path = quantized_cache_path(name)
+    if path.exists():
+        try:
+            with warnings.catch_warnings():
+                # Loading quantized packed params goes through TypedStorage
+                warnings.filterwarnings("ignore", message="TypedStorage is deprecated")
+                return torch.load(path, map_location="cpu", weights_only=False)
+        except UNREADABLE_CHECKPOINT_ERRORS as e:
+            logger.warning(f"Discarding unreadable quantized model {path}: {e}")
+
+    logger.info(f"Quantizing {name} model to int8 (once; cached in {path.parent})...")
+    model = quantize_int8(load_fp32())
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        torch.save(model, tmp_path)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        logger.warning(f"Could not cache quantized model at {path}: {e}")
+    return model
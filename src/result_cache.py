@@ -0,0 +1,182 @@
+import hashlib
+import importlib.metadata
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from contextlib import closing
+from functools import cache
+from pathlib import Path
+from typing import Any
+
+from .config import WhisperConfig
+
+logger = logging.getLogger("podcast_ai_agent")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    key TEXT PRIMARY KEY,
+    audio_hash TEXT NOT NULL,
+    model TEXT NOT NULL,
+    language TEXT NOT NULL,
+    translate INTEGER NOT NULL,
+    temperature REAL NOT NULL,
+    whisper_version TEXT NOT NULL,
+    size_bytes INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    accessed_at REAL NOT NULL
+)
+"""
+
+
+@cache
+def whisper_version() -> str:
+    # Read from the package metadata; importing whisper would pull in torch
+    return importlib.metadata.version("openai-whisper")
+
+
+def result_key(
+    audio_hash: str,
+    config: WhisperConfig,
+    device: str | None = None,
+    precision: str | None = None,
+) -> str:
+    """
+    Content address of a transcription: the audio plus every decode parameter.
+
+    ``device`` and ``precision`` are the ones the model actually runs with
+    (``auto`` resolved, fp16 falling back to fp32 on CPU); they default to the
+    configured values.
+    """
+    parts = {
+        "audio": audio_hash,
+        "model": config.model,
+        "language": config.language,
+        "translate": config.translate,
+        "temperature": config.temperature,
+        "device": device or config.device,
+        "precision": precision or config.precision,
+        "engine": config.engine,
+        "batch_size": config.batch_size,
+        "chunk_seconds": config.chunk_seconds,
+        "whisper": whisper_version(),
+    }
+    return hashlib.sha256(json.dumps(parts, sort_keys=True).encode()).hexdigest()
+
+
+class ResultCache:
+    """
+    Persistent transcription results, indexed in SQLite with JSON blob files.
+
+    Blobs are written atomically before their index row, so a crash can leave an
+    orphaned blob but never an index entry without its result.
+    """
+
+    def __init__(self, directory: Path, max_mb: int = 0):
+        self.directory = Path(directory) / "transcripts"
+        self.max_bytes = max_mb * 1024 * 1024
+        self._lock = threading.Lock()
+        self.directory.mkdir(parents=True, exist_ok=True)
+        with closing(self._connect()) as db, db:
+            db.execute(_SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        db = sqlite3.connect(self.directory / "index.sqlite", timeout=30)
+        db.row_factory = sqlite3.Row
+        return db
+
+    def _blob_path(self, key: str) -> Path:
+        return self.directory / key[:2] / f"{key}.json"
+
+    def get(self, key: str) -> dict[str, Any] | None:
+        with closing(self._connect()) as db, db:
+            row = db.execute("SELECT key FROM results WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            try:
+                result = json.loads(self._blob_path(key).read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                db.execute("DELETE FROM results WHERE key = ?", (key,))
+                return None
+            db.execute("UPDATE results SET accessed_at = ? WHERE key = ?", (time.time(), key))
+        return result
+
+    def put(self, key: str, audio_hash: str, config: WhisperConfig, result: dict[str, Any]) -> None:
+        path = self._blob_path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        data = json.dumps(result, ensure_ascii=False).encode("utf-8")
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp.write_bytes(data)
+        os.replace(tmp, path)
+
+        now = time.time()
+        with closing(self._connect()) as db, db:
+            db.execute(
+                "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    key,
+                    audio_hash,
+                    config.model,
+                    config.language,
+                    int(config.translate),
+                    config.temperature,
+                    whisper_version(),
+                    len(data),
+                    now,
+                    now,
+                ),
+            )
+
+        if self.max_bytes:
+            self.prune(max_bytes=self.max_bytes)
+
+    def entries(self) -> list[dict[str, Any]]:
+        with closing(self._connect()) as db:
+            rows = db.execute("SELECT * FROM results ORDER BY accessed_at DESC").fetchall()
+        return [dict(row) for row in rows]
+
+    def stats(self) -> dict[str, Any]:
+        with closing(self._connect()) as db:
+            count, size = db.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size_bytes), 0) FROM results"
+            ).fetchone()
+        return {"directory": str(self.directory), "entries": count, "size_bytes": size}
+
+    def prune(self, max_bytes: int | None = None, older_than_days: float | None = None) -> int:
+        """
+        Remove entries not accessed for ``older_than_days``, then the least recently
+        used entries until the cache fits in ``max_bytes``. Returns the number removed.
+        """
+        with self._lock, closing(self._connect()) as db, db:
+            doomed = []
+            if older_than_days is not None:
+                cutoff = time.time() - older_than_days * 86400
+                doomed += [
+                    row["key"]
+                    for row in db.execute(
+                        "SELECT key FROM results WHERE accessed_at < ?", (cutoff,)
+                    )
+                ]
+
+            if max_bytes is not None:
+                rows = db.execute(
+                    "SELECT key, size_bytes FROM results ORDER BY accessed_at DESC"
+                ).fetchall()
+                total = 0
+                for row in rows:
+                    total += row["size_bytes"]
+                    if total > max_bytes and row["key"] not in doomed:
+                        doomed.append(row["key"])
+
+            for key in doomed:
+                db.execute("DELETE FROM results WHERE key = ?", (key,))
+                self._blob_path(key).unlink(missing_ok=True)
+
+        if doomed:
+            logger.debug(f"Pruned {len(doomed)} cached transcriptions")
+        return len(doomed)
+
+    def clear(self) -> int:
+        return self.prune(max_bytes=0)
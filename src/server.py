@@ -0,0 +1,341 @@
+"""
+Warm transcription daemon and its client.
+
+``podcast-ai-agent serve`` keeps Whisper models loaded in one long-running
+process and runs jobs submitted over a Unix domain socket. The protocol is
+newline-delimited JSON; each request line gets one response line:
+
+- ``{"op": "ping"}`` returns the daemon's pid, queue counters and memory
+  reservations.
+- ``{"op": "submit", "url": ..., "config": {...}, "resume": true}`` queues a
+  job. ``config`` is the submitter's fully resolved ``Config``, so the daemon
+  does exactly what a local run would have done. The response arrives once
+  the job has finished. Its ``status`` is ``done``, ``skipped`` (finished by an
+  earlier run), ``failed`` (with ``error`` and ``error_type``) or ``rejected``
+  (queue full, shutting down, or invalid config).
+- ``{"op": "shutdown"}`` starts a graceful shutdown.
+
+A client may send many submissions on one connection and then close its
+write side. Responses come back in completion order and are tagged with
+``job`` and ``url``. The daemon closes the connection once all of them have
+been sent.
+"""
+
+import itertools
+import json
+import logging
+import os
+import queue
+import socket
+import socketserver
+import threading
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from .config import Config
+from .jobs import JournaledJob, run_item
+from .memory import get_governor
+
+logger = logging.getLogger("podcast_ai_agent")
+
+Reply = Callable[[dict], None]
+
+
+class ServerError(Exception):
+    """Raised when the daemon cannot start or cannot be reached"""
+
+
+@dataclass
+class _Job:
+    id: int
+    url: str
+    config: Config
+    resume: bool
+    reply: Reply
+    done: threading.Event = field(default_factory=threading.Event)
+
+
+_STOP = object()
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    server: "_UnixServer"
+
+    def handle(self) -> None:
+        write_lock = threading.Lock()
+        submitted: list[_Job] = []
+
+        def reply(message: dict) -> None:
+            data = (json.dumps(message, default=str) + "\n").encode()
+            with write_lock:
+                try:
+                    self.wfile.write(data)
+                    self.wfile.flush()
+                except OSError:
+                    # The client went away; its jobs still run to completion
+                    pass
+
+        for line in self.rfile:
+            if not line.strip():
+                continue
+            try:
+                request = json.loads(line)
+                op = request["op"]
+            except (ValueError, KeyError, TypeError):
+                reply({"status": "error", "error": "expected a JSON object with an 'op'"})
+                continue
+
+            if op == "ping":
+                reply(self.server.app.status())
+            elif op == "submit":
+                job = self.server.app.submit(request, reply)
+                if job is not None:
+                    submitted.append(job)
+            elif op == "shutdown":
+                reply({"status": "ok"})
+                threading.Thread(target=self.server.app.shutdown, daemon=True).start()
+            else:
+                reply({"status": "error", "error": f"unknown op {op!r}"})
+
+        for job in submitted:
+            job.done.wait()
+
+
+class _UnixServer(socketserver.ThreadingUnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, path: str, app: "TranscriptionServer"):
+        self.app = app
+        super().__init__(path, _Handler)
+
+
+class TranscriptionServer:
+    """
+    Job queue in front of a fixed number of worker threads.
+
+    At most ``workers`` jobs run at once and at most ``max_queue`` wait;
+    further submissions are rejected rather than buffered without bound.
+    Models stay in the process-wide model registry between jobs, so only the
+    first job per model pays for loading it. Each job also waits for the
+    memory governor to admit it, so more workers do not overcommit RAM.
+    ``shutdown`` stops accepting
+    connections and submissions, lets queued and running jobs finish, and
+    removes the socket.
+    """
+
+    def __init__(self, config: Config, socket_path: Path | None = None):
+        self.config = config
+        self.socket_path = Path(socket_path or config.server.socket).expanduser()
+        self._queue: queue.Queue = queue.Queue(maxsize=config.server.max_queue)
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._counts = {"running": 0, "done": 0, "failed": 0, "rejected": 0}
+        self._workers: list[threading.Thread] = []
+        self._closing = threading.Event()
+        self._stopped = threading.Event()
+        self._server: _UnixServer | None = None
+
+    def start(self) -> "TranscriptionServer":
+        if self.socket_path.exists():
+            if ping(self.socket_path) is not None:
+                raise ServerError(f"A daemon is already listening on {self.socket_path}")
+            # Left behind by a daemon that did not shut down cleanly
+            self.socket_path.unlink()
+        self.socket_path.parent.mkdir(parents=True, exist_ok=True)
+
+        self._server = _UnixServer(str(self.socket_path), self)
+        os.chmod(self.socket_path, 0o600)
+        for i in range(self.config.server.workers):
+            worker = threading.Thread(target=self._work, name=f"server-worker-{i}", daemon=True)
+            worker.start()
+            self._workers.append(worker)
+        threading.Thread(
+            target=self._server.serve_forever, name="server-accept", daemon=True
+        ).start()
+        logger.info(f"Listening on {self.socket_path}")
+        return self
+
+    def wait(self, timeout: float | None = None) -> bool:
+        """Block until the daemon has shut down; True once it has."""
+        return self._stopped.wait(timeout)
+
+    def shutdown(self) -> None:
+        with self._lock:
+            if self._closing.is_set():
+                return
+            self._closing.set()
+        logger.info("Shutting down; finishing queued jobs...")
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+        # Queued after the pending jobs, so workers drain the queue before stopping
+        for _ in self._workers:
+            self._queue.put(_STOP)
+        for worker in self._workers:
+            worker.join()
+        try:
+            self.socket_path.unlink()
+        except FileNotFoundError:
+            pass
+        logger.info("Daemon stopped")
+        self._stopped.set()
+
+    def status(self) -> dict:
+        with self._lock:
+            counts = dict(self._counts)
+        return {
+            "status": "ok",
+            "pid": os.getpid(),
+            "queued": self._queue.qsize(),
+            "workers": len(self._workers),
+            "closing": self._closing.is_set(),
+            **counts,
+            "memory": get_governor().stats(),
+        }
+
+    def submit(self, request: dict, reply: Reply) -> _Job | None:
+        url = request.get("url")
+        try:
+            if not isinstance(url, str) or not url.strip():
+                raise ValueError("missing 'url'")
+            config = Config.model_validate(request.get("config") or self.config.model_dump())
+        except ValueError as e:  # Includes pydantic's ValidationError
+            self._reject(reply, url, f"invalid job: {e}")
+            return None
+
+        job = _Job(next(self._ids), url, config, bool(request.get("resume", True)), reply)
+        if self._closing.is_set():
+            self._reject(reply, url, "daemon is shutting down", job.id)
+            return None
+        try:
+            self._queue.put_nowait(job)
+        except queue.Full:
+            self._reject(reply, url, "job queue is full", job.id)
+            return None
+        logger.info(f"Queued job {job.id}: {url}")
+        return job
+
+    def _reject(self, reply: Reply, url, error: str, job_id: int | None = None) -> None:
+        with self._lock:
+            self._counts["rejected"] += 1
+        reply({"job": job_id, "url": url, "status": "rejected", "error": error})
+
+    def _work(self) -> None:
+        while True:
+            job = self._queue.get()
+            if job is _STOP:
+                return
+            with self._lock:
+                self._counts["running"] += 1
+            try:
+                job.reply(self._run(job))
+            finally:
+                with self._lock:
+                    self._counts["running"] -= 1
+                job.done.set()
+
+    def _run(self, job: _Job) -> dict:
+        from .transcriber import Transcriber
+
+        journaled = JournaledJob(job.config, resume=job.resume)
+        response = {"job": job.id, "url": job.url}
+        try:
+            outputs = journaled.start(job.url)
+            if outputs is not None:
+                return {**response, "status": "skipped", "output_paths": outputs}
+            # Each job carries its own config, so its transcriber is not shared
+            with Transcriber(job.config.whisper, job.config.cache) as transcriber:
+                output_paths = run_item(job.config, journaled, job.url, transcriber)
+        except Exception as e:  # noqa: BLE001 - reported to the client
+            journaled.failed(job.url, e)
+            logger.error(f"Job {job.id} failed for {job.url}: {e}")
+            with self._lock:
+                self._counts["failed"] += 1
+            return {
+                **response,
+                "status": "failed",
+                "error": str(e),
+                "error_type": type(e).__name__,
+            }
+        with self._lock:
+            self._counts["done"] += 1
+        logger.info(f"Job {job.id} done: {job.url}")
+        return {**response, "status": "done", "output_paths": output_paths}
+
+
+def _connect(socket_path: Path, timeout: float | None) -> socket.socket:
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.settimeout(timeout)
+    try:
+        sock.connect(str(Path(socket_path).expanduser()))
+    except OSError:
+        sock.close()
+        raise
+    return sock
+
+
+def ping(socket_path: Path, timeout: float = 1.0) -> dict | None:
+    """The daemon's status, or None if nothing answers on ``socket_path``."""
+    if not Path(socket_path).expanduser().exists():
+        return None
+    try:
+        with _connect(socket_path, timeout) as sock:
+            sock.sendall(b'{"op": "ping"}\n')
+            sock.shutdown(socket.SHUT_WR)
+            line = sock.makefile("rb").readline()
+        return json.loads(line) if line else None
+    except (OSError, ValueError):
+        return None
+
+
+def request_shutdown(socket_path: Path, timeout: float = 5.0) -> bool:
+    try:
+        with _connect(socket_path, timeout) as sock:
+            sock.sendall(b'{"op": "shutdown"}\n')
+            sock.shutdown(socket.SHUT_WR)
+            return bool(sock.makefile("rb").readline())
+    except OSError:
+        return False
+
+
+def submit_jobs(
+    socket_path: Path,
+    config: Config,
+    urls: Iterable[str],
+    on_result: Callable[[dict], None],
+    resume: bool = True,
+) -> None:
+    """
+    Submit every URL on one connection and call ``on_result`` as jobs finish.
+
+    Relative paths in ``config`` are made absolute first, since the daemon runs
+    in a different working directory.
+    """
+    config = config.model_copy(deep=True)
+    config.output.directory = Path(config.output.directory).resolve()
+    if config.cache.directory is not None:
+        config.cache.directory = Path(config.cache.directory).resolve()
+    config_data = config.model_dump(mode="json")
+
+    with _connect(socket_path, None) as sock:
+        errors: list[BaseException] = []
+
+        def read() -> None:
+            try:
+                for line in sock.makefile("rb"):
+                    on_result(json.loads(line))
+            except BaseException as e:  # noqa: BLE001 - re-raised in the caller's thread
+                errors.append(e)
+
+        # Results are read while later URLs are still being sent (and a playlist
+        # may still be expanding), so neither side waits on a full socket buffer
+        reader = threading.Thread(target=read, name="server-client-read", daemon=True)
+        reader.start()
+        for url in urls:
+            request = {"op": "submit", "url": url, "config": config_data, "resume": resume}
+            sock.sendall((json.dumps(request) + "\n").encode())
+        sock.shutdown(socket.SHUT_WR)
+        reader.join()
+        if errors:
+            raise errors[0]
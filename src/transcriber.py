@@ -1,63 +1,560 @@
+import contextlib
+import importlib
+import itertools
 import logging
+import multiprocessing
+import sqlite3
+import threading
+import time
+from collections.abc import Callable, Iterable, Iterator
+from dataclasses import asdict, dataclass
 from pathlib import Path
+from typing import TYPE_CHECKING, Any
 
+import numpy as np
 import torch
 import whisper
 
-from .config import WhisperConfig
-from .utils import estimate_ram_requirement, get_available_ram_gb, validate_audio_file
+from . import profiling
+from .audio_cache import AudioCache
+from .chunking import SAMPLE_RATE, find_split_points, merge_results, split_audio
+from .config import CacheConfig, WhisperConfig
+from .exceptions import InvalidAudioError, TranscriptionError
+from .memory import get_governor
+from .model_cache import ModelKey, get_registry
+from .output import OutputWriter
+from .result_cache import ResultCache, result_key
+from .utils import AudioInfo, file_sha256, probe_audio
+
+if TYPE_CHECKING:
+    from .worker_pool import TranscriptionPool
 
 logger = logging.getLogger("podcast_ai_agent")
 
 
-class TranscriptionError(Exception):
-    """Base exception for transcription failures"""
+@dataclass
+class TranscriptionProgress:
+    """Snapshot of a running transcription, passed to progress callbacks."""
+
+    processed_seconds: float
+    total_seconds: float | None
+    elapsed_seconds: float
+    segments: int | None = None
+
+    @property
+    def fraction(self) -> float:
+        if not self.total_seconds:
+            return 0.0
+        return min(1.0, self.processed_seconds / self.total_seconds)
+
+    @property
+    def realtime_factor(self) -> float | None:
+        """Processing time per second of audio; below 1.0 is faster than real time."""
+        if self.processed_seconds <= 0:
+            return None
+        return self.elapsed_seconds / self.processed_seconds
+
+    @property
+    def eta_seconds(self) -> float | None:
+        rtf = self.realtime_factor
+        if rtf is None or self.total_seconds is None:
+            return None
+        return max(0.0, self.total_seconds - self.processed_seconds) * rtf
+
+
+ProgressCallback = Callable[[TranscriptionProgress], None]
+# Seconds of audio decoded so far and, where known, the segments produced
+DecodeProgress = Callable[[float, int | None], None]
+
+
+class _ProgressTracker:
+    """Turns decoder position updates into ``TranscriptionProgress`` callbacks."""
+
+    def __init__(self, callback: ProgressCallback | None, total_seconds: float | None):
+        self.callback = callback
+        self.total_seconds = total_seconds
+        self.processed_seconds = 0.0
+        self.started = time.monotonic()
+
+    def update(self, processed_seconds: float, segments: int | None = None) -> None:
+        if self.callback is None:
+            return
+        # Never move backwards, and never past the probed duration
+        self.processed_seconds = max(self.processed_seconds, processed_seconds)
+        if self.total_seconds is not None:
+            self.processed_seconds = min(self.processed_seconds, self.total_seconds)
+        self.callback(
+            TranscriptionProgress(
+                processed_seconds=self.processed_seconds,
+                total_seconds=self.total_seconds,
+                elapsed_seconds=time.monotonic() - self.started,
+                segments=segments,
+            )
+        )
+
+    def measure(self, audio: str | np.ndarray) -> None:
+        """Take the duration from decoded audio when the probe could not tell."""
+        if self.total_seconds is None and isinstance(audio, np.ndarray):
+            self.total_seconds = len(audio) / SAMPLE_RATE
+
+    def finish(self, segments: int | None = None) -> None:
+        self.update(self.total_seconds or self.processed_seconds, segments)
+
+
+# whisper's transcribe() only reports progress through a tqdm bar. While a
+# decode with a callback runs, its module reference to tqdm is swapped for a
+# factory that hands out a reporting bar to threads that registered a callback
+# and a real tqdm bar to the others. The last one to finish puts tqdm back.
+_progress_local = threading.local()
+_progress_lock = threading.Lock()
+_progress_users = 0
+
+
+class _WhisperProgressBar:
+    def __init__(self, report: DecodeProgress):
+        self.report = report
+        self.frames = 0
+
+    def __enter__(self) -> "_WhisperProgressBar":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        pass
+
+    def update(self, n: int = 1) -> None:
+        self.frames += n
+        self.report(self.frames * whisper.audio.HOP_LENGTH / SAMPLE_RATE, None)
+
+
+class _TqdmShim:
+    def __init__(self, tqdm_module):
+        self._tqdm = tqdm_module
+
+    def tqdm(self, *args, **kwargs):
+        report = getattr(_progress_local, "report", None)
+        if report is None:
+            return self._tqdm.tqdm(*args, **kwargs)
+        return _WhisperProgressBar(report)
+
+    def __getattr__(self, name):
+        return getattr(self._tqdm, name)
+
+
+@contextlib.contextmanager
+def _reporting_progress(report: DecodeProgress | None) -> Iterator[None]:
+    """Send the progress of whisper's decoding on this thread to ``report``."""
+    global _progress_users
+    if report is None:
+        yield
+        return
+
+    # ``whisper.transcribe`` is shadowed by the function of the same name
+    module: Any = importlib.import_module("whisper.transcribe")
+    with _progress_lock:
+        if _progress_users == 0:
+            module.tqdm = _TqdmShim(module.tqdm)
+        _progress_users += 1
+    _progress_local.report = report
+    try:
+        yield
+    finally:
+        _progress_local.report = None
+        with _progress_lock:
+            _progress_users -= 1
+            if _progress_users == 0:
+                module.tqdm = module.tqdm._tqdm
 
 
-class InsufficientMemoryError(TranscriptionError):
-    """Raised when insufficient RAM for model"""
+class BatchedEngine:
+    """
+    Decodes many 30-second windows per forward pass instead of one at a time.
 
+    Audio is cut at short pauses into windows of at most 30 seconds, log-mel
+    spectrograms are computed per batch, and the encoder and decoder run on
+    stacks of ``batch_size`` windows, optionally mixing windows from several
+    files. Windows are decoded independently (no previous-text conditioning);
+    windows failing Whisper's compression-ratio or log-prob checks are retried
+    one by one at higher temperatures, like the stock decoder does.
+    """
 
-class InvalidAudioError(TranscriptionError):
-    """Raised when audio file is invalid"""
+    WINDOW_SECONDS = 27.0
+    SEARCH_SECONDS = 3.0
+    COMPRESSION_RATIO_THRESHOLD = 2.4
+    LOGPROB_THRESHOLD = -1.0
+    NO_SPEECH_THRESHOLD = 0.6
+
+    def __init__(
+        self,
+        model: whisper.Whisper,
+        batch_size: int = 8,
+        language: str | None = None,
+        task: str = "transcribe",
+        temperature: float = 0.0,
+        fp16: bool = False,
+        on_progress: Callable[[float, int], None] | None = None,
+    ):
+        self.model = model
+        self.batch_size = max(1, batch_size)
+        # English-only models have no language tokens to detect with, and
+        # whisper's own transcribe() decodes them as English
+        if language is None and not model.is_multilingual:
+            language = "en"
+        self.language = language
+        self.task = task
+        self.temperature = temperature
+        self.fp16 = fp16
+        self.on_progress = on_progress
+        self.detected_language: str | None = language
+
+    def windows(self, audio: np.ndarray) -> list[tuple[float, np.ndarray]]:
+        points = find_split_points(
+            audio, chunk_seconds=self.WINDOW_SECONDS, search_seconds=self.SEARCH_SECONDS
+        )
+        return split_audio(audio, points)
+
+    def transcribe(self, audio: np.ndarray) -> dict:
+        return self.transcribe_many([audio])[0]
+
+    def transcribe_many(self, audios: list[np.ndarray]) -> list[dict]:
+        """Transcribe several files, filling every batch with windows from any of them."""
+        jobs = (
+            (file_index, offset, window)
+            for file_index, audio in enumerate(audios)
+            for offset, window in self.windows(audio)
+        )
+        results: list[dict] = [{"text": "", "segments": [], "language": None} for _ in audios]
+        for file_index, segments, language in self._iter_windows(jobs):
+            result = results[file_index]
+            result["language"] = language
+            for seg in segments:
+                seg["id"] = len(result["segments"])
+                result["segments"].append(seg)
+
+        for result in results:
+            result["text"] = "".join(seg["text"] for seg in result["segments"])
+            result["language"] = result["language"] or self.language
+        return results
+
+    def iter_segments(self, audio: np.ndarray) -> Iterator[dict]:
+        """
+        Yield segments as soon as the batch containing them is decoded.
+
+        Only one batch of windows is held in memory at a time, so memory use does
+        not depend on the length of the audio.
+        """
+        jobs = ((0, offset, window) for offset, window in self.windows(audio))
+        next_id = 0
+        for _, segments, language in self._iter_windows(jobs):
+            self.detected_language = language
+            for seg in segments:
+                seg["id"] = next_id
+                next_id += 1
+                yield seg
+
+    def _iter_windows(self, jobs: Iterable[tuple[int, float, np.ndarray]]):
+        """
+        Decode windows batch by batch, yielding (file index, segments, language) each.
+
+        After every batch ``on_progress`` receives the seconds of audio decoded
+        so far and the number of segments produced.
+        """
+        # Without a configured language, each file's language is detected
+        # from its first window
+        file_languages: dict[int, str] = {}
+        tokenizers: dict[str, Any] = {}
+        processed = 0.0
+        segment_count = 0
+        jobs = iter(jobs)
+
+        while batch := list(itertools.islice(jobs, self.batch_size)):
+            mel = self._mel([window for _, _, window in batch])
+            languages = []
+            for i, (file_index, _, _) in enumerate(batch):
+                if self.language is None and file_index not in file_languages:
+                    file_languages[file_index] = self._detect_language(mel[i : i + 1])
+                languages.append(self.language or file_languages[file_index])
+
+            # One decoder pass per language present in the batch
+            results: list = [None] * len(batch)
+            for language in dict.fromkeys(languages):
+                indices = [i for i, lang in enumerate(languages) if lang == language]
+                group_mel = mel if len(indices) == len(batch) else mel[indices]
+                decoded_group = self._decode(group_mel, language, self.temperature)
+                for i, result in zip(indices, decoded_group):
+                    results[i] = result
+
+            decoded = []
+            for i, ((file_index, offset, window), result) in enumerate(zip(batch, results)):
+                language = languages[i]
+                if self._needs_fallback(result):
+                    result = self._fallback(mel[i : i + 1], language)
+                if language not in tokenizers:
+                    tokenizers[language] = self._tokenizer(language)
+                duration = len(window) / SAMPLE_RATE
+                segments = self._segments(offset, duration, result, tokenizers[language])
+                decoded.append((file_index, segments, language))
+                processed += duration
+
+            segment_count += sum(len(segments) for _, segments, _ in decoded)
+            if self.on_progress is not None:
+                self.on_progress(processed, segment_count)
+            yield from decoded
+
+    def _detect_language(self, mel: torch.Tensor) -> str:
+        _, probs = self.model.detect_language(mel)
+        language = max(probs[0], key=probs[0].get)
+        logger.debug(f"Detected language: {language}")
+        return language
+
+    def _mel(self, windows: list[np.ndarray]) -> torch.Tensor:
+        n_mels = self.model.dims.n_mels
+        mels = [
+            whisper.log_mel_spectrogram(whisper.pad_or_trim(np.asarray(w)), n_mels=n_mels)
+            for w in windows
+        ]
+        mel = torch.stack(mels).to(self.model.device)
+        return mel.half() if self.fp16 else mel
+
+    def _tokenizer(self, language: str | None):
+        from whisper.tokenizer import get_tokenizer
+
+        return get_tokenizer(
+            self.model.is_multilingual,
+            num_languages=self.model.num_languages,
+            language=language,
+            task=self.task,
+        )
+
+    def _decode(self, mel: torch.Tensor, language: str, temperature: float) -> list:
+        options = whisper.DecodingOptions(
+            task=self.task,
+            language=language,
+            temperature=temperature,
+            fp16=self.fp16,
+        )
+        return whisper.decode(self.model, mel, options)
+
+    def _needs_fallback(self, result) -> bool:
+        if result.no_speech_prob > self.NO_SPEECH_THRESHOLD:
+            return False
+        return (
+            result.compression_ratio > self.COMPRESSION_RATIO_THRESHOLD
+            or result.avg_logprob < self.LOGPROB_THRESHOLD
+        )
+
+    def _fallback(self, mel: torch.Tensor, language: str):
+        result = None
+        temperature = self.temperature
+        while temperature < 1.0:
+            temperature = round(temperature + 0.2, 1)
+            result = self._decode(mel, language, temperature)[0]
+            if not self._needs_fallback(result):
+                break
+        return result
+
+    def _is_silent(self, result) -> bool:
+        return (
+            result.no_speech_prob > self.NO_SPEECH_THRESHOLD
+            and result.avg_logprob < self.LOGPROB_THRESHOLD
+        )
+
+    def _segments(self, offset: float, duration: float, result, tokenizer) -> list[dict]:
+        if self._is_silent(result):
+            return []
+
+        segments: list[dict] = []
+        for start, end, tokens in self._split_tokens(result.tokens, tokenizer, duration):
+            text = tokenizer.decode(tokens)
+            if not text.strip():
+                continue
+            segments.append(
+                {
+                    "id": len(segments),
+                    "seek": int(offset * 100),
+                    "start": round(offset + start, 3),
+                    "end": round(offset + end, 3),
+                    "text": text,
+                    "tokens": tokens,
+                    "temperature": result.temperature,
+                    "avg_logprob": result.avg_logprob,
+                    "compression_ratio": result.compression_ratio,
+                    "no_speech_prob": result.no_speech_prob,
+                }
+            )
+        return segments
+
+    @staticmethod
+    def _split_tokens(tokens: list[int], tokenizer, duration: float):
+        """Split a window's tokens into (start, end, text tokens) at timestamp tokens."""
+        timestamp_begin = tokenizer.timestamp_begin
+        start = None
+        text_tokens: list[int] = []
+        for token in tokens:
+            if token >= tokenizer.eot and token < timestamp_begin:
+                continue
+            if token >= timestamp_begin:
+                time = (token - timestamp_begin) * 0.02
+                if start is not None and text_tokens:
+                    yield start, min(time, duration), text_tokens
+                    text_tokens = []
+                    start = None
+                else:
+                    start = time
+            else:
+                if start is None:
+                    start = 0.0
+                text_tokens.append(token)
+
+        if text_tokens:
+            yield start or 0.0, duration, text_tokens
 
 
 class Transcriber:
-    def __init__(self, config: WhisperConfig):
+    """
+    Transcribes audio files with one configured model.
+
+    Long files may be decoded in chunks by a pool of worker processes, which
+    is started on first use and kept for later files; ``close`` stops it.
+    """
+
+    def __init__(self, config: WhisperConfig, cache: CacheConfig | None = None):
         self.config = config
+        self.cache = cache or CacheConfig(audio_enabled=False, results_enabled=False)
+        self.audio_cache = (
+            AudioCache(self.cache.directory, self.cache.audio_max_mb)
+            if self.cache.audio_enabled and self.cache.directory is not None
+            else None
+        )
+        self.result_cache = (
+            ResultCache(self.cache.directory, self.cache.results_max_mb)
+            if self.cache.results_enabled and self.cache.directory is not None
+            else None
+        )
         self.model = None
+        self.audio_info: AudioInfo | None = None
+        self._chunk_pool: TranscriptionPool | None = None
+        self._chunk_pool_lock = threading.Lock()
+
+    def close(self) -> None:
+        """Stop the chunk worker processes, if any were started."""
+        with self._chunk_pool_lock:
+            pool, self._chunk_pool = self._chunk_pool, None
+        if pool is not None:
+            pool.close()
+
+    def __enter__(self) -> "Transcriber":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def _model_key(self) -> ModelKey:
+        device = self.config.device
+        if device == "auto":
+            device = "cuda" if torch.cuda.is_available() else "cpu"
+        precision = self.config.precision
+        if device == "cpu":
+            # fp16 is not supported on CPU
+            precision = "int8" if precision == "int8" else "fp32"
+        elif precision in ("auto", "int8"):
+            # Whisper decodes in fp16 on GPU by default; dynamically quantized
+            # kernels only exist for CPU
+            precision = "fp16"
+        return (self.config.model, device, precision)
 
     def _load_model(self) -> whisper.Whisper:
         if self.model is not None:
             return self.model
 
-        ram_required_gb = estimate_ram_requirement(self.config.model) / 1024
-        ram_available_gb = get_available_ram_gb()
-
-        if ram_available_gb < ram_required_gb:
-            raise InsufficientMemoryError(
-                f"Insufficient RAM: {ram_available_gb:.1f}GB available, "
-                f"{ram_required_gb:.1f}GB required for {self.config.model} model"
+        key = self._model_key()
+        registry = get_registry()
+        reservation: contextlib.AbstractContextManager[None]
+        if key in registry:
+            reservation = contextlib.nullcontext()
+        else:
+            # Reserved before taking the registry lock, so waiting for memory
+            # does not block threads that only need a loaded model
+            governor = get_governor()
+            reservation = governor.admit(governor.load_mb(key), f"{key[0]} model")
+        with reservation:
+            self.model = registry.get(
+                key, lambda: self._load_from_disk(*key), ram_budget_mb=self.config.model_cache_mb
             )
+        return self.model
 
-        device = "cuda" if torch.cuda.is_available() else "cpu"
-        logger.info(f"Loading {self.config.model} model on {device}...")
+    def _load_from_disk(self, name: str, device: str, precision: str) -> whisper.Whisper:
+        logger.info(f"Loading {name} model on {device}...")
 
+        governor = get_governor()
         try:
-            self.model = whisper.load_model(self.config.model, device=device)
-            return self.model
+            with profiling.stage("transcribe.load_model"), governor.measure() as usage:
+                if precision == "int8":
+                    from .quantization import load_int8
+
+                    model = load_int8(name, lambda: self._read_checkpoint(name, "cpu"))
+                else:
+                    model = self._read_checkpoint(name, device)
+                if precision == "fp16":
+                    model = model.half()
         except Exception as e:
-            raise TranscriptionError(f"Failed to load model: {e}")
+            raise TranscriptionError(f"Failed to load model: {e}") from e
 
-    def transcribe(self, audio_path: Path) -> dict:
-        if not validate_audio_file(audio_path):
-            raise InvalidAudioError(f"Invalid or corrupted audio: {audio_path}")
+        governor.record_load((name, device, precision), usage)
+        return model
 
-        model = self._load_model()
+    def _read_checkpoint(self, name: str, device: str) -> whisper.Whisper:
+        if not self.config.fast_load:
+            return whisper.load_model(name, device=device)
+
+        from .weight_cache import load_fast
+
+        return load_fast(name, device, lambda: whisper.load_model(name, device="cpu"))
+
+    @contextlib.contextmanager
+    def _admitted(self, info: AudioInfo, name: str, record: bool = True) -> Iterator[None]:
+        """
+        Reserve the expected decode peak for ``info`` while the block runs, and
+        record what it actually used.
+        """
+        governor = get_governor()
+        key = self._model_key()
+        with (
+            governor.admit(governor.decode_mb(key, info.duration), f"transcribing {name}"),
+            governor.measure() as usage,
+        ):
+            yield
+        if record and info.duration:
+            governor.record_decode(key, info.duration, usage)
+
+    def _load_audio(self, audio_path: Path, digest: str | None) -> str | np.ndarray:
+        if self.audio_cache is None:
+            return str(audio_path)
+        try:
+            with profiling.stage("transcribe.load_audio") as timer:
+                audio = self.audio_cache.load(audio_path, digest)
+                timer.add_bytes(audio.nbytes)
+            return audio
+        except Exception as e:
+            raise InvalidAudioError(f"Failed to decode {audio_path.name}: {e}") from e
+
+    def _decode(
+        self,
+        model: whisper.Whisper,
+        audio: str | np.ndarray,
+        progress: DecodeProgress | None = None,
+    ) -> dict:
+        """
+        Transcribe one file or array with the configured engine.
 
-        logger.info(f"Transcribing {audio_path.name}...")
-        kwargs = {
+        ``progress`` is called with the seconds of audio decoded so far and,
+        for the batched engine, the number of segments produced.
+        """
+        if self.config.engine == "batched":
+            return self._decode_batched(model, audio, progress)
+
+        kwargs: dict[str, Any] = {
             "temperature": self.config.temperature,
+            "fp16": self._model_key()[2] == "fp16",
         }
 
         if self.config.language != "auto":
@@ -66,24 +563,279 @@ class Transcriber:
         if self.config.translate:
             kwargs["task"] = "translate"
 
-        try:
-            import warnings
-            with warnings.catch_warnings(record=True) as w:
-                warnings.simplefilter("always")
+        import warnings
+        with warnings.catch_warnings(record=True) as w:
+            warnings.simplefilter("always")
+
+            with _reporting_progress(progress), get_registry().inference_lock(self._model_key()):
+                result = model.transcribe(audio, **kwargs)
+
+        # Re-raised outside the block, or they would be recorded into ``w`` again
+        for warning in w:
+            if "FP16 is not supported on CPU" in str(warning.message):
+                logger.warning(f"Whisper Warning: {warning.message}")
+            else:
+                warnings.warn_explicit(
+                    warning.message,
+                    warning.category,
+                    warning.filename,
+                    warning.lineno,
+                )
+
+        return result
+
+    def _engine(
+        self,
+        model: whisper.Whisper,
+        progress: DecodeProgress | None = None,
+    ) -> BatchedEngine:
+        return BatchedEngine(
+            model,
+            batch_size=self.config.batch_size,
+            language=None if self.config.language == "auto" else self.config.language,
+            task="translate" if self.config.translate else "transcribe",
+            temperature=self.config.temperature,
+            fp16=self._model_key()[2] == "fp16",
+            on_progress=progress,
+        )
+
+    def _decode_batched(
+        self,
+        model: whisper.Whisper,
+        audio: str | np.ndarray,
+        progress: DecodeProgress | None = None,
+    ) -> dict:
+        samples = whisper.audio.load_audio(audio) if isinstance(audio, str) else audio
+        engine = self._engine(model, progress)
+        with get_registry().inference_lock(self._model_key()), torch.no_grad():
+            return engine.transcribe(samples)
+
+    def _should_chunk(self, info: AudioInfo) -> bool:
+        chunk_seconds = self.config.chunk_seconds
+        return bool(chunk_seconds) and (info.duration or 0) > chunk_seconds * 1.5
+
+    def _transcribe_chunked(
+        self, audio: str | np.ndarray, tracker: _ProgressTracker | None = None
+    ) -> dict:
+        """Split at silences, transcribe chunks in parallel processes and merge."""
+        samples = whisper.audio.load_audio(audio) if isinstance(audio, str) else audio
+        chunks = split_audio(samples, find_split_points(samples, self.config.chunk_seconds))
+        logger.info(f"Transcribing in {len(chunks)} chunks split at silences...")
+
+        tracker = tracker or _ProgressTracker(None, None)
+        tracker.measure(samples)
+        done = {"seconds": 0.0, "segments": 0}
+
+        def chunk_done(index: int, result: dict) -> None:
+            done["seconds"] += len(chunks[index][1]) / SAMPLE_RATE
+            done["segments"] += len(result["segments"])
+            tracker.update(done["seconds"], int(done["segments"]))
+
+        workers = min(self.config.chunk_workers, len(chunks))
+        if workers <= 1 or multiprocessing.parent_process() is not None:
+            # Already inside a worker process: do not start another level of workers
+            model = self._load_model()
+            results = []
+            for index, (_, chunk) in enumerate(chunks):
 
-                result = model.transcribe(str(audio_path), **kwargs)
+                def chunk_progress(
+                    seconds: float, segments: int | None, base: float = done["seconds"]
+                ) -> None:
+                    tracker.update(base + seconds)
 
-                for warning in w:
-                    if "FP16 is not supported on CPU" in str(warning.message):
-                        logger.warning(f"Whisper Warning: {warning.message}")
+                results.append(self._decode(model, chunk, chunk_progress))
+                chunk_done(index, results[-1])
+        else:
+            longest = max(len(chunk) for _, chunk in chunks) / SAMPLE_RATE
+            pool = self._chunk_workers(longest)
+            results = pool.map_audio([chunk for _, chunk in chunks], on_result=chunk_done)
+
+        return merge_results([(offset, r) for (offset, _), r in zip(chunks, results)])
+
+    def _chunk_workers(self, audio_seconds: float) -> "TranscriptionPool":
+        # Started once and shared by every later file, so the workers do not
+        # start and load the model again for each episode
+        with self._chunk_pool_lock:
+            if self._chunk_pool is None:
+                from .worker_pool import TranscriptionPool
+
+                self._chunk_pool = TranscriptionPool(
+                    self.config, workers=self.config.chunk_workers, audio_seconds=audio_seconds
+                ).start()
+            return self._chunk_pool
+
+    def _probe(self, audio_path: Path) -> AudioInfo:
+        with profiling.stage("transcribe.probe") as timer:
+            info = probe_audio(audio_path)
+            timer.add_bytes(info.size_bytes if info else 0)
+        if info is None or info.duration == 0:
+            raise InvalidAudioError(f"Invalid or corrupted audio: {audio_path}")
+        self.audio_info = info
+        logger.debug(
+            f"Probed {audio_path.name}: {info.duration}s {info.codec} "
+            f"{info.sample_rate}Hz {info.channels}ch"
+        )
+        return info
+
+    def _cache_lookup(self, audio_path: Path) -> tuple[str | None, str | None, dict | None]:
+        """Return the audio digest, result cache key and cached result, where enabled."""
+        digest: str | None = None
+        if self.audio_cache is not None or self.result_cache is not None:
+            with profiling.stage("transcribe.hash") as timer:
+                digest = file_sha256(audio_path)
+                timer.add_bytes(audio_path.stat().st_size)
+
+        if self.result_cache is None or digest is None:
+            return digest, None, None
+
+        _, device, precision = self._model_key()
+        key = result_key(digest, self.config, device, precision)
+        cached = self.result_cache.get(key)
+        if cached is not None:
+            logger.info(f"Using cached transcription for {audio_path.name}")
+        return digest, key, cached
+
+    def transcribe(
+        self, audio_path: Path, progress_callback: ProgressCallback | None = None
+    ) -> dict:
+        """
+        Transcribe ``audio_path``, reporting ``TranscriptionProgress`` to
+        ``progress_callback`` as the decoder advances through the audio.
+        """
+        info = self._probe(audio_path)
+        tracker = _ProgressTracker(progress_callback, info.duration)
+        digest, key, cached = self._cache_lookup(audio_path)
+        if cached is not None:
+            tracker.finish(len(cached["segments"]))
+            return cached
+
+        model = self._load_model()
+        chunked = self._should_chunk(info)
+        # Chunks are decoded in worker processes, whose memory is not ours to measure
+        with self._admitted(info, audio_path.name, record=not chunked):
+            audio = self._load_audio(audio_path, digest)
+            tracker.measure(audio)
+
+            logger.info(f"Transcribing {audio_path.name}...")
+            try:
+                with profiling.stage("transcribe.decode") as timer:
+                    timer.add_bytes(
+                        audio.nbytes if isinstance(audio, np.ndarray) else info.size_bytes
+                    )
+                    if chunked:
+                        result = self._transcribe_chunked(audio, tracker)
                     else:
-                        warnings.warn_explicit(
-                            warning.message,
-                            warning.category,
-                            warning.filename,
-                            warning.lineno,
-                        )
-
-            return result
-        except Exception as e:
-            raise TranscriptionError(f"Transcription failed: {e}")
+                        result = self._decode(model, audio, tracker.update)
+                result["audio"] = asdict(info)
+            except TranscriptionError:
+                raise
+            except Exception as e:
+                raise TranscriptionError(f"Transcription failed: {e}") from e
+
+        if self.result_cache is not None and key is not None and digest is not None:
+            try:
+                with profiling.stage("transcribe.cache_store"):
+                    self.result_cache.put(key, digest, self.config, result)
+            except (OSError, sqlite3.Error, TypeError, ValueError) as e:
+                logger.warning(f"Failed to cache transcription of {audio_path.name}: {e}")
+
+        tracker.finish(len(result["segments"]))
+        return result
+
+    def transcribe_stream(
+        self,
+        audio_path: Path,
+        on_segment: Callable[[dict], None],
+        progress_callback: ProgressCallback | None = None,
+    ) -> dict:
+        """
+        Transcribe with the batched engine, passing each segment to ``on_segment``
+        as soon as its window is decoded.
+
+        Segments are not accumulated, so the returned summary holds the language,
+        segment count and audio metadata but no text. Cached results are replayed
+        through ``on_segment``.
+        """
+        info = self._probe(audio_path)
+        tracker = _ProgressTracker(progress_callback, info.duration)
+        digest, _, cached = self._cache_lookup(audio_path)
+        if cached is not None:
+            for seg in cached["segments"]:
+                on_segment(seg)
+            tracker.finish(len(cached["segments"]))
+            return {
+                "language": cached.get("language"),
+                "segment_count": len(cached["segments"]),
+                "audio": asdict(info),
+            }
+
+        model = self._load_model()
+        with self._admitted(info, audio_path.name):
+            audio = self._load_audio(audio_path, digest)
+            if isinstance(audio, str):
+                with profiling.stage("transcribe.load_audio") as timer:
+                    audio = whisper.audio.load_audio(audio)
+                    timer.add_bytes(audio.nbytes)
+            tracker.measure(audio)
+
+            logger.info(f"Transcribing {audio_path.name} (streaming)...")
+            engine = self._engine(model, tracker.update)
+            count = 0
+            try:
+                with (
+                    profiling.stage("transcribe.decode") as timer,
+                    get_registry().inference_lock(self._model_key()),
+                    torch.no_grad(),
+                ):
+                    timer.add_bytes(audio.nbytes)
+                    for seg in engine.iter_segments(audio):
+                        on_segment(seg)
+                        count += 1
+            except Exception as e:
+                raise TranscriptionError(f"Transcription failed after {count} segments: {e}") from e
+
+        tracker.finish(count)
+        return {
+            "language": engine.detected_language,
+            "segment_count": count,
+            "audio": asdict(info),
+        }
+
+    def transcribe_to_file(
+        self,
+        audio_path: Path,
+        writer: OutputWriter,
+        fmt: str,
+        progress_callback: ProgressCallback | None = None,
+    ) -> Path:
+        """Stream segments into a new ``fmt`` file next to the writer's base path."""
+        return self.transcribe_to_files(audio_path, writer, [fmt], progress_callback)[0]
+
+    def transcribe_to_files(
+        self,
+        audio_path: Path,
+        writer: OutputWriter,
+        formats: list[str],
+        progress_callback: ProgressCallback | None = None,
+    ) -> list[Path]:
+        """
+        Stream every segment into one new file per format in ``formats``.
+
+        Formats the writer keeps under its skip policy are not rewritten; if
+        that covers every format, nothing is transcribed.
+        """
+        kept = {fmt: writer.existing(fmt) for fmt in formats}
+        with contextlib.ExitStack() as stack:
+            streams = {
+                fmt: stack.enter_context(writer.open_stream(fmt))
+                for fmt in formats
+                if kept[fmt] is None
+            }
+
+            def on_segment(seg: dict) -> None:
+                for stream in streams.values():
+                    stream.write_segment(seg)
+
+            if streams:
+                self.transcribe_stream(audio_path, on_segment, progress_callback)
+        return [kept[fmt] or streams[fmt].path for fmt in formats]
@@ -1,21 +1,74 @@
-from pathlib import Path
-from typing import Optional
+import logging
 
 from textual.app import App, ComposeResult
-from textual.containers import Container, Vertical
-from textual.widgets import Header, Footer, Log, Input, Button, Label, ProgressBar
-from textual import work
-from textual.worker import Worker
+from textual.containers import Container
+from textual.widgets import Button, DataTable, Footer, Header, Label, RichLog, TextArea
 
-import logging
+from .config import Config
+from .job_queue import QUEUED, TRANSCRIBING, JobQueue, QueuedJob, Runner, parse_urls
+from .logger import stop_logging
 from .tui_logger import setup_tui_logging
-from .config import DownloadConfig, WhisperConfig
-from .downloader import download_audio
-from .transcriber import Transcriber
 
 # Import global logger to ensure it's the same instance
 logger = logging.getLogger("podcast_ai_agent")
 
+COLUMNS = ("job", "url", "stage", "percent", "speed", "rtf")
+REFRESH_SECONDS = 0.5
+TUI_LOG_MAX_LINES = 5000
+
+
+def format_rate(bytes_per_second: float | None) -> str:
+    if not bytes_per_second:
+        return ""
+    if bytes_per_second < 1024:
+        return f"{bytes_per_second:.0f} B/s"
+    for unit in ("KB/s", "MB/s"):
+        bytes_per_second /= 1024
+        if bytes_per_second < 1024:
+            return f"{bytes_per_second:.1f} {unit}"
+    return f"{bytes_per_second / 1024:.1f} GB/s"
+
+
+def job_row(job: QueuedJob, position: int | None = None) -> tuple:
+    """Cells of a job's row in the jobs table."""
+    stage = job.stage
+    if stage == QUEUED and position is not None:
+        stage = f"queued #{position + 1}"
+    elif job.error:
+        stage = f"{stage}: {job.error[:60]}"
+    rtf = f"{job.realtime_factor:.2f}" if job.stage == TRANSCRIBING and job.realtime_factor else ""
+    return (
+        str(job.id),
+        job.url,
+        stage,
+        f"{job.percent:.0f}%",
+        format_rate(job.bytes_per_second),
+        rtf,
+    )
+
+
+def throughput_summary(stats: dict) -> str:
+    running = stats["downloading"] + stats["transcribing"]
+    parts = [
+        f"{running} running",
+        f"{stats['queued']} queued",
+        f"{stats['done']} done",
+    ]
+    if stats["failed"]:
+        parts.append(f"{stats['failed']} failed")
+    if stats["cancelled"]:
+        parts.append(f"{stats['cancelled']} cancelled")
+    if stats["bytes_per_second"]:
+        parts.append(f"down {format_rate(stats['bytes_per_second'])}")
+    if stats["audio_seconds_per_second"]:
+        parts.append(f"transcribing at {stats['audio_seconds_per_second']:.1f}x realtime")
+    if stats["audio_seconds_done"]:
+        hours = stats["audio_seconds_done"] / 3600
+        per_hour = stats["audio_seconds_done"] / max(stats["elapsed_seconds"], 1.0)
+        parts.append(f"{hours:.2f} h of audio done ({per_hour:.1f}x overall)")
+    return " | ".join(parts)
+
+
 class PodcastAgentApp(App):
     """A Textual app for Podcast AI Agent."""
 
@@ -23,209 +76,186 @@ class PodcastAgentApp(App):
     Screen {
         layout: vertical;
     }
-    
+
     #input-container {
         height: auto;
         dock: top;
         padding: 1;
         border-bottom: solid green;
     }
-    
+
     #url-input {
         width: 100%;
+        height: 5;
     }
-    
+
     #action-buttons {
         layout: horizontal;
         height: auto;
         margin-top: 1;
     }
-    
+
     Button {
         margin-right: 1;
     }
-    
+
+    #jobs {
+        height: 1fr;
+        border: solid green;
+    }
+
     #log-container {
         height: 1fr;
         border: solid blue;
     }
-    
-    Log {
+
+    RichLog {
         height: 100%;
     }
-    
+
     #status-bar {
         height: auto;
         dock: bottom;
         padding: 1;
         background: $boost;
     }
-    
-    ProgressBar {
-        width: 100%;
-        margin-bottom: 1;
-        display: none;
-    }
     """
 
     BINDINGS = [
         ("d", "toggle_dark", "Toggle dark mode"),
+        ("c", "cancel_job", "Cancel job"),
+        ("u", "move_job(-1)", "Move up"),
+        ("n", "move_job(1)", "Move down"),
+        ("t", "run_next", "Run next"),
         ("q", "quit", "Quit"),
     ]
 
+    def __init__(
+        self, config: Config | None = None, workers: int = 2, runner: Runner | None = None
+    ):
+        super().__init__()
+        self.config = config or Config.from_yaml()
+        self.worker_count = workers
+        self.runner = runner
+        self.queue: JobQueue | None = None
+        # Last cells shown per job id, so a refresh only touches changed cells
+        self._rows: dict = {}
+
+    @property
+    def job_queue(self) -> JobQueue:
+        """The job queue, which is created when the app is mounted."""
+        assert self.queue is not None, "the app has not been mounted"
+        return self.queue
+
     def compose(self) -> ComposeResult:
         """Create child widgets for the app."""
         yield Header()
-        
+
         with Container(id="input-container"):
-            yield Label("YouTube URL:")
-            yield Input(placeholder="Enter YouTube URL here...", id="url-input")
+            yield Label("YouTube URLs (one per line; paste a whole batch):")
+            yield TextArea(id="url-input")
             with Container(id="action-buttons"):
                 yield Button("Download & Transcribe", id="btn-process", variant="primary")
                 yield Button("Download Only", id="btn-download")
-                yield Button("Transcribe Only", id="btn-transcribe")
+
+        yield DataTable(id="jobs", cursor_type="row", zebra_stripes=True)
 
         with Container(id="log-container"):
-            yield Log(id="log-output", markup=True)
+            yield RichLog(id="log-output", max_lines=TUI_LOG_MAX_LINES)
 
         with Container(id="status-bar"):
             yield Label("Ready", id="status-label")
-            yield ProgressBar(id="progress-bar", total=100, show_eta=True)
 
         yield Footer()
 
     def on_mount(self) -> None:
         """Called when app starts."""
-        log_widget = self.query_one("#log-output", Log)
-        setup_tui_logging(log_widget, level="INFO")
-        logger.info("Application started. Ready to process.")
+        log_widget = self.query_one("#log-output", RichLog)
+        setup_tui_logging(
+            log_widget,
+            level=self.config.logging.level,
+            log_file=self.config.logging.file,
+            json_file=self.config.logging.json_file,
+        )
+
+        table = self.query_one("#jobs", DataTable)
+        table.add_column("#", key="job")
+        table.add_column("URL", key="url")
+        table.add_column("Stage", key="stage")
+        table.add_column("%", key="percent")
+        table.add_column("Speed", key="speed")
+        table.add_column("RTF", key="rtf")
+
+        self.queue = JobQueue(self.config, workers=self.worker_count, runner=self.runner)
+        # Workers never call into the UI; the table polls their progress instead
+        self.set_interval(REFRESH_SECONDS, self.refresh_jobs)
+        logger.info(f"Application started with {self.worker_count} workers. Ready to process.")
+
+    def on_unmount(self) -> None:
+        if self.queue is not None:
+            # Running jobs stop at their next progress report; do not wait for them here
+            self.queue.close(cancel=True, timeout=0)
+        # The log widget is going away; flush the files and detach from it
+        stop_logging()
 
     def on_button_pressed(self, event: Button.Pressed) -> None:
         """Handle button presses."""
-        url_input = self.query_one("#url-input", Input)
-        url = url_input.value.strip()
+        url_input = self.query_one("#url-input", TextArea)
+        urls = parse_urls(url_input.text)
 
-        if not url:
-            logger.warning("Please enter a valid URL.")
+        if not urls:
+            logger.warning("Please enter at least one URL.")
             return
 
-        if event.button.id == "btn-process":
-            self.action_process(url, transcribe=True)
-        elif event.button.id == "btn-download":
-            self.action_process(url, transcribe=False)
-        # Transcribe only logic would likely need a file selector, skipping for now based on current input
-
-    def action_process(self, url: str, transcribe: bool = True) -> None:
-        """Start the processing workflow."""
-        self.query_one("#btn-process", Button).disabled = True
-        self.query_one("#btn-download", Button).disabled = True
-        
-        # Reset progress
-        pbar = self.query_one("#progress-bar", ProgressBar)
-        pbar.display = True
-        pbar.update(total=100, progress=0)
-        
-        self.run_process_worker(url, transcribe)
-
-    @work(thread=True)
-    def run_process_worker(self, url: str, transcribe: bool) -> None:
-        """Run the heavy lifting in a worker thread."""
-        try:
-            # 1. Download
-            self.post_message_status(f"Downloading {url}...")
-            
-            # Configs
-            dl_config = DownloadConfig() # Defaults
-            # You might want to allow configuring output dir via UI later
-            output_dir = Path("output/downloads")
-            
-            # --- DOWNLOAD ---
-            logger.info(f"Starting download: {url}")
-            
-            def download_progress_hook(d):
-                """Hook for yt-dlp to update Textual progress bar."""
-                if d['status'] == 'downloading':
-                    total_bytes = d.get('total_bytes') or d.get('total_bytes_estimate')
-                    downloaded_bytes = d.get('downloaded_bytes', 0)
-                    if total_bytes:
-                        percentage = (downloaded_bytes / total_bytes) * 100
-                        # Update progress bar (Download takes 0-50% of total visual progress if transcribing, else 0-100%)
-                        # Let's simplify and just show download progress 0-100% then reset for transcribe?
-                        # Or split: Download 50%, Transcribe 50%
-                        
-                        visual_progress = percentage
-                        if transcribe:
-                            visual_progress = visual_progress / 2
-                            
-                        self.post_message_progress(visual_progress, 100)
-
-            # We need to pass a callback that `downloader.py` can use.
-            # `downloader.py` expects a hook that receives the `d` dict from yt-dlp.
-            # We'll pass `download_progress_hook` directly.
-            
-            from .downloader import download_audio
-            audio_path = download_audio(url, output_dir, dl_config, progress_hook=download_progress_hook)
-            
-            logger.info(f"Download complete: {audio_path}")
-            
-            if not transcribe:
-                self.post_message_status("Finished!")
-                self.post_message_completed()
-                return
-
-
-            # --- TRANSCRIBE ---
-            self.post_message_status(f"Transcribing {audio_path.name}...")
-            logger.info("Starting transcription...")
-            
-            whisper_config = WhisperConfig() # Defaults
-            transcriber = Transcriber(whisper_config)
-            
-            # Transcription now doesn't support progress callback
-            result = transcriber.transcribe(audio_path)
-            
-            # Save transcript
-            transcript_path = audio_path.with_suffix(".txt")
-            with open(transcript_path, "w", encoding="utf-8") as f:
-                f.write(result["text"])
-                
-            logger.info(f"Transcription complete: {transcript_path}")
-            self.post_message_status("Finished!")
-            
-        except Exception as e:
-            logger.error(f"Error: {e}")
-            self.post_message_status(f"Error: {e}")
-        finally:
-            self.post_message_completed()
-
-    # --- Helpers to update UI from worker ---
-    
-    def post_message_status(self, message: str) -> None:
-        """Update status label safely."""
-        self.call_from_thread(self.update_status, message)
-        
-    def update_status(self, message: str) -> None:
-        self.query_one("#status-label", Label).update(message)
-
-    def post_message_progress(self, current: float, total: float) -> None:
-        """Update progress bar safely."""
-        self.call_from_thread(self.update_progress, current, total)
-        
-    def update_progress(self, current: float, total: float) -> None:
-        pbar = self.query_one("#progress-bar", ProgressBar)
-        pbar.update(total=total, progress=current)
-
-    def post_message_completed(self) -> None:
-        """Reset UI state safely."""
-        self.call_from_thread(self.reset_ui)
-        
-    def reset_ui(self) -> None:
-        self.query_one("#btn-process", Button).disabled = False
-        self.query_one("#btn-download", Button).disabled = False
-        self.query_one("#btn-transcribe", Button).disabled = False
-        # Keep progress bar visible at 100% or hide it? 
-        # pbar = self.query_one("#progress-bar", ProgressBar)
-        # pbar.display = False
+        self.job_queue.submit(urls, transcribe=event.button.id == "btn-process")
+        url_input.clear()
+        self.refresh_jobs()
+
+    def refresh_jobs(self) -> None:
+        """Bring the jobs table and status line up to date with the queue."""
+        table = self.query_one("#jobs", DataTable)
+        positions = self.job_queue.positions()
+        for job in self.job_queue.jobs():
+            row = job_row(job, positions.get(job.id) if job.stage == QUEUED else None)
+            previous = self._rows.get(job.id)
+            if previous is None:
+                table.add_row(*row, key=str(job.id))
+            else:
+                for column, old, new in zip(COLUMNS, previous, row):
+                    if old != new:
+                        table.update_cell(str(job.id), column, new)
+            self._rows[job.id] = row
+
+        self.query_one("#status-label", Label).update(throughput_summary(self.job_queue.stats()))
+
+    def _selected_job(self) -> int | None:
+        table = self.query_one("#jobs", DataTable)
+        if table.row_count == 0:
+            return None
+        row_key = table.coordinate_to_cell_key(table.cursor_coordinate).row_key
+        assert row_key.value is not None  # Every row is added with its job id as key
+        return int(row_key.value)
+
+    def action_cancel_job(self) -> None:
+        job_id = self._selected_job()
+        if job_id is not None and not self.job_queue.cancel(job_id):
+            logger.warning(f"Job {job_id} has already finished")
+        self.refresh_jobs()
+
+    def action_move_job(self, offset: int) -> None:
+        job_id = self._selected_job()
+        if job_id is not None and not self.job_queue.move(job_id, offset):
+            logger.warning(f"Job {job_id} is not waiting in the queue")
+        self.refresh_jobs()
+
+    def action_run_next(self) -> None:
+        job_id = self._selected_job()
+        position = self.job_queue.position(job_id) if job_id is not None else None
+        if job_id is None or position is None:
+            logger.warning("Only queued jobs can be moved to the front")
+            return
+        self.job_queue.move(job_id, -position)
+        self.refresh_jobs()
 
 
 if __name__ == "__main__":
@@ -1,68 +1,82 @@
 import logging
+import threading
+from collections import deque
+from datetime import datetime
+
 from rich.text import Text
-from textual.widgets import Log
+from textual.widgets import RichLog
+
+from .logger import file_handlers, install_handlers
+
+# Batches are written to the widget at most this often
+TUI_LOG_FPS = 10
+# Lines held between two frames; when the UI falls behind, the oldest are dropped
+TUI_LOG_MAX_PENDING = 2000
+
+LEVEL_STYLES = {
+    logging.DEBUG: "dim",
+    logging.INFO: "green",
+    logging.WARNING: "yellow",
+    logging.ERROR: "red",
+    logging.CRITICAL: "bold red",
+}
 
 
 class TextualLogHandler(logging.Handler):
     """
-    A logging handler that writes to a Textual Log widget.
+    A logging handler that collects lines for a Textual RichLog widget.
+
+    ``emit`` runs on the logging listener thread and only appends a styled
+    line to a buffer. ``drain`` runs on the UI thread a few times a second and
+    writes everything collected since the last frame as one ``Text``.
     """
 
-    def __init__(self, log_widget: Log):
+    def __init__(self, log_widget: RichLog, max_pending: int = TUI_LOG_MAX_PENDING):
         super().__init__()
         self.log_widget = log_widget
-        self.formatter = logging.Formatter("%(message)s")  # Simple format, rich will handle styling
+        self.formatter = logging.Formatter("%(message)s")  # Timestamp and level are added here
+        self._pending: deque[Text] = deque(maxlen=max_pending)
+        self._pending_lock = threading.Lock()
+        self.dropped = 0
 
     def emit(self, record):
         try:
-            msg = self.format(record)
-            
-            # Map log levels to Rich colors/styles
-            style = ""
-            if record.levelno == logging.DEBUG:
-                style = "dim"
-            elif record.levelno == logging.INFO:
-                style = "green"
-            elif record.levelno == logging.WARNING:
-                style = "yellow"
-            elif record.levelno == logging.ERROR:
-                style = "red"
-            elif record.levelno == logging.CRITICAL:
-                style = "bold red"
-
-            # Create a localized timestamp
-            import datetime
-            timestamp = datetime.datetime.fromtimestamp(record.created).strftime("%H:%M:%S")
-            
-            # Construct the log message
-            log_text = Text()
-            log_text.append(f"[{timestamp}] ", style="dim")
-            log_text.append(f"{record.levelname:<8}", style=style)
-            log_text.append(msg)
-
-            # Write safely to the Log widget (must be thread-safe if called from worker)
-            # Textual widgets are generally thread-safe for simple writes, 
-            # but if we are in a different thread, we should use call_from_thread or post_message.
-            # However, `Log.write` schedules the write on the main thread automatically in recent Textual versions.
-            # To be safe and compliant with best practices:
-            self.log_widget.write(log_text)
-            
+            timestamp = datetime.fromtimestamp(record.created).strftime("%H:%M:%S")
+            line = Text()
+            line.append(f"[{timestamp}] ", style="dim")
+            line.append(f"{record.levelname:<8}", style=LEVEL_STYLES.get(record.levelno, ""))
+            line.append(f" {self.format(record)}")
+            with self._pending_lock:
+                if len(self._pending) == self._pending.maxlen:
+                    self.dropped += 1
+                self._pending.append(line)
         except Exception:
             self.handleError(record)
 
+    def drain(self) -> None:
+        """Write the collected lines to the widget; call on the UI thread."""
+        with self._pending_lock:
+            if not self._pending:
+                return
+            lines = list(self._pending)
+            self._pending.clear()
+            dropped, self.dropped = self.dropped, 0
+        if dropped:
+            lines.insert(0, Text(f"... {dropped} earlier log lines dropped", style="dim"))
+        self.log_widget.write(Text("\n").join(lines))
+
 
-def setup_tui_logging(log_widget: Log, level: str = "INFO") -> logging.Logger:
+def setup_tui_logging(
+    log_widget: RichLog,
+    level: str = "INFO",
+    log_file: str | None = None,
+    json_file: str | None = None,
+    rotation_size: int = 10 * 1024 * 1024,
+) -> logging.Logger:
     """
-    Sets up the logger to output to the provided Textual Log widget.
+    Sets up the logger to output to the provided Textual RichLog widget (and
+    the log files, if set) instead of the terminal. Call on the UI thread.
     """
-    logger = logging.getLogger("podcast_ai_agent")
-    logger.setLevel(getattr(logging, level.upper()))
-    
-    # Remove existing handlers to avoid duplicates/conflicts
-    for handler in logger.handlers[:]:
-        logger.removeHandler(handler)
-        
     handler = TextualLogHandler(log_widget)
-    logger.addHandler(handler)
-    
-    return logger
+    log_widget.set_interval(1 / TUI_LOG_FPS, handler.drain)
+    return install_handlers([handler, *file_handlers(log_file, json_file, rotation_size)], level)
@@ -0,0 +1,165 @@
+import contextlib
+import json
+import logging
+import os
+import re
+import threading
+from collections.abc import Iterator
+from pathlib import Path
+from urllib.parse import parse_qsl, urlencode, urlparse, urlunparse
+
+logger = logging.getLogger("podcast_ai_agent")
+
+INDEX_FILE_NAME = ".url_index.jsonl"
+
+_VIDEO_ID_RE = re.compile(r"^[A-Za-z0-9_-]{11}$")
+_YOUTUBE_HOSTS = {"youtube.com", "youtube-nocookie.com"}
+_YOUTUBE_PATH_PREFIXES = ("shorts", "embed", "live", "v", "e")
+_TRACKING_PARAMS = {"si", "feature", "pp", "fbclid", "gclid"}
+
+
+def youtube_video_id(url: str) -> str | None:
+    """Extract the video id from any of the common YouTube URL shapes, without a request."""
+    parsed = urlparse(url.strip())
+    host = (parsed.hostname or "").lower()
+    for prefix in ("www.", "m.", "music."):
+        host = host.removeprefix(prefix)
+
+    segments = [s for s in parsed.path.split("/") if s]
+    video_id = None
+    if host == "youtu.be" and segments:
+        video_id = segments[0]
+    elif host in _YOUTUBE_HOSTS:
+        if parsed.path == "/watch":
+            video_id = dict(parse_qsl(parsed.query)).get("v")
+        elif len(segments) >= 2 and segments[0] in _YOUTUBE_PATH_PREFIXES:
+            video_id = segments[1]
+
+    if video_id and _VIDEO_ID_RE.match(video_id):
+        return video_id
+    return None
+
+
+def canonicalize_url(url: str) -> str:
+    """
+    Normalize a URL so that different spellings of the same video compare equal.
+
+    YouTube watch, youtu.be, shorts, embed and live links all map to the watch URL.
+    Other URLs keep their path but lose the fragment and tracking parameters.
+    """
+    video_id = youtube_video_id(url)
+    if video_id:
+        return f"https://www.youtube.com/watch?v={video_id}"
+
+    parsed = urlparse(url.strip())
+    query = sorted(
+        (k, v)
+        for k, v in parse_qsl(parsed.query, keep_blank_values=True)
+        if k not in _TRACKING_PARAMS and not k.startswith("utm_")
+    )
+    return urlunparse(
+        (
+            parsed.scheme.lower(),
+            parsed.netloc.lower(),
+            parsed.path.rstrip("/") or "/",
+            "",
+            urlencode(query),
+            "",
+        )
+    )
+
+
+class UrlIndex:
+    """
+    Persistent map from canonical URLs to video ids and downloaded files.
+
+    Lets repeated and duplicate URLs resolve to an existing download without
+    contacting the site. Each download is appended as one JSON line, so a
+    batch does not rewrite the whole index per URL; superseded and damaged
+    lines are compacted away the next time the index is loaded. Use
+    ``for_directory`` so that every caller working on the same output
+    directory shares one instance and its locks.
+    """
+
+    _instances: dict[Path, "UrlIndex"] = {}
+    _instances_lock = threading.Lock()
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._lock = threading.Lock()
+        # Lock and number of callers holding or waiting for it, per canonical URL
+        self._url_locks: dict[str, tuple[threading.Lock, int]] = {}
+        self._entries: dict[str, dict[str, str]] = {}
+        if path.exists():
+            self._load()
+
+    @classmethod
+    def for_directory(cls, output_dir: Path) -> "UrlIndex":
+        path = (Path(output_dir) / INDEX_FILE_NAME).resolve()
+        with cls._instances_lock:
+            if path not in cls._instances:
+                cls._instances[path] = cls(path)
+            return cls._instances[path]
+
+    def _load(self) -> None:
+        try:
+            lines = self.path.read_text(encoding="utf-8").splitlines()
+        except OSError as e:
+            logger.warning(f"Ignoring unreadable URL index {self.path}: {e}")
+            return
+
+        for number, line in enumerate(lines, 1):
+            try:
+                record = json.loads(line)
+                self._entries[record["url"]] = {"id": record["id"], "path": record["path"]}
+            except (ValueError, KeyError, TypeError):
+                logger.warning(f"Skipping damaged line {number} of {self.path}")
+        if len(lines) > len(self._entries):
+            self._compact()
+
+    def _compact(self) -> None:
+        """Rewrite the index with one line per URL."""
+        tmp = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        try:
+            with tmp.open("w", encoding="utf-8") as f:
+                for url, entry in self._entries.items():
+                    f.write(json.dumps({"url": url, **entry}) + "\n")
+            os.replace(tmp, self.path)
+        except OSError as e:
+            logger.warning(f"Failed to compact URL index {self.path}: {e}")
+
+    @contextlib.contextmanager
+    def lock_for(self, url: str) -> Iterator[None]:
+        """Hold the lock of a URL while resolving it, so duplicates in a batch download once."""
+        key = canonicalize_url(url)
+        with self._lock:
+            lock, users = self._url_locks.get(key) or (threading.Lock(), 0)
+            self._url_locks[key] = (lock, users + 1)
+        try:
+            with lock:
+                yield
+        finally:
+            # Forget the lock with its last user, so the map does not grow with every URL
+            with self._lock:
+                lock, users = self._url_locks[key]
+                if users == 1:
+                    del self._url_locks[key]
+                else:
+                    self._url_locks[key] = (lock, users - 1)
+
+    def lookup(self, url: str) -> Path | None:
+        with self._lock:
+            entry = self._entries.get(canonicalize_url(url))
+        if entry is None:
+            return None
+        path = Path(entry["path"])
+        return path if path.exists() else None
+
+    def record(self, url: str, video_id: str, path: Path) -> None:
+        entry = {"id": video_id, "path": str(path)}
+        key = canonicalize_url(url)
+        with self._lock:
+            self._entries[key] = entry
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with self.path.open("a", encoding="utf-8") as f:
+                f.write(json.dumps({"url": key, **entry}) + "\n")
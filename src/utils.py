@@ -1,8 +1,27 @@
+import hashlib
+import json
 import re
 import shutil
+import subprocess
+from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
 
 import psutil
+import yaml
+
+from .constants import DEFAULT_RAM_REQUIREMENT_MB, MODEL_RAM_REQUIREMENTS_MB
+
+MODELS_CONFIG_PATH = Path(__file__).parent.parent / "config" / "models.yaml"
+
+
+@dataclass
+class AudioInfo:
+    duration: float | None
+    codec: str | None
+    sample_rate: int | None
+    channels: int | None
+    size_bytes: int
 
 
 def sanitize_filename(filename: str) -> str:
@@ -25,27 +44,104 @@ def validate_model_size(model: str) -> bool:
     return model in valid_models
 
 
-def estimate_ram_requirement(model: str) -> int:
-    requirements = {
-        "tiny": 200,
-        "base": 1000,
-        "small": 2000,
-        "medium": 5000,
-        "large": 8000,
-        "large-v2": 8000,
-        "large-v3": 8000,
-    }
-    return requirements.get(model, 1000)
+@lru_cache(maxsize=1)
+def _model_table() -> dict:
+    try:
+        with MODELS_CONFIG_PATH.open() as f:
+            return (yaml.safe_load(f) or {}).get("models") or {}
+    except (OSError, yaml.YAMLError):
+        return {}
 
 
-def validate_audio_file(path: Path) -> bool:
+def estimate_ram_requirement(model: str) -> int:
+    """
+    Static RAM guess in MB from ``config/models.yaml``, or the built-in table
+    when that file is not there. Only used until the memory governor has
+    measured the model (see ``src.memory``).
+    """
+    entry = _model_table().get(model) or {}
+    if "ram_required_mb" in entry:
+        return int(entry["ram_required_mb"])
+    return MODEL_RAM_REQUIREMENTS_MB.get(model, DEFAULT_RAM_REQUIREMENT_MB)
+
+
+def probe_audio(path: Path, timeout: float = 30) -> AudioInfo | None:
+    """
+    Read duration and stream parameters from the container headers.
+
+    Uses ffprobe, which only reads headers, so the cost does not grow with the
+    length of the episode. Without ffprobe, the first second is decoded instead
+    and the duration is left unknown. Returns None if there is no audio stream.
+    """
+    path = Path(path)
+    if not path.is_file():
+        return None
+
+    if shutil.which("ffprobe") is None:
+        return _probe_audio_partial(path)
+
+    cmd = [
+        "ffprobe",
+        "-v",
+        "error",
+        "-select_streams",
+        "a:0",
+        "-show_entries",
+        "format=duration:stream=codec_name,sample_rate,channels,duration",
+        "-of",
+        "json",
+        str(path),
+    ]
+    try:
+        proc = subprocess.run(cmd, capture_output=True, text=True, timeout=timeout, check=True)
+        data = json.loads(proc.stdout or "{}")
+    except (subprocess.SubprocessError, OSError, ValueError):
+        return None
+
+    streams = data.get("streams") or []
+    if not streams:
+        return None
+    stream = streams[0]
+
+    duration = data.get("format", {}).get("duration") or stream.get("duration")
+    return AudioInfo(
+        duration=float(duration) if duration not in (None, "N/A") else None,
+        codec=stream.get("codec_name"),
+        sample_rate=int(stream["sample_rate"]) if stream.get("sample_rate") else None,
+        channels=stream.get("channels"),
+        size_bytes=path.stat().st_size,
+    )
+
+
+def _probe_audio_partial(path: Path) -> AudioInfo | None:
     try:
         from pydub import AudioSegment
 
-        audio = AudioSegment.from_file(path)
-        return len(audio) > 0
+        audio = AudioSegment.from_file(path, duration=1.0)
     except Exception:
-        return False
+        return None
+    if len(audio) == 0:
+        return None
+    return AudioInfo(
+        duration=None,
+        codec=path.suffix.lstrip(".") or None,
+        sample_rate=audio.frame_rate,
+        channels=audio.channels,
+        size_bytes=path.stat().st_size,
+    )
+
+
+def validate_audio_file(path: Path) -> bool:
+    info = probe_audio(path)
+    return info is not None and (info.duration is None or info.duration > 0)
+
+
+def file_sha256(path: Path, chunk_size: int = 1024 * 1024) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(chunk_size):
+            digest.update(chunk)
+    return digest.hexdigest()
 
 
 def check_disk_space(path: Path, required_gb: float) -> bool:
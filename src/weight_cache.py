@@ -0,0 +1,151 @@
+"""
+Memory-mappable copies of Whisper checkpoints.
+
+``whisper.load_model`` unpickles the fp16 checkpoint into memory and then
+copies it into the fp32 parameters of a freshly initialized model, so a load
+briefly holds the weights twice. The first load of a model writes its fp32
+state dict to a zip checkpoint. Later loads ``torch.load`` it with
+``mmap=True`` and assign the mapped tensors to a model whose own weights were
+never initialized, so nothing is copied. Pages are read from the page cache
+on first use and shared by every process that maps the file.
+"""
+
+import dataclasses
+import logging
+import os
+import pickle
+from collections.abc import Callable
+from pathlib import Path
+
+import torch
+import whisper
+from torch.nn import init
+from torch.overrides import TorchFunctionMode
+from whisper.model import ModelDimensions
+
+from .result_cache import whisper_version
+
+logger = logging.getLogger("podcast_ai_agent")
+
+
+def whisper_cache_dir() -> Path:
+    # Next to Whisper's own checkpoints (see whisper.load_model)
+    default = os.path.join(os.path.expanduser("~"), ".cache")
+    return Path(os.getenv("XDG_CACHE_HOME", default)) / "whisper"
+
+
+def checkpoint_id(name: str) -> str:
+    """
+    Identifies the checkpoint behind ``name``: the SHA-256 Whisper verifies an
+    official download against, or the size and mtime of a checkpoint file.
+    """
+    if name in whisper._MODELS:
+        return whisper._MODELS[name].split("/")[-2][:16]
+    if os.path.isfile(name):
+        stat = os.stat(name)
+        return f"{stat.st_size:x}-{stat.st_mtime_ns:x}"
+    return "local"
+
+
+def mmap_cache_path(name: str) -> Path:
+    """
+    Where the mappable copy of ``name`` is stored; keyed by the checkpoint and
+    the Whisper version, so an upgraded checkpoint gets a fresh copy.
+    """
+    stem = Path(name).stem if os.path.isfile(name) else name
+    file_name = f"{stem}-{checkpoint_id(name)}-fp32-w{whisper_version()}.pt"
+    return whisper_cache_dir() / "mmap" / file_name
+
+
+def save_mappable(model: whisper.Whisper, path: Path) -> None:
+    """Write the fp32 weights of ``model`` as a zip checkpoint whose tensors can be mapped."""
+    checkpoint = {
+        "dims": dataclasses.asdict(model.dims),
+        "model_state_dict": {
+            k: v.detach().float().contiguous() for k, v in model.state_dict().items()
+        },
+    }
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    try:
+        torch.save(checkpoint, tmp_path)
+        os.replace(tmp_path, path)
+    finally:
+        tmp_path.unlink(missing_ok=True)
+
+
+class _SkipWeightInit(TorchFunctionMode):
+    """
+    Leave new Linear, Conv1d and Embedding weights uninitialized.
+
+    ``torch.empty`` does not touch its pages, so a model whose weights are
+    about to be replaced costs neither time nor resident memory. Torch
+    function modes are per thread, so modules created by other threads are
+    initialized as usual. (Building on the meta device is not an option:
+    Whisper makes its alignment heads sparse, which has no meta kernel.)
+    """
+
+    SKIPPED = frozenset(
+        {
+            init.kaiming_uniform_,
+            init.uniform_,
+            init.normal_,
+            torch.Tensor.uniform_,
+            torch.Tensor.normal_,
+        }
+    )
+
+    def __torch_function__(self, func, types, args=(), kwargs=None):
+        kwargs = kwargs or {}
+        if func in self.SKIPPED:
+            return args[0] if args else kwargs["tensor"]
+        return func(*args, **kwargs)
+
+
+# What torch.load raises for a truncated, damaged or foreign file
+UNREADABLE_CHECKPOINT_ERRORS = (OSError, EOFError, RuntimeError, KeyError, pickle.UnpicklingError)
+
+
+def load_mappable(path: Path, name: str) -> whisper.Whisper:
+    """Build a CPU model whose weights are mapped from ``path``."""
+    # torch 2.2 only maps str paths
+    checkpoint = torch.load(str(path), map_location="cpu", mmap=True, weights_only=True)
+    with _SkipWeightInit():
+        model = whisper.Whisper(ModelDimensions(**checkpoint["dims"]))
+    model.load_state_dict(checkpoint["model_state_dict"], assign=True)
+    if name in whisper._ALIGNMENT_HEADS:
+        model.set_alignment_heads(whisper._ALIGNMENT_HEADS[name])
+    return model
+
+
+def load_fast(
+    name: str, device: str, load_checkpoint: Callable[[], whisper.Whisper] | None = None
+) -> whisper.Whisper:
+    """
+    Model ``name`` on ``device``, mapped from its cached copy.
+
+    Without a cached copy, ``load_checkpoint`` (by default Whisper's own CPU
+    loader) is called once and its result is saved for later runs. A
+    damaged copy is replaced; if the copy cannot be written, the loaded model
+    is used as is.
+    """
+    path = mmap_cache_path(name)
+    if path.exists():
+        try:
+            return load_mappable(path, name).to(device)
+        except UNREADABLE_CHECKPOINT_ERRORS as e:
+            logger.warning(f"Discarding unreadable model copy {path}: {e}")
+
+    if load_checkpoint is None:
+        load_checkpoint = lambda: whisper.load_model(name, device="cpu")  # noqa: E731
+    model = load_checkpoint()
+    try:
+        save_mappable(model, path)
+    except (OSError, RuntimeError) as e:
+        logger.warning(f"Could not cache a mappable copy of {name} at {path}: {e}")
+        return model if device == "cpu" else model.to(device)
+
+    logger.info(f"Cached a mappable copy of the {name} model in {path.parent}")
+    # Swap the private copy for the shared mapping
+    del model
+    return load_mappable(path, name).to(device)
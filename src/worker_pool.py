@@ -0,0 +1,245 @@
+import logging
+import multiprocessing
+import os
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
+from logging.handlers import QueueHandler, QueueListener
+from pathlib import Path
+
+import numpy as np
+import torch
+
+from . import memory
+from .config import CacheConfig, MemoryConfig, WhisperConfig
+from .output import OutputWriter
+from .transcriber import Transcriber
+
+logger = logging.getLogger("podcast_ai_agent")
+
+# Set in each worker process by _init_worker
+_transcriber: Transcriber | None = None
+
+
+def partition_cpus(workers: int, threads_per_worker: int) -> list[list[int]]:
+    """Split the CPUs available to this process into one contiguous set per worker."""
+    if hasattr(os, "sched_getaffinity"):
+        cpus = sorted(os.sched_getaffinity(0))
+    else:
+        cpus = list(range(os.cpu_count() or 1))
+
+    partitions = []
+    for i in range(workers):
+        chunk = cpus[i * threads_per_worker : (i + 1) * threads_per_worker]
+        partitions.append(chunk or cpus)
+    return partitions
+
+
+def _start_method() -> str:
+    # Workers are started from pipeline, daemon and TUI threads. Forking a
+    # multithreaded process can copy locks held by other threads (logging,
+    # torch, the model registry) and does not work with CUDA, so workers
+    # start from a clean interpreter instead.
+    methods = multiprocessing.get_all_start_methods()
+    return "forkserver" if "forkserver" in methods else "spawn"
+
+
+class _ParentLogHandler(logging.Handler):
+    """Hands records from worker processes to this process's logger."""
+
+    def emit(self, record):
+        logging.getLogger(record.name).handle(record)
+
+
+def _init_worker(
+    config: WhisperConfig,
+    cache: CacheConfig | None,
+    threads: int,
+    partitions,
+    counter,
+    memory_config: MemoryConfig,
+    log_queue,
+    log_level: int,
+) -> None:
+    global _transcriber
+
+    with counter.get_lock():
+        index = counter.value
+        counter.value += 1
+
+    logger.setLevel(log_level)
+    logger.addHandler(QueueHandler(log_queue))
+    memory.configure(memory_config)
+
+    torch.set_num_threads(threads)
+    if partitions and hasattr(os, "sched_setaffinity"):
+        os.sched_setaffinity(0, partitions[index % len(partitions)])
+
+    _transcriber = Transcriber(config, cache)
+    _transcriber._load_model()
+
+
+def _worker_transcriber() -> Transcriber:
+    assert _transcriber is not None, "not running in a pool worker"
+    return _transcriber
+
+
+def _ping() -> int:
+    return os.getpid()
+
+
+def _transcribe(audio_path: str) -> dict:
+    return _worker_transcriber().transcribe(Path(audio_path))
+
+
+def _transcribe_to_files(audio_path: str, writer: OutputWriter, formats: list[str]) -> list[Path]:
+    return _worker_transcriber().transcribe_to_files(Path(audio_path), writer, formats)
+
+
+def _transcribe_audio(audio: np.ndarray) -> dict:
+    transcriber = _worker_transcriber()
+    return transcriber._decode(transcriber._load_model(), audio)
+
+
+class TranscriptionPool:
+    """
+    Pool of transcription processes sharing one copy of the model weights.
+
+    Workers are started with ``forkserver`` (``spawn`` where it is not
+    available), never forked from the caller. With more than one worker the
+    pool always uses ``fast_load``: the parent writes the mappable copy of the
+    weights once and every worker maps it, so fp32 weights are held once in
+    the page cache instead of once per process. Each worker gets its own
+    intra-op thread count and, optionally, its own slice of CPUs. Worker log
+    records are passed back to this process's logger.
+
+    Only as many workers are started as the memory governor expects to fit,
+    each decoding ``audio_seconds`` of audio (the longest duration measured
+    so far when not given) and, when its weights cannot be mapped (fp16,
+    int8), holding its own copy of the model.
+    """
+
+    def __init__(
+        self,
+        config: WhisperConfig,
+        cache: CacheConfig | None = None,
+        workers: int | None = None,
+        audio_seconds: float | None = None,
+    ):
+        self.config = config
+        self.cache = cache
+        self.workers = max(1, workers or config.workers)
+        self.audio_seconds = audio_seconds
+        self._executor: ProcessPoolExecutor | None = None
+        self._log_listener: QueueListener | None = None
+
+    @property
+    def threads_per_worker(self) -> int:
+        return self.config.threads_per_worker or max(1, (os.cpu_count() or 1) // self.workers)
+
+    def start(self) -> "TranscriptionPool":
+        if self._executor is not None:
+            return self
+
+        if self.workers > 1 and not self.config.fast_load:
+            self.config = self.config.model_copy(update={"fast_load": True})
+        transcriber = Transcriber(self.config)
+        key = transcriber._model_key()
+        governor = memory.get_governor()
+        if self.config.fast_load:
+            # Writes the mappable copy once, before the workers map it
+            transcriber._load_model()
+        # Only fp32 weights are used straight from the mapping; fp16 and int8
+        # models are converted into memory private to each worker
+        model_mb = 0.0 if self.config.fast_load and key[2] == "fp32" else governor.load_mb(key)
+        fitting = governor.workers_that_fit(key, self.workers, self.audio_seconds, model_mb)
+        if fitting < self.workers:
+            logger.warning(
+                f"Starting {fitting} of {self.workers} transcription workers; "
+                f"more would not fit in available memory"
+            )
+            self.workers = fitting
+
+        partitions = (
+            partition_cpus(self.workers, self.threads_per_worker)
+            if self.config.cpu_affinity
+            else None
+        )
+        context = multiprocessing.get_context(_start_method())
+        log_queue = context.Queue()
+        self._log_listener = QueueListener(log_queue, _ParentLogHandler())
+        self._log_listener.start()
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=context,
+            initializer=_init_worker,
+            initargs=(
+                self.config,
+                self.cache,
+                self.threads_per_worker,
+                partitions,
+                context.Value("i", 0),
+                governor.config(),
+                log_queue,
+                logger.getEffectiveLevel(),
+            ),
+        )
+
+        # Start every worker now, so a failing model load surfaces here
+        try:
+            for future in [self._executor.submit(_ping) for _ in range(self.workers)]:
+                future.result()
+        except BaseException:
+            self.close()
+            raise
+        logger.info(
+            f"Started {self.workers} transcription workers with "
+            f"{self.threads_per_worker} threads each"
+        )
+        return self
+
+    def _running(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self.start()
+        assert self._executor is not None
+        return self._executor
+
+    def transcribe(self, audio_path: Path) -> dict:
+        return self._running().submit(_transcribe, str(audio_path)).result()
+
+    def transcribe_to_files(
+        self, audio_path: Path, writer: OutputWriter, formats: list[str]
+    ) -> list[Path]:
+        future = self._running().submit(_transcribe_to_files, str(audio_path), writer, formats)
+        return future.result()
+
+    def map_audio(
+        self,
+        chunks: list[np.ndarray],
+        on_result: Callable[[int, dict], None] | None = None,
+    ) -> list[dict]:
+        """
+        Transcribe decoded audio arrays in parallel, preserving their order.
+
+        ``on_result`` is called with each chunk's index and result as soon as
+        that chunk and all chunks before it have finished.
+        """
+        results = []
+        for index, result in enumerate(self._running().map(_transcribe_audio, chunks)):
+            results.append(result)
+            if on_result is not None:
+                on_result(index, result)
+        return results
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        if self._log_listener is not None:
+            self._log_listener.stop()
+            self._log_listener = None
+
+    def __enter__(self) -> "TranscriptionPool":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.close()
@@ -1,7 +1,44 @@
-
 import pytest
 
+from src import memory
 from src.config import Config
+from src.logger import stop_logging
+from src.model_cache import get_registry
+
+
+@pytest.fixture(autouse=True)
+def clear_model_registry():
+    get_registry().clear()
+    yield
+    get_registry().clear()
+
+
+@pytest.fixture(autouse=True)
+def reset_logging():
+    """Flush and remove handlers set up by a test before its captured streams close."""
+    yield
+    stop_logging()
+
+
+@pytest.fixture(autouse=True)
+def isolate_model_caches(tmp_path, monkeypatch):
+    """Keep quantized and mappable model copies out of ~/.cache/whisper."""
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "xdg-cache"))
+
+
+@pytest.fixture(autouse=True)
+def isolate_memory_governor(tmp_path, monkeypatch):
+    """Fresh governor per test that fails fast and never touches ~/.cache."""
+    governor = memory.MemoryGovernor(wait_seconds=0)
+    monkeypatch.setattr(memory, "_governor", governor)
+    configure = memory.MemoryGovernor.configure
+    overrides = {"measurements": tmp_path / "memory.json", "wait_seconds": 0}
+    monkeypatch.setattr(
+        governor,
+        "configure",
+        lambda config: configure(governor, config.model_copy(update=overrides)),
+    )
+    return governor
 
 
 @pytest.fixture
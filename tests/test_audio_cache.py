@@ -0,0 +1,48 @@
+import os
+from unittest.mock import patch
+
+import numpy as np
+
+from src.audio_cache import AudioCache
+
+
+def _audio_file(tmp_path, name, content):
+    path = tmp_path / name
+    path.write_bytes(content)
+    return path
+
+
+@patch("src.audio_cache.load_audio")
+def test_audio_cache_decodes_once(mock_load_audio, tmp_path):
+    mock_load_audio.return_value = np.zeros(16000, dtype=np.float32)
+    audio_path = _audio_file(tmp_path, "episode.mp3", b"episode")
+    cache = AudioCache(tmp_path / ".cache", max_mb=10)
+
+    first = cache.load(audio_path)
+    second = cache.load(audio_path)
+
+    mock_load_audio.assert_called_once()
+    assert isinstance(second, np.memmap)
+    assert second.dtype == np.float32
+    assert np.array_equal(first, second)
+    assert len(list(cache.directory.glob("*.npy"))) == 1
+    # Nothing is written next to the audio
+    assert sorted(p.name for p in tmp_path.iterdir()) == [".cache", "episode.mp3"]
+
+
+@patch("src.audio_cache.load_audio")
+def test_audio_cache_evicts_oldest_entries(mock_load_audio, tmp_path):
+    # Each entry is ~0.6 MB, so a 1 MB cap holds only one of them
+    mock_load_audio.return_value = np.zeros(160000, dtype=np.float32)
+    cache = AudioCache(tmp_path / ".cache", max_mb=1)
+
+    old = _audio_file(tmp_path, "old.mp3", b"old")
+    cache.load(old)
+    old_entry = next(cache.directory.glob("*.npy"))
+    os.utime(old_entry, (0, 0))
+
+    cache.load(_audio_file(tmp_path, "new.mp3", b"new"))
+
+    entries = list(cache.directory.glob("*.npy"))
+    assert len(entries) == 1
+    assert entries[0] != old_entry
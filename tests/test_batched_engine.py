@@ -0,0 +1,143 @@
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import torch
+import whisper
+from whisper.model import ModelDimensions, Whisper
+from whisper.tokenizer import get_tokenizer
+
+from src.config import WhisperConfig
+from src.transcriber import BatchedEngine, Transcriber
+from src.utils import AudioInfo
+
+
+def _tiny_random_model(n_vocab: int = 51865) -> Whisper:
+    torch.manual_seed(0)
+    dims = ModelDimensions(
+        n_mels=80,
+        n_audio_ctx=1500,
+        n_audio_state=32,
+        n_audio_head=2,
+        n_audio_layer=1,
+        n_vocab=n_vocab,
+        n_text_ctx=448,
+        n_text_state=32,
+        n_text_head=2,
+        n_text_layer=1,
+    )
+    return Whisper(dims).eval()
+
+
+def test_split_tokens_at_timestamps():
+    tokenizer = get_tokenizer(True, language="en", task="transcribe")
+    ts = tokenizer.timestamp_begin
+    hello = tokenizer.encode(" Hello")
+    world = tokenizer.encode(" world")
+    tokens = [ts, *hello, ts + 100, ts + 100, *world, ts + 250, tokenizer.eot]
+
+    segments = list(BatchedEngine._split_tokens(tokens, tokenizer, duration=27.0))
+
+    assert [(s, e) for s, e, _ in segments] == [(0.0, 2.0), (2.0, 5.0)]
+    assert tokenizer.decode(segments[1][2]) == " world"
+
+
+def test_engine_batches_windows_across_files():
+    model = _tiny_random_model()
+    engine = BatchedEngine(model, batch_size=4, language="en")
+    rng = np.random.default_rng(0)
+    audios = [
+        (0.1 * rng.standard_normal(16000 * 40)).astype(np.float32),
+        (0.1 * rng.standard_normal(16000 * 10)).astype(np.float32),
+    ]
+
+    with (
+        patch.object(BatchedEngine, "_needs_fallback", return_value=False),
+        patch("src.transcriber.whisper.decode", wraps=whisper.decode) as mock_decode,
+        torch.no_grad(),
+    ):
+        results = engine.transcribe_many(audios)
+
+    # Two windows from the first file and one from the second share one batch
+    assert mock_decode.call_count == 1
+    assert mock_decode.call_args.args[1].shape[0] == 3
+    assert len(results) == 2
+    for result in results:
+        assert set(result) == {"text", "segments", "language"}
+        assert result["language"] == "en"
+        assert [s["id"] for s in result["segments"]] == list(range(len(result["segments"])))
+
+
+@patch("src.transcriber.whisper.load_model")
+@patch("src.transcriber.probe_audio")
+@patch("src.transcriber.BatchedEngine.transcribe")
+def test_transcriber_uses_batched_engine(mock_engine, mock_probe, mock_load_model, tmp_path):
+    mock_engine.return_value = {"text": "batched", "segments": [], "language": "en"}
+    mock_probe.return_value = AudioInfo(1.0, "mp3", 44100, 2, 1024)
+    mock_load_model.return_value = MagicMock()
+    audio_path = tmp_path / "test.mp3"
+    audio_path.touch()
+
+    with patch("src.transcriber.whisper.audio.load_audio", return_value=np.zeros(16000)):
+        result = Transcriber(WhisperConfig(engine="batched")).transcribe(audio_path)
+
+    assert result["text"] == "batched"
+    mock_load_model.return_value.transcribe.assert_not_called()
+
+
+def test_engine_reports_progress_per_batch():
+    model = _tiny_random_model()
+    updates = []
+    engine = BatchedEngine(
+        model, batch_size=1, language="en", on_progress=lambda s, n: updates.append(s)
+    )
+    audio = np.zeros(16000 * 40, dtype=np.float32)
+
+    with patch.object(BatchedEngine, "_needs_fallback", return_value=False), torch.no_grad():
+        engine.transcribe(audio)
+
+    assert len(updates) == 2
+    assert updates[-1] == 40.0
+
+
+def test_engine_detects_the_language_of_each_file():
+    model = _tiny_random_model()
+    engine = BatchedEngine(model, batch_size=4)
+    rng = np.random.default_rng(0)
+    audios = [
+        (0.1 * rng.standard_normal(16000 * 40)).astype(np.float32),
+        (0.1 * rng.standard_normal(16000 * 10)).astype(np.float32),
+    ]
+    # Called once per file, on that file's first window
+    detections = [(None, [{"en": 0.9, "de": 0.1}]), (None, [{"en": 0.2, "de": 0.8}])]
+
+    with (
+        patch.object(BatchedEngine, "_needs_fallback", return_value=False),
+        patch.object(model, "detect_language", side_effect=detections) as mock_detect,
+        patch("src.transcriber.whisper.decode", wraps=whisper.decode) as mock_decode,
+        torch.no_grad(),
+    ):
+        results = engine.transcribe_many(audios)
+
+    assert mock_detect.call_count == 2
+    assert [r["language"] for r in results] == ["en", "de"]
+    # The mixed batch is decoded once per language
+    decoded = {call.args[2].language: call.args[1].shape[0] for call in mock_decode.call_args_list}
+    assert decoded == {"en": 2, "de": 1}
+
+
+def test_engine_decodes_english_only_models_as_english():
+    # The vocabulary size of the .en models, which have no language tokens
+    model = _tiny_random_model(n_vocab=51864)
+    assert not model.is_multilingual
+    engine = BatchedEngine(model, batch_size=4)
+    audio = (0.1 * np.random.default_rng(0).standard_normal(16000 * 5)).astype(np.float32)
+
+    with (
+        patch.object(BatchedEngine, "_needs_fallback", return_value=False),
+        patch.object(model, "detect_language", wraps=model.detect_language) as mock_detect,
+        torch.no_grad(),
+    ):
+        result = engine.transcribe(audio)
+
+    mock_detect.assert_not_called()
+    assert result["language"] == "en"
@@ -0,0 +1,121 @@
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+
+from src.chunking import SAMPLE_RATE, find_split_points, merge_results, split_audio
+from src.config import WhisperConfig
+from src.output import OutputWriter
+from src.transcriber import Transcriber
+from src.utils import AudioInfo
+
+
+def _speech_with_pauses(seconds: int, pauses: list) -> np.ndarray:
+    t = np.arange(seconds * SAMPLE_RATE) / SAMPLE_RATE
+    audio = (0.5 * np.sin(2 * np.pi * 220 * t)).astype(np.float32)
+    for start, end in pauses:
+        audio[int(start * SAMPLE_RATE) : int(end * SAMPLE_RATE)] = 0
+    return audio
+
+
+def test_split_points_land_in_pauses():
+    pauses = [(55, 56), (118, 119)]
+    audio = _speech_with_pauses(180, pauses)
+
+    points = find_split_points(audio, chunk_seconds=60, search_seconds=10)
+
+    assert len(points) == 2
+    for point, (start, end) in zip(points, pauses):
+        assert start * SAMPLE_RATE <= point <= end * SAMPLE_RATE
+
+
+def test_split_audio_covers_every_sample():
+    audio = np.arange(100, dtype=np.float32)
+
+    chunks = split_audio(audio, [30, 70], sample_rate=10)
+
+    assert [offset for offset, _ in chunks] == [0.0, 3.0, 7.0]
+    assert np.array_equal(np.concatenate([c for _, c in chunks]), audio)
+
+
+def test_merge_results_shifts_timestamps_and_renumbers(tmp_path):
+    chunks = [
+        (
+            0.0,
+            {
+                "text": " Hello",
+                "language": "en",
+                "segments": [
+                    {"id": 0, "start": 0.0, "end": 2.0, "text": " Hello"},
+                ],
+            },
+        ),
+        (
+            60.0,
+            {
+                "text": " world",
+                "language": "en",
+                "segments": [
+                    {
+                        "id": 0,
+                        "start": 1.0,
+                        "end": 3.5,
+                        "text": " world",
+                        "words": [{"word": " world", "start": 1.0, "end": 3.5}],
+                    },
+                ],
+            },
+        ),
+    ]
+
+    merged = merge_results(chunks)
+
+    assert merged["text"] == "Hello world"
+    assert merged["language"] == "en"
+    assert [s["id"] for s in merged["segments"]] == [0, 1]
+    assert merged["segments"][1]["start"] == 61.0
+    assert merged["segments"][1]["words"][0]["end"] == 63.5
+
+    srt = OutputWriter(tmp_path / "episode").write_srt(merged["segments"])
+    assert "00:01:01,000 --> 00:01:03,500" in srt.read_text()
+
+
+@patch("src.transcriber.whisper.load_model")
+@patch("src.transcriber.probe_audio")
+@patch("src.transcriber.whisper.audio.load_audio")
+def test_transcriber_chunked_mode(mock_load_audio, mock_probe, mock_load_model, tmp_path):
+    mock_load_audio.return_value = _speech_with_pauses(180, [(59, 61), (119, 121)])
+    mock_probe.return_value = AudioInfo(180.0, "mp3", 44100, 2, 1024)
+    mock_model = MagicMock()
+    mock_model.transcribe.return_value = {
+        "text": " chunk",
+        "language": "en",
+        "segments": [{"id": 0, "start": 0.5, "end": 1.5, "text": " chunk"}],
+    }
+    mock_load_model.return_value = mock_model
+
+    audio_path = tmp_path / "long.mp3"
+    audio_path.touch()
+    config = WhisperConfig(chunk_seconds=60, chunk_workers=1)
+
+    result = Transcriber(config).transcribe(audio_path)
+
+    assert mock_model.transcribe.call_count == 3
+    assert [s["id"] for s in result["segments"]] == [0, 1, 2]
+    assert result["segments"][1]["start"] > 60
+
+
+@patch("src.worker_pool.TranscriptionPool")
+def test_chunk_workers_are_started_once_per_transcriber(mock_pool):
+    pool = mock_pool.return_value.start.return_value
+    pool.map_audio.side_effect = lambda chunks, on_result: [
+        {"text": "", "segments": []} for _ in chunks
+    ]
+    audio = _speech_with_pauses(180, [(59, 61), (119, 121)])
+
+    with Transcriber(WhisperConfig(chunk_seconds=60, chunk_workers=2)) as transcriber:
+        transcriber._transcribe_chunked(audio)
+        transcriber._transcribe_chunked(audio)
+
+    mock_pool.assert_called_once()
+    assert pool.map_audio.call_count == 2
+    pool.close.assert_called_once()
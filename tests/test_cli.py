@@ -0,0 +1,40 @@
+import subprocess
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+from typer.testing import CliRunner
+
+from src.cli import app
+
+REPO_ROOT = Path(__file__).parent.parent
+
+
+def test_help_does_not_import_heavy_modules():
+    # A fresh interpreter: this test process has already imported torch
+    script = (
+        "import sys\n"
+        "from typer.testing import CliRunner\n"
+        "from src.cli import app\n"
+        "result = CliRunner().invoke(app, ['--help'])\n"
+        "assert result.exit_code == 0, result.output\n"
+        "print(','.join(m for m in ('torch', 'whisper', 'yt_dlp') if m in sys.modules))\n"
+    )
+    completed = subprocess.run(
+        [sys.executable, "-c", script], cwd=REPO_ROOT, capture_output=True, text=True, check=False
+    )
+
+    assert completed.returncode == 0, completed.stderr
+    assert completed.stdout.strip() == ""
+
+
+def test_tui_caches_under_the_output_directory(tmp_path):
+    config_path = tmp_path / "config.yaml"
+    config_path.write_text(f"output:\n  directory: {tmp_path / 'out'}\n")
+
+    with patch("src.tui.PodcastAgentApp") as mock_app:
+        result = CliRunner().invoke(app, ["tui", "-c", str(config_path)])
+
+    assert result.exit_code == 0, result.output
+    config = mock_app.call_args.args[0]
+    assert config.cache.directory == tmp_path / "out" / ".cache"
@@ -0,0 +1,20 @@
+import pytest
+from pydantic import ValidationError
+
+from src.config import Config, OutputConfig
+
+
+def test_output_format_accepts_string_list_and_comma_separated():
+    assert OutputConfig().format == ["txt"]
+    assert OutputConfig(format="srt").format == ["srt"]
+    assert OutputConfig(format="txt, srt,txt").format == ["txt", "srt"]
+    assert OutputConfig(format=["vtt", "json"]).format == ["vtt", "json"]
+
+
+def test_output_format_rejects_unknown(tmp_path):
+    with pytest.raises(ValidationError):
+        OutputConfig(format="txt,docx")
+
+    config_path = tmp_path / "config.yaml"
+    config_path.write_text("output:\n  format: [txt, srt]\n")
+    assert Config.from_yaml(config_path).output.format == ["txt", "srt"]
@@ -1,8 +1,13 @@
+import http.server
+import threading
+import time
 from unittest.mock import patch
 
+import pytest
 
+from src import downloader
 from src.config import DownloadConfig
-from src.downloader import download_audio
+from src.downloader import NetworkTimeoutError, RateLimitError, download_audio
 
 
 def test_download_audio_success(tmp_path, mock_ydl):
@@ -18,13 +23,13 @@ def test_download_audio_success(tmp_path, mock_ydl):
 def test_download_audio_fallback(tmp_path):
     config = DownloadConfig()
     output_dir = tmp_path / "downloads"
-    
+
     with patch("yt_dlp.YoutubeDL") as mock_ydl:
         mock_ydl.return_value.__enter__.return_value.extract_info.return_value = {
             "title": "Fallback Video",
             "ext": "mp3",
         }
-        
+
         result = download_audio("http://test.com/video", output_dir, config)
         assert result == output_dir / "Fallback Video.mp3"
 
@@ -45,3 +50,147 @@ def test_download_audio_existing(tmp_path):
 
         result = download_audio("http://test.com/video", output_dir, config)
         assert result == existing_file
+
+
+def test_download_extracts_once(tmp_path, mock_ydl):
+    config = DownloadConfig()
+    output_dir = tmp_path / "downloads"
+
+    download_audio("http://test.com/video", output_dir, config)
+
+    ydl = mock_ydl.return_value.__enter__.return_value
+    assert mock_ydl.call_count == 1
+    ydl.extract_info.assert_called_once()
+    ydl.process_ie_result.assert_called_once()
+    ydl.download.assert_not_called()
+
+
+def test_download_duplicate_urls_resolve_offline(tmp_path, mock_ydl):
+    config = DownloadConfig()
+    output_dir = tmp_path / "downloads"
+    output_dir.mkdir(parents=True)
+    (output_dir / "video_123.mp3").touch()
+
+    first = download_audio("https://test.com/video?utm_source=feed", output_dir, config)
+    second = download_audio("https://TEST.com/video/", output_dir, config)
+
+    assert first == second == output_dir / "video_123.mp3"
+    assert mock_ydl.call_count == 1
+
+
+def test_download_known_youtube_id_skips_network(tmp_path, mock_ydl):
+    config = DownloadConfig()
+    output_dir = tmp_path / "downloads"
+    output_dir.mkdir(parents=True)
+    (output_dir / "dQw4w9WgXcQ.mp3").touch()
+
+    result = download_audio("https://youtu.be/dQw4w9WgXcQ?si=abc", output_dir, config)
+
+    assert result == output_dir / "dQw4w9WgXcQ.mp3"
+    mock_ydl.assert_not_called()
+
+
+def test_download_native_codec_keeps_original_stream(tmp_path, mock_ydl):
+    config = DownloadConfig(codec="native")
+    output_dir = tmp_path / "downloads"
+    ydl = mock_ydl.return_value.__enter__.return_value
+    ydl.process_ie_result.return_value = {
+        "requested_downloads": [{"filepath": str(output_dir / "video_123.webm")}]
+    }
+
+    result = download_audio("http://test.com/video", output_dir, config)
+
+    assert result == output_dir / "video_123.webm"
+    ydl_opts = mock_ydl.call_args.args[0]
+    assert ydl_opts["postprocessors"] == []
+
+
+def test_download_native_codec_finds_existing_file(tmp_path, mock_ydl):
+    config = DownloadConfig(codec="native")
+    output_dir = tmp_path / "downloads"
+    output_dir.mkdir(parents=True)
+    (output_dir / "dQw4w9WgXcQ.txt").touch()
+    (output_dir / "dQw4w9WgXcQ.m4a").touch()
+
+    result = download_audio("https://youtu.be/dQw4w9WgXcQ", output_dir, config)
+
+    assert result == output_dir / "dQw4w9WgXcQ.m4a"
+    mock_ydl.assert_not_called()
+
+
+@pytest.fixture(autouse=True)
+def fresh_host_limiters():
+    downloader._limiters.clear()
+    yield
+    downloader._limiters.clear()
+
+
+@pytest.fixture
+def audio_server():
+    """Local HTTP stand-in that answers the first ``throttle`` requests with a 429."""
+    state = {"throttle": 1, "retry_after": "1", "requests": 0}
+    body = b"\xff\xfb" + bytes(4096)
+
+    class Handler(http.server.BaseHTTPRequestHandler):
+        def do_GET(self):
+            state["requests"] += 1
+            if state["requests"] <= state["throttle"]:
+                self.send_response(429)
+                self.send_header("Retry-After", state["retry_after"])
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            self.send_response(200)
+            self.send_header("Content-Type", "audio/mpeg")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    state["url"] = f"http://127.0.0.1:{server.server_port}/episode.mp3"
+    yield state
+    server.shutdown()
+    server.server_close()
+
+
+def test_download_honors_retry_after(tmp_path, audio_server):
+    config = DownloadConfig(codec="native", retry_backoff_max=0)
+    output_dir = tmp_path / "downloads"
+
+    started = time.monotonic()
+    result = download_audio(audio_server["url"], output_dir, config)
+
+    assert time.monotonic() - started >= 1.0
+    assert result == output_dir / "episode.mp3"
+    assert result.stat().st_size == 4098
+    limiter = downloader.host_limiter(audio_server["url"], config)
+    assert limiter.limit == config.host_concurrency // 2
+
+
+def test_download_raises_rate_limit_after_retries(tmp_path, audio_server):
+    audio_server["throttle"] = 10
+    audio_server["retry_after"] = "0"
+    config = DownloadConfig(codec="native", retries=2, retry_backoff_max=0)
+
+    with pytest.raises(RateLimitError) as excinfo:
+        download_audio(audio_server["url"], tmp_path / "downloads", config)
+
+    assert excinfo.value.retry_after == 0
+    assert audio_server["requests"] == 3
+
+
+def test_download_raises_timeouts_without_retrying(tmp_path):
+    config = DownloadConfig(retries=3)
+
+    with patch("src.downloader._download", side_effect=NetworkTimeoutError("timed out")) as run:
+        with pytest.raises(NetworkTimeoutError):
+            download_audio("http://test.com/video", tmp_path / "downloads", config)
+
+    run.assert_called_once()
+    # A timeout is not the host throttling us, so the limit is left alone
+    limiter = downloader.host_limiter("http://test.com/video", config)
+    assert limiter.limit == config.host_concurrency
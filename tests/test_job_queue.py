@@ -0,0 +1,208 @@
+import asyncio
+import threading
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from src.config import Config
+from src.job_queue import (
+    CANCELLED,
+    DONE,
+    FAILED,
+    QUEUED,
+    TRANSCRIBING,
+    JobQueue,
+    QueuedJob,
+    parse_urls,
+    run_job,
+)
+from src.transcriber import TranscriptionProgress
+from src.tui import PodcastAgentApp, format_rate
+
+URLS = [
+    "https://www.youtube.com/watch?v=aaaaaaaaaaa",
+    "https://www.youtube.com/watch?v=bbbbbbbbbbb",
+    "https://www.youtube.com/watch?v=ccccccccccc",
+]
+
+
+@pytest.fixture
+def config(tmp_path):
+    config = Config()
+    config.output.directory = tmp_path / "output"
+    config.cache.results_enabled = False
+    return config
+
+
+class GatedRunner:
+    """Runs jobs only as far as the test releases them."""
+
+    def __init__(self):
+        self.order = []
+        self.started = threading.Semaphore(0)
+        self.release = threading.Event()
+
+    def __call__(self, config, job):
+        self.order.append(job.url)
+        job.report(stage=TRANSCRIBING, realtime_factor=0.5)
+        self.started.release()
+        while not self.release.wait(0.01):
+            job.report()
+        job.report(audio_seconds=60.0)
+        return [Path(f"{job.id}.txt")]
+
+
+def wait_until(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.01)
+
+
+def stages(queue):
+    return [job.stage for job in queue.jobs()]
+
+
+def test_parse_urls_accepts_pasted_batches():
+    text = f"  {URLS[0]}\n\n# later\n{URLS[1]} {URLS[2]}\n"
+    assert parse_urls(text) == URLS
+
+
+def test_jobs_run_in_order_on_several_workers(config):
+    runner = GatedRunner()
+    queue = JobQueue(config, workers=2, runner=runner)
+    try:
+        queue.submit(URLS)
+        for _ in range(2):
+            assert runner.started.acquire(timeout=5)
+        assert stages(queue) == [TRANSCRIBING, TRANSCRIBING, QUEUED]
+        assert queue.stats()["audio_seconds_per_second"] == pytest.approx(4.0)
+
+        runner.release.set()
+        wait_until(lambda: stages(queue) == [DONE] * 3)
+        assert runner.order[2] == URLS[2]
+        assert queue.jobs()[0].output_paths == [Path("1.txt")]
+        assert queue.stats()["audio_seconds_done"] == 180.0
+    finally:
+        queue.close()
+
+
+def test_queued_jobs_can_be_reordered_and_cancelled(config):
+    runner = GatedRunner()
+    queue = JobQueue(config, workers=1, runner=runner)
+    try:
+        jobs = queue.submit(URLS)
+        assert runner.started.acquire(timeout=5)
+
+        assert queue.move(jobs[2].id, -1)
+        assert queue.position(jobs[2].id) == 0
+        assert queue.positions() == {jobs[2].id: 0, jobs[1].id: 1}
+        assert not queue.move(jobs[0].id, 1)
+
+        assert queue.cancel(jobs[1].id)
+        assert queue.position(jobs[1].id) is None
+        assert stages(queue)[1] == CANCELLED
+
+        runner.release.set()
+        wait_until(lambda: queue.stats()[DONE] == 2)
+        assert runner.order == [URLS[0], URLS[2]]
+        assert not queue.cancel(jobs[0].id)
+    finally:
+        queue.close()
+
+
+def test_running_job_stops_at_its_next_report(config):
+    runner = GatedRunner()
+    queue = JobQueue(config, workers=1, runner=runner)
+    try:
+        job, _ = queue.submit(URLS[:2])
+        assert runner.started.acquire(timeout=5)
+
+        assert queue.cancel(job.id)
+        # The worker moves on to the next job
+        assert runner.started.acquire(timeout=5)
+        assert stages(queue) == [CANCELLED, TRANSCRIBING]
+    finally:
+        queue.close()
+
+
+def test_failed_job_keeps_its_error(config):
+    def runner(config, job):
+        raise RuntimeError("no audio")
+
+    queue = JobQueue(config, workers=1, runner=runner)
+    try:
+        queue.submit(URLS[:1])
+        wait_until(lambda: queue.jobs()[0].done)
+        job = queue.jobs()[0]
+        assert (job.stage, job.error) == (FAILED, "no audio")
+    finally:
+        queue.close()
+
+
+def test_run_job_reports_download_and_transcription_progress(config):
+    seen = []
+
+    def fake_download(url, output_dir, config, progress_hook=None):
+        progress_hook(
+            {"status": "downloading", "downloaded_bytes": 50, "total_bytes": 100, "speed": 2048.0}
+        )
+        path = Path(output_dir) / "a.mp3"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.touch()
+        return path
+
+    def fake_transcribe(self, audio_path, progress_callback=None, **kwargs):
+        progress_callback(TranscriptionProgress(30.0, 60.0, 15.0))
+        return {"text": "hello", "segments": []}
+
+    job = QueuedJob(1, URLS[0])
+    original_report = job.report
+
+    def recording_report(**fields):
+        original_report(**fields)
+        seen.append(job.snapshot())
+
+    job.report = recording_report
+    with (
+        patch("src.jobs.download_audio", side_effect=fake_download),
+        patch("src.transcriber.Transcriber.transcribe", fake_transcribe),
+    ):
+        outputs = run_job(config, job)
+
+    assert outputs and outputs[0].exists()
+    assert (seen[0].percent, seen[0].bytes_per_second) == (25.0, 2048.0)
+    assert (seen[-1].percent, seen[-1].realtime_factor) == (75.0, 0.5)
+
+
+def test_format_rate():
+    assert format_rate(None) == ""
+    assert format_rate(512) == "512 B/s"
+    assert format_rate(3 * 1024**2) == "3.0 MB/s"
+
+
+def test_tui_queues_a_pasted_batch(config):
+    runner = GatedRunner()
+
+    async def run():
+        app = PodcastAgentApp(config, workers=1, runner=runner)
+        async with app.run_test() as pilot:
+            app.query_one("#url-input").text = "\n".join(URLS)
+            await pilot.click("#btn-download")
+            assert runner.started.acquire(timeout=5)
+
+            table = app.query_one("#jobs")
+            app.refresh_jobs()
+            assert table.row_count == 3
+            assert table.get_cell("3", "stage") == "queued #2"
+
+            table.move_cursor(row=2)
+            await pilot.press("t")
+            assert table.get_cell("3", "stage") == "queued #1"
+            await pilot.press("c")
+            assert table.get_cell("3", "stage") == CANCELLED
+            runner.release.set()
+
+    asyncio.run(run())
@@ -0,0 +1,116 @@
+from pathlib import Path
+from unittest.mock import patch
+
+from typer.testing import CliRunner
+
+from src.cli import app
+from src.config import Config
+from src.jobs import JournaledJob
+from src.journal import JobJournal
+
+URL = "https://www.youtube.com/watch?v=dQw4w9WgXcQ"
+
+
+def test_journal_replays_stages_and_ignores_torn_line(tmp_path):
+    path = tmp_path / ".journal.jsonl"
+    journal = JobJournal(path)
+    audio = tmp_path / "dQw4w9WgXcQ.mp3"
+    audio.touch()
+    journal.record(URL, "resolved", video_id="dQw4w9WgXcQ")
+    journal.record("https://youtu.be/dQw4w9WgXcQ", "downloaded", audio_path=str(audio))
+    journal.record_failure(URL, RuntimeError("model crashed"))
+    with path.open("a") as f:
+        f.write('{"url": "https://www.youtube.com/watch?v=dQw4w9W')
+
+    replayed = JobJournal(path)
+
+    assert replayed.stage(URL) == "downloaded"
+    assert replayed.downloaded_audio(URL) == audio
+    assert replayed.finished_outputs(URL) is None
+
+
+def test_finished_outputs_require_existing_files(tmp_path):
+    journal = JobJournal(tmp_path / ".journal.jsonl")
+    output = tmp_path / "episode.txt"
+    output.write_text("hello")
+    journal.record(URL, "written", output_paths=[str(output)])
+
+    assert journal.finished_outputs(URL) == [output]
+    output.unlink()
+    assert journal.finished_outputs(URL) is None
+
+
+def test_rerun_with_other_formats_or_model_redoes_the_item(tmp_path):
+    config = Config()
+    config.output.directory = tmp_path
+    output = tmp_path / "episode.txt"
+    output.write_text("hello")
+    JournaledJob(config, resume=True).written(URL, [output])
+
+    assert JournaledJob(config, resume=True).start(URL) == [output]
+
+    config.output.format = ["txt", "srt"]
+    job = JournaledJob(config, resume=True)
+    assert job.start(URL) is None
+    # The existing transcript is replaced rather than renamed next to it
+    assert job.on_existing(URL) == "overwrite"
+
+    config.output.format = ["txt"]
+    config.whisper.model = "large-v3"
+    assert JournaledJob(config, resume=True).start(URL) is None
+
+
+def test_process_resumes_from_journal(tmp_path):
+    output_dir = tmp_path / "output"
+    output_dir.mkdir()
+    config_path = tmp_path / "config.yaml"
+    config_path.write_text("cache:\n  results_enabled: false\n")
+
+    done_url = "https://www.youtube.com/watch?v=aaaaaaaaaaa"
+    partial_url = "https://www.youtube.com/watch?v=bbbbbbbbbbb"
+    new_url = "https://www.youtube.com/watch?v=ccccccccccc"
+    (output_dir / "aaaaaaaaaaa.txt").write_text("done")
+    partial_audio = output_dir / "bbbbbbbbbbb.mp3"
+    partial_audio.touch()
+    # A partial transcript left behind by the interrupted run
+    (output_dir / "bbbbbbbbbbb.txt").write_text("partial")
+
+    # Finished by an earlier run with the same settings as this one
+    config = Config()
+    config.whisper.model = "base"
+    config.output.directory = output_dir
+    JournaledJob(config, resume=True).written(done_url, [output_dir / "aaaaaaaaaaa.txt"])
+    journal = JobJournal.for_directory(output_dir)
+    journal.record(partial_url, "downloaded", audio_path=str(partial_audio))
+
+    batch_file = tmp_path / "urls.txt"
+    batch_file.write_text(f"{done_url}\n{partial_url}\n{new_url}\n")
+
+    def fake_download(url, output_dir, config, progress_hook=None):
+        path = Path(output_dir) / f"{url[-11:]}.mp3"
+        path.touch()
+        return path
+
+    with (
+        patch("src.cli.check_ffmpeg", return_value=True),
+        patch("src.jobs.download_audio", side_effect=fake_download) as mock_download,
+        patch(
+            "src.transcriber.Transcriber.transcribe",
+            return_value={"text": "new text", "segments": []},
+        ) as mock_transcribe,
+    ):
+        outcome = CliRunner().invoke(
+            app,
+            ["process", "-f", str(batch_file), "-o", str(output_dir), "-c", str(config_path)],
+        )
+
+    assert outcome.exit_code == 0, outcome.output
+    assert [c.args[0] for c in mock_download.call_args_list] == [new_url]
+    assert mock_transcribe.call_count == 2
+    assert (output_dir / "aaaaaaaaaaa.txt").read_text() == "done"
+    assert (output_dir / "bbbbbbbbbbb.txt").read_text() == "new text"
+    assert not (output_dir / "bbbbbbbbbbb_1.txt").exists()
+
+    replayed = JobJournal(output_dir / ".journal.jsonl")
+    assert replayed.stage(new_url) == "written"
+    assert replayed.stage(partial_url) == "written"
@@ -0,0 +1,62 @@
+import json
+import logging
+from unittest.mock import MagicMock
+
+from src.logger import ColoredFormatter, setup_logging, stop_logging
+from src.tui_logger import TextualLogHandler
+
+
+def test_setup_logging_replaces_earlier_handlers(tmp_path):
+    logger = setup_logging(log_file=str(tmp_path / "a.log"))
+    setup_logging(log_file=str(tmp_path / "b.log"))
+    assert len(logger.handlers) == 1
+
+    logger.info("only once")
+    stop_logging()
+    assert logger.handlers == []
+    assert "only once" not in (tmp_path / "a.log").read_text()
+    assert (tmp_path / "b.log").read_text().count("only once") == 1
+
+
+def test_json_log_keeps_extra_fields_and_traceback(tmp_path):
+    json_file = tmp_path / "logs" / "agent.jsonl"
+    logger = setup_logging(level="DEBUG", json_file=str(json_file))
+    logger.debug("downloaded %s", "a.mp3", extra={"job": 3})
+    try:
+        raise ValueError("bad audio")
+    except ValueError:
+        logger.exception("failed")
+    stop_logging()
+
+    first, second = [json.loads(line) for line in json_file.read_text().splitlines()]
+    assert (first["level"], first["message"], first["job"]) == ("DEBUG", "downloaded a.mp3", 3)
+    assert second["message"] == "failed"
+    assert "ValueError: bad audio" in second["exception"]
+
+
+def test_colored_formatter_reuses_its_formatters():
+    formatter = ColoredFormatter()
+    record = logging.LogRecord("podcast_ai_agent", logging.WARNING, "", 0, "careful", None, None)
+    assert "careful" in formatter.format(record)
+    assert "\033[93m" in formatter.format(record)
+    assert len({id(f) for f in formatter._formatters.values()}) == 5
+
+
+def test_tui_handler_writes_batches_and_drops_the_oldest_lines():
+    widget = MagicMock()
+    handler = TextualLogHandler(widget, max_pending=3)
+    for i in range(5):
+        handler.handle(logging.LogRecord("x", logging.INFO, "", 0, f"line {i}", None, None))
+    handler.handle(logging.LogRecord("x", logging.ERROR, "", 0, "failed", None, None))
+    widget.write.assert_not_called()
+
+    handler.drain()
+    handler.drain()
+    (text,), _ = widget.write.call_args
+    assert widget.write.call_count == 1
+    lines = text.plain.split("\n")
+    assert lines[0] == "... 3 earlier log lines dropped"
+    assert [line.split()[-1] for line in lines[1:]] == ["3", "4", "failed"]
+    # Each level keeps its own colour
+    styles = {text.plain[span.start : span.end].strip(): span.style for span in text.spans}
+    assert (styles["INFO"], styles["ERROR"]) == ("green", "red")
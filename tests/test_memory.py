@@ -0,0 +1,130 @@
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from src import memory
+from src.config import MemoryConfig
+from src.exceptions import InsufficientMemoryError
+from src.memory import MemoryGovernor, MemoryUsage
+
+KEY = ("base", "cpu", "fp32")
+
+
+@pytest.fixture
+def free_mb(monkeypatch):
+    """Pin the memory the system reports as available, and this process's RSS."""
+    state = {"available": 4000.0, "rss": 500.0}
+    monkeypatch.setattr(memory, "available_mb", lambda: state["available"])
+    monkeypatch.setattr(memory, "rss_mb", lambda: state["rss"])
+    return state
+
+
+def test_estimates_fall_back_to_models_yaml():
+    governor = MemoryGovernor()
+
+    assert governor.load_mb(("tiny", "cpu", "fp32")) == 200
+    assert governor.load_mb(("large-v3", "cuda", "fp16")) == 8000
+    # Decoding an hour needs more than decoding a minute
+    assert governor.decode_mb(KEY, 3600) > governor.decode_mb(KEY, 60) > 0
+
+
+def test_decode_estimate_covers_every_measurement():
+    governor = MemoryGovernor()
+    for seconds, peak in [(600, 400.0), (1200, 600.0), (1800, 900.0)]:
+        governor.record_decode(KEY, seconds, MemoryUsage(start_mb=100, peak_mb=100 + peak))
+
+    for seconds, peak in [(600, 400.0), (1200, 600.0), (1800, 900.0)]:
+        assert governor.decode_mb(KEY, seconds) >= peak
+    assert governor.decode_mb(KEY, 3600) > 900
+    # Unknown durations are sized like the longest one measured
+    assert governor.decode_mb(KEY) == governor.decode_mb(KEY, 1800)
+
+
+def test_measurements_persist_and_merge(tmp_path):
+    path = tmp_path / "memory.json"
+    first = MemoryGovernor(path=path)
+    second = MemoryGovernor(path=path)
+
+    first.record_load(KEY, MemoryUsage(start_mb=100, peak_mb=900, end_mb=400))
+    second.record_decode(("tiny", "cpu", "fp32"), 60, MemoryUsage(start_mb=100, peak_mb=150))
+
+    reloaded = MemoryGovernor()
+    reloaded.configure(MemoryConfig(measurements=path))
+    assert reloaded.load_mb(KEY) == 800
+    assert reloaded.resident_mb(KEY) == 300
+    assert reloaded.decode_mb(("tiny", "cpu", "fp32"), 60) == pytest.approx(50)
+
+
+def test_unreadable_measurements_are_ignored(tmp_path):
+    path = tmp_path / "memory.json"
+    path.write_text("{not json")
+
+    governor = MemoryGovernor(path=path)
+    assert governor.load_mb(KEY) == 1000
+    governor.record_load(KEY, MemoryUsage(start_mb=0, peak_mb=300, end_mb=200))
+    assert MemoryGovernor(path=path).load_mb(KEY) == 300
+
+
+def test_admit_fails_when_nothing_will_free_memory(free_mb):
+    governor = MemoryGovernor(headroom_mb=500, wait_seconds=0)
+
+    with governor.admit(3500, "fits"):
+        pass
+    too_big = pytest.raises(InsufficientMemoryError, match="3501MB required for too big")
+    with too_big, governor.admit(3501, "too big"):
+        pass
+
+
+def test_admit_counts_reservations_not_yet_allocated(free_mb):
+    governor = MemoryGovernor(headroom_mb=0, wait_seconds=0, poll_interval=0.01)
+    released = threading.Event()
+    admitted = []
+
+    def second_job():
+        with governor.admit(2500, "second"):
+            admitted.append(released.is_set())
+
+    with governor.admit(2500, "first"):
+        # The first job has not allocated anything yet, so the second must wait
+        thread = threading.Thread(target=second_job)
+        thread.start()
+        time.sleep(0.1)
+        assert admitted == []
+        released.set()
+    thread.join(timeout=5)
+
+    assert admitted == [True]
+    assert governor.stats()["waits"] == 1
+
+
+def test_admit_respects_process_limit(free_mb):
+    governor = MemoryGovernor(headroom_mb=0, limit_mb=1000, wait_seconds=0)
+
+    with governor.admit(500, "under the limit"):
+        pass
+    with pytest.raises(InsufficientMemoryError), governor.admit(501, "over the limit"):
+        pass
+
+
+def test_workers_that_fit(free_mb):
+    governor = MemoryGovernor(headroom_mb=0)
+    governor.record_decode(KEY, 600, MemoryUsage(start_mb=0, peak_mb=1000))
+
+    assert governor.workers_that_fit(KEY, 8, seconds=600) == 4
+    assert governor.workers_that_fit(KEY, 2, seconds=600) == 2
+    free_mb["available"] = 10.0
+    assert governor.workers_that_fit(KEY, 4, seconds=600) == 1
+
+
+def test_measure_sees_peak_allocation():
+    governor = MemoryGovernor()
+
+    with governor.measure() as usage:
+        block = np.ones(64 * 1024 * 1024 // 8)
+        time.sleep(0.1)
+        del block
+
+    assert usage.peak_delta_mb >= 48
+    assert usage.peak_mb >= usage.end_mb
@@ -0,0 +1,101 @@
+import threading
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.config import WhisperConfig
+from src.model_cache import ModelRegistry, get_registry
+from src.transcriber import Transcriber
+
+
+def test_registry_hit_and_miss():
+    registry = ModelRegistry(ram_budget_mb=1000)
+    loader = MagicMock(return_value=object())
+
+    first = registry.get(("base", "cpu", "fp32"), loader)
+    second = registry.get(("base", "cpu", "fp32"), loader)
+
+    assert first is second
+    loader.assert_called_once()
+    stats = registry.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+
+
+def test_registry_evicts_least_recently_used():
+    registry = ModelRegistry(ram_budget_mb=150)
+
+    with patch("src.model_cache.model_size_mb", return_value=100.0):
+        registry.get(("tiny", "cpu", "fp32"), object)
+        registry.get(("base", "cpu", "fp32"), object)
+
+    assert ("tiny", "cpu", "fp32") not in registry
+    assert ("base", "cpu", "fp32") in registry
+    assert registry.stats()["evictions"] == 1
+
+
+def test_slow_load_does_not_block_other_models():
+    registry = ModelRegistry(ram_budget_mb=1000)
+    registry.get(("tiny", "cpu", "fp32"), object)
+    loading, release = threading.Event(), threading.Event()
+    loads = []
+
+    def slow_loader():
+        loads.append(1)
+        loading.set()
+        assert release.wait(5)
+        return "large"
+
+    results = []
+    threads = [
+        threading.Thread(
+            target=lambda: results.append(registry.get(("large", "cpu", "fp32"), slow_loader))
+        )
+        for _ in range(2)
+    ]
+    for thread in threads:
+        thread.start()
+    assert loading.wait(5)
+    # A hit on another model returns while the slow load is still running
+    assert registry.get(("tiny", "cpu", "fp32"), object) is not None
+    release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert results == ["large", "large"]
+    assert loads == [1]
+
+
+def test_failed_load_is_retried():
+    registry = ModelRegistry(ram_budget_mb=1000)
+    with pytest.raises(RuntimeError):
+        registry.get(("base", "cpu", "fp32"), MagicMock(side_effect=RuntimeError("no model")))
+    assert registry.get(("base", "cpu", "fp32"), lambda: "base") == "base"
+
+
+@pytest.mark.parametrize(
+    "device, precision, expected",
+    [
+        ("cuda", "auto", "fp16"),
+        ("cpu", "auto", "fp32"),
+        ("cuda", "fp32", "fp32"),
+        ("cpu", "fp16", "fp32"),
+    ],
+)
+def test_default_precision_follows_whisper(device, precision, expected):
+    config = WhisperConfig(model="base", device=device, precision=precision)
+    assert Transcriber(config)._model_key() == ("base", device, expected)
+    assert WhisperConfig().precision == "auto"
+
+
+@patch("src.transcriber.whisper.load_model")
+def test_transcribers_share_loaded_model(mock_load_model):
+    mock_load_model.return_value = MagicMock()
+    config = WhisperConfig(model="tiny", device="cpu")
+
+    first = Transcriber(config)._load_model()
+    second = Transcriber(config)._load_model()
+
+    assert first is second
+    mock_load_model.assert_called_once()
+    assert get_registry().stats()["hits"] == 1
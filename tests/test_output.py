@@ -0,0 +1,147 @@
+import json
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pytest
+
+from src.config import WhisperConfig
+from src.output import OutputWriter, StreamingWriter
+from src.transcriber import BatchedEngine, Transcriber
+from src.utils import AudioInfo
+
+SEGMENTS = [
+    {"id": 0, "start": 0.0, "end": 2.5, "text": " Hello there."},
+    {"id": 1, "start": 2.5, "end": 3661.25, "text": " General\nKenobi."},
+]
+
+
+@pytest.mark.parametrize("fmt", ["srt", "vtt"])
+def test_streaming_matches_batch_output(tmp_path, fmt):
+    batch_path = getattr(OutputWriter(tmp_path / "batch"), f"write_{fmt}")(SEGMENTS)
+
+    with OutputWriter(tmp_path / "stream").open_stream(fmt) as stream:
+        for seg in SEGMENTS:
+            stream.write_segment(seg)
+
+    assert stream.path.read_text() == batch_path.read_text()
+
+
+def test_streaming_file_is_readable_after_each_segment(tmp_path):
+    stream = StreamingWriter(tmp_path / "episode.jsonl", "jsonl", {"url": "http://test.com"})
+    stream.write_segment(SEGMENTS[0])
+
+    # Read while the writer is still open, as after a crash
+    lines = (tmp_path / "episode.jsonl.partial").read_text().splitlines()
+    assert json.loads(lines[0]) == {"metadata": {"url": "http://test.com"}}
+    assert json.loads(lines[1])["text"] == " Hello there."
+    assert not (tmp_path / "episode.jsonl").exists()
+
+    assert stream.close() == tmp_path / "episode.jsonl"
+    assert not (tmp_path / "episode.jsonl.partial").exists()
+
+
+def test_interrupted_stream_keeps_the_previous_transcript(tmp_path):
+    path = tmp_path / "episode.txt"
+    path.write_text("complete transcript\n")
+
+    with pytest.raises(RuntimeError):
+        with StreamingWriter(path, "txt") as stream:
+            stream.write_segment(SEGMENTS[0])
+            raise RuntimeError("decoder crashed")
+
+    assert path.read_text() == "complete transcript\n"
+    assert (tmp_path / "episode.txt.partial").read_text() == "Hello there.\n"
+
+
+def test_streaming_syncs_at_checkpoints_only(tmp_path):
+    with patch("src.output.os.fsync") as fsync:
+        with StreamingWriter(tmp_path / "episode.txt", "txt", checkpoint_seconds=3600) as stream:
+            for seg in SEGMENTS * 50:
+                stream.write_segment(seg)
+        assert fsync.call_count == 1  # On close
+
+
+def test_streaming_rejects_json(tmp_path):
+    with pytest.raises(ValueError):
+        StreamingWriter(tmp_path / "episode.json", "json")
+
+
+@patch("src.transcriber.whisper.load_model")
+@patch("src.transcriber.probe_audio")
+@patch("src.transcriber.whisper.audio.load_audio")
+def test_transcribe_to_file_streams_segments(
+    mock_load_audio, mock_probe, mock_load_model, tmp_path
+):
+    mock_load_audio.return_value = np.zeros(16000, dtype=np.float32)
+    mock_probe.return_value = AudioInfo(1.0, "mp3", 44100, 2, 1024)
+    mock_load_model.return_value = MagicMock()
+    audio_path = tmp_path / "episode.mp3"
+    audio_path.touch()
+
+    written = []
+
+    def iter_segments(self, audio):
+        for seg in SEGMENTS:
+            yield seg
+            written.append((tmp_path / "episode.srt.partial").read_text())
+
+    with patch.object(BatchedEngine, "iter_segments", iter_segments):
+        path = Transcriber(WhisperConfig()).transcribe_to_file(
+            audio_path, OutputWriter(tmp_path / "episode"), "srt"
+        )
+
+    assert path == tmp_path / "episode.srt"
+    assert "Hello there." in written[0] and "Kenobi" not in written[0]
+    assert "General Kenobi." in path.read_text()
+
+
+def test_write_all_formats_in_one_call(tmp_path):
+    result = {"text": " Hello there. General Kenobi.", "segments": SEGMENTS}
+    writer = OutputWriter(tmp_path / "episode", {"url": "http://test.com"})
+
+    paths = writer.write(result, ["txt", "srt", "vtt", "json", "srt"])
+
+    assert [p.suffix for p in paths] == [".txt", ".srt", ".vtt", ".json"]
+    single = OutputWriter(tmp_path / "single")
+    assert paths[1].read_text() == single.write_srt(SEGMENTS).read_text()
+    assert paths[2].read_text() == single.write_vtt(SEGMENTS).read_text()
+    assert json.loads(paths[3].read_text())["metadata"] == {"url": "http://test.com"}
+
+
+def test_write_rejects_unknown_format(tmp_path):
+    with pytest.raises(ValueError):
+        OutputWriter(tmp_path / "episode").write({"text": "", "segments": []}, ["docx"])
+
+
+def test_render_rebuilds_formats_from_json(tmp_path):
+    from typer.testing import CliRunner
+
+    from src.cli import app
+
+    result = {"text": " Hello there. General Kenobi.", "segments": SEGMENTS}
+    json_path = OutputWriter(tmp_path / "episode", {"url": "http://test.com"}).write_json(result)
+
+    outcome = CliRunner().invoke(
+        app, ["render", str(json_path), "--format", "txt,vtt", "-o", str(tmp_path / "out")]
+    )
+
+    assert outcome.exit_code == 0, outcome.output
+    assert (tmp_path / "out" / "episode.txt").read_text() == result["text"]
+    assert "00:00:02.500 --> 01:01:01.250" in (tmp_path / "out" / "episode.vtt").read_text()
+
+
+@pytest.mark.parametrize(
+    "policy, expected_name, expected_text",
+    [
+        ("skip", "episode.txt", "old"),
+        ("overwrite", "episode.txt", "new"),
+        ("rename", "episode_1.txt", "new"),
+    ],
+)
+def test_on_existing_policy(tmp_path, policy, expected_name, expected_text):
+    (tmp_path / "episode.txt").write_text("old")
+
+    path = OutputWriter(tmp_path / "episode", on_existing=policy).write_txt("new")
+
+    assert path.name == expected_name
+    assert path.read_text() == expected_text
@@ -0,0 +1,65 @@
+import threading
+from pathlib import Path
+
+from src.config import PipelineConfig
+from src.downloader import DownloadError
+from src.pipeline import Pipeline
+
+
+def _pipeline(download, transcribe=None, write=None, **config):
+    return Pipeline(
+        download=download,
+        transcribe=transcribe or (lambda url, path: {"text": url}),
+        write=write or (lambda url, path, result: path.with_suffix(".txt")),
+        config=PipelineConfig(**config),
+    )
+
+
+def test_pipeline_processes_all_items():
+    urls = [f"http://test.com/{i}" for i in range(5)]
+    pipeline = _pipeline(lambda url: Path(f"{url.rsplit('/', 1)[1]}.mp3"), download_workers=3)
+
+    results = pipeline.run(urls)
+
+    assert [r.url for r in results] == urls
+    assert all(r.ok for r in results)
+    assert results[0].output_path == Path("0.txt")
+
+
+def test_pipeline_reports_failures_per_item():
+    def download(url):
+        if url.endswith("bad"):
+            raise DownloadError("boom")
+        return Path("ok.mp3")
+
+    reported = []
+    results = _pipeline(download).run(
+        ["http://test.com/ok", "http://test.com/bad"], on_result=reported.append
+    )
+
+    assert len(reported) == 2
+    assert results[0].ok
+    assert isinstance(results[1].error, DownloadError)
+
+
+def test_pipeline_prefetches_while_transcribing():
+    transcribing = threading.Event()
+    prefetched = threading.Event()
+
+    def download(url):
+        if url.endswith("2"):
+            assert transcribing.wait(timeout=5)
+            prefetched.set()
+        return Path(f"{url[-1]}.mp3")
+
+    def transcribe(url, path):
+        if url.endswith("1"):
+            transcribing.set()
+            assert prefetched.wait(timeout=5)
+        return {"text": url}
+
+    results = _pipeline(download, transcribe=transcribe).run(
+        ["http://test.com/1", "http://test.com/2"]
+    )
+
+    assert all(r.ok for r in results)
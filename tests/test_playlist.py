@@ -0,0 +1,120 @@
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pytest
+from typer.testing import CliRunner
+
+from src.cli import app
+from src.config import DownloadConfig
+from src.playlist import expand_urls, is_collection_url
+
+PLAYLIST_URL = "https://www.youtube.com/playlist?list=PL0123456789"
+
+
+@pytest.mark.parametrize(
+    "url, expected",
+    [
+        (PLAYLIST_URL, True),
+        ("https://www.youtube.com/@somechannel/videos", True),
+        ("https://youtube.com/channel/UC0123456789", True),
+        ("https://www.youtube.com/watch?v=dQw4w9WgXcQ&list=PL0123456789", False),
+        ("https://www.youtube.com/watch?v=dQw4w9WgXcQ", False),
+        ("https://example.com/playlist", False),
+    ],
+)
+def test_is_collection_url(url, expected):
+    assert is_collection_url(url) is expected
+
+
+def _fake_ydl(entries):
+    ydl = MagicMock()
+    ydl.__enter__.return_value = ydl
+    ydl.extract_info.return_value = {"_type": "playlist", "entries": entries}
+    return ydl
+
+
+def _entry(video_id, **fields):
+    return {"_type": "url", "ie_key": "Youtube", "id": video_id, "url": video_id, **fields}
+
+
+def test_expand_urls_is_lazy_and_filters_entries():
+    fetched = []
+
+    def entries():
+        for video_id, fields in [
+            ("aaaaaaaaaaa", {"duration": 1800, "upload_date": "20240301"}),
+            ("bbbbbbbbbbb", {"duration": 30}),
+            ("ccccccccccc", {"timestamp": 1577836800}),  # 2020-01-01
+            ("ddddddddddd", {}),
+            ("aaaaaaaaaaa", {"duration": 1800}),
+        ]:
+            fetched.append(video_id)
+            yield _entry(video_id, **fields)
+
+    config = DownloadConfig(date_after="20230101", min_duration=60)
+    with patch("yt_dlp.YoutubeDL", return_value=_fake_ydl(entries())):
+        urls = expand_urls(["https://youtu.be/zzzzzzzzzzz", PLAYLIST_URL], config)
+
+        assert next(urls) == "https://youtu.be/zzzzzzzzzzz"
+        assert next(urls) == "https://www.youtube.com/watch?v=aaaaaaaaaaa"
+        assert fetched == ["aaaaaaaaaaa"]
+        # Entries without the filtered metadata pass; repeats are dropped
+        assert list(urls) == ["https://www.youtube.com/watch?v=ddddddddddd"]
+
+
+def test_expand_urls_reports_failed_collection():
+    ydl = _fake_ydl([])
+    ydl.extract_info.side_effect = RuntimeError("playlist does not exist")
+    errors = []
+
+    with patch("yt_dlp.YoutubeDL", return_value=ydl):
+        urls = list(
+            expand_urls(
+                [PLAYLIST_URL, "https://youtu.be/zzzzzzzzzzz"],
+                DownloadConfig(),
+                on_error=lambda url, e: errors.append(url),
+            )
+        )
+
+    assert urls == ["https://youtu.be/zzzzzzzzzzz"]
+    assert errors == [PLAYLIST_URL]
+
+
+def test_process_streams_playlist_items(tmp_path):
+    config_path = tmp_path / "config.yaml"
+    config_path.write_text("cache:\n  results_enabled: false\n")
+    ydl = _fake_ydl([_entry("aaaaaaaaaaa", duration=600), _entry("bbbbbbbbbbb", duration=7200)])
+
+    def fake_download(url, output_dir, config, progress_hook=None):
+        path = Path(output_dir) / f"{url[-11:]}.mp3"
+        path.touch()
+        return path
+
+    with (
+        patch("src.cli.check_ffmpeg", return_value=True),
+        patch("yt_dlp.YoutubeDL", return_value=ydl),
+        patch("src.jobs.download_audio", side_effect=fake_download) as mock_download,
+        patch(
+            "src.transcriber.Transcriber.transcribe", return_value={"text": "hello", "segments": []}
+        ),
+    ):
+        outcome = CliRunner().invoke(
+            app,
+            [
+                "process",
+                "-u",
+                PLAYLIST_URL,
+                "-o",
+                str(tmp_path / "output"),
+                "-c",
+                str(config_path),
+                "--max-duration",
+                "3600",
+            ],
+        )
+
+    assert outcome.exit_code == 0, outcome.output
+    assert [c.args[0] for c in mock_download.call_args_list] == [
+        "https://www.youtube.com/watch?v=aaaaaaaaaaa"
+    ]
+    assert "1 succeeded, 0 failed" in outcome.output
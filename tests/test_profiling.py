@@ -0,0 +1,96 @@
+import json
+import threading
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src import profiling
+from src.config import CacheConfig, WhisperConfig
+from src.transcriber import Transcriber
+from src.utils import AudioInfo
+
+
+@pytest.fixture
+def profiler():
+    active = profiling.enable()
+    yield active
+    profiling.disable()
+
+
+def test_stage_is_noop_when_disabled():
+    profiling.disable()
+    with profiling.stage("download") as timer:
+        timer.add_bytes(10)
+    assert profiling.get_profiler() is None
+
+
+def test_stage_records_time_bytes_and_item(profiler):
+    with profiling.item("https://example.com/a"), profiling.stage("write") as timer:
+        timer.add_bytes(1024)
+        sum(range(10000))
+
+    record = profiler.records[0]
+    assert record.stage == "write"
+    assert record.item == "https://example.com/a"
+    assert record.bytes == 1024
+    assert record.wall_seconds > 0
+    assert record.peak_rss_bytes > 0
+
+    report = profiler.report()
+    assert report["stages"]["write"]["count"] == 1
+    assert report["items"]["https://example.com/a"]["write"]["bytes"] == 1024
+
+
+def test_item_is_per_thread(profiler):
+    def work(url):
+        with profiling.item(url), profiling.stage("download"):
+            pass
+
+    threads = [threading.Thread(target=work, args=(f"u{i}",)) for i in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert sorted(r.item for r in profiler.records) == ["u0", "u1", "u2", "u3"]
+
+
+def test_writes_json_and_prometheus(profiler, tmp_path):
+    with profiling.stage("transcribe.decode") as timer:
+        timer.add_bytes(2048)
+
+    profiler.write_json(tmp_path / "profile.json")
+    profiler.write_prometheus(tmp_path / "metrics.prom")
+
+    report = json.loads((tmp_path / "profile.json").read_text())
+    assert report["stages"]["transcribe.decode"]["bytes"] == 2048
+
+    metrics = (tmp_path / "metrics.prom").read_text()
+    assert "# TYPE podcast_ai_agent_stage_wall_seconds_total counter" in metrics
+    assert 'podcast_ai_agent_stage_bytes_total{stage="transcribe.decode"} 2048' in metrics
+    assert not list(tmp_path.glob(".*.tmp"))
+
+
+@patch("src.transcriber.whisper.load_model")
+@patch("src.transcriber.probe_audio")
+def test_transcriber_stages_are_recorded(mock_probe, mock_load_model, profiler, tmp_path):
+    mock_probe.return_value = AudioInfo(1.0, "mp3", 44100, 2, 5)
+    mock_model = MagicMock()
+    mock_model.transcribe.return_value = {"text": "", "segments": []}
+    mock_load_model.return_value = mock_model
+
+    audio_path = tmp_path / "test.mp3"
+    audio_path.write_bytes(b"audio")
+
+    cache = CacheConfig(directory=tmp_path / ".cache", audio_enabled=False)
+    Transcriber(WhisperConfig(), cache).transcribe(audio_path)
+
+    stages = profiler.report()["stages"]
+    assert {
+        "transcribe.probe",
+        "transcribe.hash",
+        "transcribe.load_model",
+        "transcribe.decode",
+        "transcribe.cache_store",
+    } <= set(stages)
+    assert stages["transcribe.probe"]["bytes"] == 5
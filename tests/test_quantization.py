@@ -0,0 +1,84 @@
+import copy
+
+import torch
+from whisper.model import ModelDimensions, Whisper
+
+from src import quantization
+from src.config import WhisperConfig
+from src.transcriber import Transcriber
+
+DIMS = ModelDimensions(
+    n_mels=80,
+    n_audio_ctx=1500,
+    n_audio_state=64,
+    n_audio_head=2,
+    n_audio_layer=1,
+    n_vocab=51865,
+    n_text_ctx=448,
+    n_text_state=64,
+    n_text_head=2,
+    n_text_layer=1,
+)
+
+
+def tiny_model() -> Whisper:
+    torch.manual_seed(0)
+    model = Whisper(DIMS).eval()
+    with torch.no_grad():
+        # Allocated with torch.empty and normally filled from the checkpoint
+        model.decoder.positional_embedding.normal_(0, 0.02)
+    return model
+
+
+def test_quantize_int8_replaces_linear_layers():
+    model = tiny_model()
+    quantized = quantization.quantize_int8(copy.deepcopy(model))
+
+    # Dynamic quantized Linear does not subclass nn.Linear
+    assert not any(isinstance(m, torch.nn.Linear) for m in quantized.modules())
+    assert type(quantized.decoder.blocks[0].attn.key).__name__ == "Linear"
+    assert "dynamic" in type(quantized.decoder.blocks[0].attn.key).__module__
+
+    mel = torch.randn(1, 80, 3000)
+    tokens = torch.tensor([[50258, 50259, 50359]])
+    with torch.no_grad():
+        expected = model(mel, tokens)
+        actual = quantized(mel, tokens)
+    assert (actual - expected).abs().max() < 0.05 * expected.abs().max()
+
+
+def test_load_int8_quantizes_once(tmp_path, monkeypatch):
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+    loads = []
+
+    def load_fp32():
+        loads.append(1)
+        return tiny_model()
+
+    first = quantization.load_int8("tiny", load_fp32)
+    second = quantization.load_int8("tiny", load_fp32)
+
+    assert loads == [1]
+    assert quantization.quantized_cache_path("tiny").parent == tmp_path / "whisper"
+    assert type(second.decoder.blocks[0].mlp[0]) is type(first.decoder.blocks[0].mlp[0])
+
+
+def test_quantized_copy_is_keyed_by_checkpoint(tmp_path, monkeypatch):
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+    checkpoint = tmp_path / "custom.pt"
+    checkpoint.write_bytes(b"v1")
+    first = quantization.quantized_cache_path(str(checkpoint))
+    checkpoint.write_bytes(b"v2 is longer")
+
+    # A checkpoint path stays inside the cache directory
+    assert first.parent == tmp_path / "cache" / "whisper"
+    assert first.name.startswith("custom-")
+    assert quantization.quantized_cache_path(str(checkpoint)) != first
+
+
+def test_int8_precision_is_cpu_only():
+    cpu = Transcriber(WhisperConfig(model="tiny", device="cpu", precision="int8"))
+    gpu = Transcriber(WhisperConfig(model="tiny", device="cuda", precision="int8"))
+
+    assert cpu._model_key() == ("tiny", "cpu", "int8")
+    assert gpu._model_key() == ("tiny", "cuda", "fp16")
@@ -0,0 +1,76 @@
+import threading
+
+import pytest
+
+from src.rate_limit import HostLimiter, TokenBucket, backoff_delay, parse_retry_after
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_token_bucket_refills_at_rate():
+    clock = FakeClock()
+    bucket = TokenBucket(rate=2.0, burst=2, clock=clock)
+
+    assert bucket.try_acquire() == 0
+    assert bucket.try_acquire() == 0
+    assert bucket.try_acquire() == pytest.approx(0.5)
+
+    clock.now = 0.5
+    assert bucket.try_acquire() == 0
+    # Idle time only ever saves up ``burst`` tokens
+    clock.now = 100
+    assert [bucket.try_acquire() > 0 for _ in range(3)] == [False, False, True]
+
+
+def test_host_limiter_halves_on_throttle_and_regrows():
+    limiter = HostLimiter(rate=0, burst=1, max_concurrency=4)
+
+    limiter.throttled()
+    limiter.throttled()
+    assert limiter.limit == 1
+
+    limiter.succeeded()
+    assert limiter.limit == 2
+    limiter.succeeded()
+    limiter.succeeded()
+    assert limiter.limit == 3
+
+
+def test_host_limiter_caps_concurrent_slots():
+    limiter = HostLimiter(rate=0, burst=1, max_concurrency=4)
+    limiter.throttled()
+    limiter.throttled()
+    peak = []
+    barrier = threading.Barrier(3)
+
+    def work():
+        barrier.wait()
+        with limiter.slot():
+            peak.append(limiter.active)
+
+    threads = [threading.Thread(target=work) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert max(peak) == 1
+
+
+def test_backoff_delay_is_capped_full_jitter():
+    assert backoff_delay(3, 2.0, 60.0, rng=lambda: 1.0) == 8.0
+    assert backoff_delay(10, 2.0, 60.0, rng=lambda: 0.5) == 30.0
+    assert backoff_delay(3, 2.0, 60.0, rng=lambda: 0.0) == 0.0
+
+
+def test_parse_retry_after():
+    assert parse_retry_after("120") == 120.0
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+    assert parse_retry_after("soon") is None
+    assert parse_retry_after(None) is None
@@ -0,0 +1,101 @@
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.config import CacheConfig, WhisperConfig
+from src.result_cache import ResultCache, result_key
+from src.transcriber import Transcriber
+from src.utils import AudioInfo
+
+
+def test_result_key_depends_on_decode_parameters():
+    base = result_key("abc", WhisperConfig())
+
+    assert result_key("abc", WhisperConfig()) == base
+    assert result_key("abc", WhisperConfig(translate=True)) != base
+    assert result_key("abc", WhisperConfig(model="tiny")) != base
+    assert result_key("def", WhisperConfig()) != base
+
+
+@pytest.mark.parametrize(
+    "change",
+    [
+        {"precision": "fp16"},
+        {"precision": "int8"},
+        {"engine": "batched"},
+        {"batch_size": 16},
+        {"chunk_seconds": 300.0},
+        {"device": "cuda"},
+    ],
+)
+def test_result_key_depends_on_model_and_engine_settings(change):
+    base = result_key("abc", WhisperConfig(device="cpu"))
+    assert result_key("abc", WhisperConfig(device="cpu").model_copy(update=change)) != base
+
+
+def test_result_key_uses_the_resolved_device_and_precision():
+    auto = WhisperConfig(device="auto", precision="fp16")
+    assert result_key("abc", auto, "cpu", "fp32") == result_key(
+        "abc", WhisperConfig(device="cpu", precision="fp32")
+    )
+    assert result_key("abc", auto, "cpu", "fp32") != result_key("abc", auto, "cuda", "fp16")
+
+
+def test_result_cache_roundtrip_and_prune(tmp_path):
+    cache = ResultCache(tmp_path)
+    config = WhisperConfig()
+
+    for i in range(3):
+        cache.put(f"{i:02}key", "abc", config, {"text": "x" * 100, "segments": []})
+
+    assert cache.get("00key")["text"] == "x" * 100
+    assert cache.get("missing") is None
+    assert cache.stats()["entries"] == 3
+
+    # 00key was just read, so it is the most recently used entry
+    assert cache.prune(max_bytes=150) == 2
+    assert cache.get("00key") is not None
+    assert cache.get("01key") is None
+
+    assert cache.clear() == 1
+    assert cache.stats()["entries"] == 0
+
+
+@patch("src.transcriber.whisper.load_model")
+@patch("src.transcriber.probe_audio")
+def test_transcribe_reuses_cached_result(mock_probe, mock_load_model, tmp_path):
+    mock_probe.return_value = AudioInfo(1.0, "mp3", 44100, 2, 1024)
+    mock_model = MagicMock()
+    mock_model.transcribe.return_value = {"text": "Test transcription", "segments": []}
+    mock_load_model.return_value = mock_model
+
+    audio_path = tmp_path / "test.mp3"
+    audio_path.write_bytes(b"audio")
+    cache = CacheConfig(directory=tmp_path / ".cache", audio_enabled=False)
+
+    first = Transcriber(WhisperConfig(), cache).transcribe(audio_path)
+    second = Transcriber(WhisperConfig(), cache).transcribe(audio_path)
+
+    assert first["text"] == second["text"] == "Test transcription"
+    mock_model.transcribe.assert_called_once()
+
+
+@patch("src.transcriber.probe_audio")
+def test_int8_run_does_not_reuse_an_fp32_result(mock_probe, tmp_path):
+    mock_probe.return_value = AudioInfo(1.0, "mp3", 44100, 2, 1024)
+    audio_path = tmp_path / "test.mp3"
+    audio_path.write_bytes(b"audio")
+    cache = CacheConfig(directory=tmp_path / ".cache", audio_enabled=False)
+
+    texts, decodes = [], []
+    for precision in ("fp32", "int8", "int8"):
+        model = MagicMock()
+        model.transcribe.return_value = {"text": precision, "segments": []}
+        transcriber = Transcriber(WhisperConfig(device="cpu", precision=precision), cache)
+        with patch.object(Transcriber, "_load_model", return_value=model):
+            texts.append(transcriber.transcribe(audio_path)["text"])
+        decodes.append(model.transcribe.call_count)
+
+    assert texts == ["fp32", "int8", "int8"]
+    # The second int8 run is served from the cache
+    assert decodes == [1, 1, 0]
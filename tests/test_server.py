@@ -0,0 +1,121 @@
+import threading
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+from typer.testing import CliRunner
+
+from src.cli import app
+from src.config import Config
+from src.server import TranscriptionServer, ping, submit_jobs
+
+URLS = [
+    "https://www.youtube.com/watch?v=aaaaaaaaaaa",
+    "https://www.youtube.com/watch?v=bbbbbbbbbbb",
+]
+
+
+def fake_download(url, output_dir, config, progress_hook=None):
+    path = Path(output_dir) / f"{url[-11:]}.mp3"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.touch()
+    return path
+
+
+@pytest.fixture
+def config(tmp_path):
+    config = Config()
+    config.output.directory = tmp_path / "output"
+    config.cache.results_enabled = False
+    config.server.socket = tmp_path / "server.sock"
+    return config
+
+
+@pytest.fixture
+def mock_jobs():
+    with (
+        patch("src.jobs.download_audio", side_effect=fake_download),
+        patch(
+            "src.transcriber.Transcriber.transcribe", return_value={"text": "hello", "segments": []}
+        ) as mock_transcribe,
+    ):
+        yield mock_transcribe
+
+
+def test_server_runs_submitted_jobs(config, mock_jobs):
+    server = TranscriptionServer(config).start()
+    try:
+        results = []
+        submit_jobs(config.server.socket, config, URLS, results.append)
+        status = ping(config.server.socket)
+    finally:
+        server.shutdown()
+
+    assert sorted(r["url"] for r in results) == URLS
+    assert {r["status"] for r in results} == {"done"}
+    assert Path(results[0]["output_paths"][0]).read_text() == "hello"
+    assert status["done"] == 2
+    assert not config.server.socket.exists()
+
+
+def test_server_rejects_beyond_queue_and_drains_on_shutdown(config, mock_jobs):
+    config.server.max_queue = 1
+    release = threading.Event()
+    started = threading.Event()
+
+    def slow_transcribe(*args, **kwargs):
+        started.set()
+        release.wait(5)
+        return {"text": "slow", "segments": []}
+
+    mock_jobs.side_effect = slow_transcribe
+    urls = URLS + ["https://www.youtube.com/watch?v=ccccccccccc"]
+    server = TranscriptionServer(config).start()
+    results = []
+
+    def submit(url):
+        submit_jobs(config.server.socket, config, [url], results.append)
+
+    first = threading.Thread(target=submit, args=(urls[0],))
+    first.start()
+    assert started.wait(5)
+    second = threading.Thread(target=submit, args=(urls[1],))
+    second.start()
+    while ping(config.server.socket)["queued"] < 1:
+        time.sleep(0.01)
+    submit(urls[2])
+    assert results == [
+        {"job": 3, "url": urls[2], "status": "rejected", "error": "job queue is full"}
+    ]
+
+    stopper = threading.Thread(target=server.shutdown)
+    stopper.start()
+    release.set()
+    for thread in (first, second, stopper):
+        thread.join(5)
+
+    assert sorted(r["status"] for r in results) == ["done", "done", "rejected"]
+    assert server.wait(0)
+
+
+def test_process_submits_to_running_daemon(tmp_path, config, mock_jobs):
+    config_path = tmp_path / "config.yaml"
+    config_path.write_text(
+        f"cache:\n  results_enabled: false\nserver:\n  socket: {config.server.socket}\n"
+    )
+    server = TranscriptionServer(config).start()
+    try:
+        with patch("src.cli.check_ffmpeg", return_value=True):
+            outcome = CliRunner().invoke(
+                app,
+                ["process", "-u", URLS[0], "-o", str(tmp_path / "client"), "-c", str(config_path)],
+            )
+        status = ping(config.server.socket)
+    finally:
+        server.shutdown()
+
+    assert outcome.exit_code == 0, outcome.output
+    assert "Submitting to daemon" in outcome.output
+    assert status["done"] == 1
+    assert (tmp_path / "client" / "aaaaaaaaaaa.txt").read_text() == "hello"
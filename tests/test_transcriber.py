@@ -1,7 +1,13 @@
+import importlib
 from unittest.mock import MagicMock, patch
 
-from src.config import WhisperConfig
-from src.transcriber import Transcriber
+import numpy as np
+import pytest
+
+from src.config import CacheConfig, WhisperConfig
+from src.exceptions import InsufficientMemoryError
+from src.transcriber import InvalidAudioError, Transcriber, TranscriptionProgress
+from src.utils import AudioInfo
 
 
 def test_transcriber_init():
@@ -12,9 +18,9 @@ def test_transcriber_init():
 
 
 @patch("src.transcriber.whisper.load_model")
-@patch("src.transcriber.validate_audio_file")
-def test_transcribe_success(mock_validate, mock_load_model, tmp_path):
-    mock_validate.return_value = True
+@patch("src.transcriber.probe_audio")
+def test_transcribe_success(mock_probe, mock_load_model, tmp_path):
+    mock_probe.return_value = AudioInfo(1.0, "mp3", 44100, 2, 1024)
 
     mock_model = MagicMock()
     mock_model.transcribe.return_value = {"text": "Test transcription", "segments": []}
@@ -29,3 +35,132 @@ def test_transcribe_success(mock_validate, mock_load_model, tmp_path):
 
     assert result["text"] == "Test transcription"
     mock_model.transcribe.assert_called_once()
+
+
+@patch("src.transcriber.whisper.load_model")
+@patch("src.transcriber.probe_audio")
+def test_transcribe_invalid_audio(mock_probe, mock_load_model, tmp_path):
+    mock_probe.return_value = None
+
+    transcriber = Transcriber(WhisperConfig())
+    with pytest.raises(InvalidAudioError):
+        transcriber.transcribe(tmp_path / "missing.mp3")
+
+    mock_load_model.assert_not_called()
+
+
+@patch("src.transcriber.whisper.load_model")
+@patch("src.transcriber.probe_audio")
+def test_transcribe_records_memory_measurements(
+    mock_probe, mock_load_model, tmp_path, isolate_memory_governor
+):
+    mock_probe.return_value = AudioInfo(90.0, "mp3", 44100, 2, 1024)
+    mock_load_model.return_value.transcribe.return_value = {"text": "", "segments": []}
+    audio_path = tmp_path / "test.mp3"
+    audio_path.touch()
+
+    transcriber = Transcriber(WhisperConfig(model="tiny", device="cpu"))
+    transcriber.transcribe(audio_path)
+
+    samples = isolate_memory_governor._models["tiny/cpu/fp32"]
+    assert "load_peak_mb" in samples
+    assert samples["decode"][0][0] == 90.0
+
+
+@patch("src.transcriber.whisper.load_model")
+def test_load_refused_when_model_does_not_fit(mock_load_model, monkeypatch):
+    monkeypatch.setattr("src.memory.available_mb", lambda: 100.0)
+
+    with pytest.raises(InsufficientMemoryError, match="required for base model"):
+        Transcriber(WhisperConfig(model="base", device="cpu"))._load_model()
+    mock_load_model.assert_not_called()
+
+
+@patch("src.transcriber.whisper.load_model")
+@patch("src.transcriber.probe_audio")
+@patch("src.audio_cache.load_audio")
+def test_transcribe_passes_cached_pcm(mock_load_audio, mock_probe, mock_load_model, tmp_path):
+    mock_load_audio.return_value = np.ones(16000, dtype=np.float32)
+    mock_probe.return_value = AudioInfo(1.0, "mp3", 44100, 2, 1024)
+    mock_model = MagicMock()
+    mock_model.transcribe.return_value = {"text": "Test transcription", "segments": []}
+    mock_load_model.return_value = mock_model
+
+    audio_path = tmp_path / "test.mp3"
+    audio_path.write_bytes(b"audio")
+
+    transcriber = Transcriber(WhisperConfig(), CacheConfig(directory=tmp_path / ".cache"))
+    transcriber.transcribe(audio_path)
+    transcriber.transcribe(audio_path)
+
+    mock_load_audio.assert_called_once()
+    audio = mock_model.transcribe.call_args.args[0]
+    assert isinstance(audio, np.ndarray)
+    assert audio.shape == (16000,)
+
+
+def test_transcription_progress_rates():
+    progress = TranscriptionProgress(
+        processed_seconds=60.0, total_seconds=240.0, elapsed_seconds=15.0
+    )
+
+    assert progress.fraction == 0.25
+    assert progress.realtime_factor == 0.25
+    assert progress.eta_seconds == 45.0
+    assert TranscriptionProgress(0.0, 240.0, 1.0).eta_seconds is None
+
+
+@patch("src.transcriber.whisper.load_model")
+@patch("src.transcriber.probe_audio")
+def test_transcribe_reports_stock_decoder_progress(mock_probe, mock_load_model, tmp_path):
+    tqdm = importlib.import_module("whisper.transcribe").tqdm
+    mock_probe.return_value = AudioInfo(2.0, "mp3", 44100, 2, 1024)
+
+    def fake_transcribe(audio, **kwargs):
+        # Mirrors whisper.transcribe(): 100 mel frames per second of audio
+        shim = importlib.import_module("whisper.transcribe").tqdm
+        assert shim is not tqdm
+        with shim.tqdm(total=200, unit="frames", disable=True) as pbar:
+            pbar.update(50)
+            pbar.update(100)
+        return {"text": "", "segments": [{"text": "a"}]}
+
+    mock_model = MagicMock()
+    mock_model.transcribe.side_effect = fake_transcribe
+    mock_load_model.return_value = mock_model
+
+    audio_path = tmp_path / "test.mp3"
+    audio_path.touch()
+
+    updates = []
+    Transcriber(WhisperConfig()).transcribe(audio_path, progress_callback=updates.append)
+
+    assert [u.processed_seconds for u in updates] == [0.5, 1.5, 2.0]
+    assert updates[-1].segments == 1
+    assert all(u.total_seconds == 2.0 for u in updates)
+    # whisper's own tqdm is only replaced while the decode runs
+    assert importlib.import_module("whisper.transcribe").tqdm is tqdm
+
+
+@patch("src.transcriber.whisper.load_model")
+@patch("src.transcriber.probe_audio")
+@patch("src.audio_cache.load_audio")
+def test_progress_total_from_decoded_audio_when_probe_has_no_duration(
+    mock_load_audio, mock_probe, mock_load_model, tmp_path
+):
+    mock_load_audio.return_value = np.zeros(16000 * 3, dtype=np.float32)
+    mock_probe.return_value = AudioInfo(None, "wav", 16000, 1, 1024)
+    mock_model = MagicMock()
+    mock_model.transcribe.return_value = {"text": "", "segments": []}
+    mock_load_model.return_value = mock_model
+
+    audio_path = tmp_path / "test.wav"
+    audio_path.write_bytes(b"audio")
+
+    updates = []
+    cache = CacheConfig(directory=tmp_path / ".cache", results_enabled=False)
+    transcriber = Transcriber(WhisperConfig(), cache)
+    transcriber.transcribe(audio_path, progress_callback=updates.append)
+
+    assert updates[-1].total_seconds == 3.0
+    assert updates[-1].fraction == 1.0
@@ -0,0 +1,68 @@
+from src.url_index import UrlIndex, canonicalize_url, youtube_video_id
+
+
+def test_youtube_url_variants_share_canonical_form():
+    expected = "https://www.youtube.com/watch?v=dQw4w9WgXcQ"
+    variants = [
+        "https://www.youtube.com/watch?v=dQw4w9WgXcQ",
+        "https://youtube.com/watch?v=dQw4w9WgXcQ&list=PL123&index=2&t=42s",
+        "https://m.youtube.com/watch?feature=share&v=dQw4w9WgXcQ",
+        "https://youtu.be/dQw4w9WgXcQ?si=tracking",
+        "https://www.youtube.com/shorts/dQw4w9WgXcQ",
+        "https://www.youtube.com/embed/dQw4w9WgXcQ",
+        "  https://music.youtube.com/watch?v=dQw4w9WgXcQ  ",
+    ]
+    for url in variants:
+        assert canonicalize_url(url) == expected
+
+
+def test_youtube_video_id_rejects_non_video_urls():
+    assert youtube_video_id("https://www.youtube.com/@channel") is None
+    assert youtube_video_id("https://www.youtube.com/playlist?list=PL123") is None
+    assert youtube_video_id("https://example.com/watch?v=dQw4w9WgXcQ") is None
+
+
+def test_generic_urls_drop_tracking_parameters():
+    assert canonicalize_url("https://Example.com/ep/1/?utm_source=x&b=2&a=1#top") == (
+        "https://example.com/ep/1?a=1&b=2"
+    )
+
+
+def test_index_persists_and_ignores_missing_files(tmp_path):
+    audio_path = tmp_path / "abc.mp3"
+    audio_path.touch()
+
+    UrlIndex(tmp_path / "index.json").record("https://youtu.be/dQw4w9WgXcQ", "abc", audio_path)
+    index = UrlIndex(tmp_path / "index.json")
+
+    assert index.lookup("https://www.youtube.com/watch?v=dQw4w9WgXcQ") == audio_path
+    audio_path.unlink()
+    assert index.lookup("https://www.youtube.com/watch?v=dQw4w9WgXcQ") is None
+
+
+def test_index_appends_records_and_compacts_on_load(tmp_path):
+    path = tmp_path / "index.jsonl"
+    first, second = tmp_path / "a.mp3", tmp_path / "b.mp3"
+    first.touch()
+    second.touch()
+    index = UrlIndex(path)
+    index.record("https://youtu.be/dQw4w9WgXcQ", "dQw4w9WgXcQ", first)
+    index.record("https://www.youtube.com/watch?v=dQw4w9WgXcQ", "dQw4w9WgXcQ", second)
+    with path.open("a") as f:
+        f.write('{"url": "https://www.youtube.com/watch?v=dQw4')
+    assert len(path.read_text().splitlines()) == 3
+
+    reloaded = UrlIndex(path)
+
+    assert reloaded.lookup("https://youtu.be/dQw4w9WgXcQ") == second
+    assert len(path.read_text().splitlines()) == 1
+
+
+def test_url_locks_are_dropped_once_released(tmp_path):
+    index = UrlIndex(tmp_path / "index.jsonl")
+
+    with index.lock_for("https://youtu.be/dQw4w9WgXcQ"):
+        with index.lock_for("https://example.com/episode.mp3"):
+            assert len(index._url_locks) == 2
+
+    assert index._url_locks == {}
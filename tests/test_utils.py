@@ -1,5 +1,15 @@
+import json
+import subprocess
+from unittest.mock import patch
 
-from src.utils import check_disk_space, estimate_ram_requirement, sanitize_filename
+from src import utils
+from src.utils import (
+    check_disk_space,
+    estimate_ram_requirement,
+    probe_audio,
+    sanitize_filename,
+    validate_audio_file,
+)
 
 
 def test_sanitize_filename():
@@ -19,3 +29,50 @@ def test_ram_estimation():
     assert estimate_ram_requirement("tiny") == 200
     assert estimate_ram_requirement("large-v3") == 8000
     assert estimate_ram_requirement("invalid") == 1000
+
+
+def test_ram_estimation_without_models_yaml(tmp_path):
+    # An installed package does not ship config/models.yaml
+    utils._model_table.cache_clear()
+    try:
+        with patch("src.utils.MODELS_CONFIG_PATH", tmp_path / "missing.yaml"):
+            assert estimate_ram_requirement("large-v3") == 8000
+            assert estimate_ram_requirement("tiny") == 200
+    finally:
+        utils._model_table.cache_clear()
+
+
+def test_probe_audio_reads_stream_headers(tmp_path):
+    audio_path = tmp_path / "test.m4a"
+    audio_path.write_bytes(b"data")
+    output = {
+        "streams": [{"codec_name": "aac", "sample_rate": "44100", "channels": 2}],
+        "format": {"duration": "5400.25"},
+    }
+
+    with (
+        patch("src.utils.shutil.which", return_value="/usr/bin/ffprobe"),
+        patch("src.utils.subprocess.run") as mock_run,
+    ):
+        mock_run.return_value = subprocess.CompletedProcess([], 0, stdout=json.dumps(output))
+        info = probe_audio(audio_path)
+
+    assert info.duration == 5400.25
+    assert info.codec == "aac"
+    assert info.sample_rate == 44100
+    assert info.channels == 2
+    assert info.size_bytes == 4
+
+
+def test_validate_audio_file_without_audio_stream(tmp_path):
+    audio_path = tmp_path / "video.mp4"
+    audio_path.write_bytes(b"data")
+
+    with (
+        patch("src.utils.shutil.which", return_value="/usr/bin/ffprobe"),
+        patch("src.utils.subprocess.run") as mock_run,
+    ):
+        mock_run.return_value = subprocess.CompletedProcess([], 0, stdout='{"streams": []}')
+        assert validate_audio_file(audio_path) is False
+
+    assert validate_audio_file(tmp_path / "missing.mp3") is False
@@ -0,0 +1,99 @@
+import threading
+
+import torch
+import whisper
+
+from src import weight_cache
+from src.config import WhisperConfig
+from src.model_cache import get_registry
+from src.transcriber import Transcriber
+from tests.test_quantization import tiny_model
+
+
+def test_mappable_copy_round_trips(tmp_path):
+    model = tiny_model()
+    path = tmp_path / "tiny.pt"
+
+    weight_cache.save_mappable(model, path)
+    loaded = weight_cache.load_mappable(path, "custom")
+
+    assert torch.equal(loaded.decoder.mask, model.decoder.mask)
+    assert torch.equal(loaded.alignment_heads.to_dense(), model.alignment_heads.to_dense())
+
+    mel = torch.randn(1, 80, 3000)
+    tokens = torch.tensor([[50258, 50259, 50359]])
+    with torch.no_grad():
+        assert torch.allclose(loaded(mel, tokens), model(mel, tokens))
+
+
+def test_load_fast_converts_once(tmp_path, monkeypatch):
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+    loads = []
+
+    def load_checkpoint():
+        loads.append(1)
+        return tiny_model()
+
+    first = weight_cache.load_fast("custom", "cpu", load_checkpoint)
+    second = weight_cache.load_fast("custom", "cpu", load_checkpoint)
+
+    assert loads == [1]
+    assert weight_cache.mmap_cache_path("custom").parent == tmp_path / "whisper" / "mmap"
+    assert torch.equal(first.encoder.conv1.weight, second.encoder.conv1.weight)
+
+
+def test_load_fast_replaces_damaged_copy(tmp_path, monkeypatch):
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+    path = weight_cache.mmap_cache_path("custom")
+    path.parent.mkdir(parents=True)
+    path.write_bytes(b"truncated")
+
+    model = weight_cache.load_fast("custom", "cpu", tiny_model)
+
+    assert torch.equal(model.encoder.conv1.weight, tiny_model().encoder.conv1.weight)
+    assert weight_cache.load_mappable(path, "custom") is not None
+
+
+def test_transcriber_loads_mapped_copy_after_first_run(mocker):
+    load_model = mocker.patch(
+        "src.transcriber.whisper.load_model", side_effect=lambda *a, **k: tiny_model()
+    )
+    config = WhisperConfig(model="custom", device="cpu", fast_load=True)
+
+    Transcriber(config)._load_model()
+    get_registry().clear()
+    Transcriber(config)._load_model()
+    assert load_model.call_count == 1
+
+    get_registry().clear()
+    Transcriber(config.model_copy(update={"fast_load": False}))._load_model()
+    assert load_model.call_count == 2
+
+
+def test_mappable_copy_is_keyed_by_checkpoint(tmp_path):
+    checkpoint = tmp_path / "custom.pt"
+    checkpoint.write_bytes(b"v1")
+    first = weight_cache.mmap_cache_path(str(checkpoint))
+    checkpoint.write_bytes(b"v2 is longer")
+
+    assert weight_cache.mmap_cache_path(str(checkpoint)) != first
+    assert first.name.startswith("custom-")
+    sha = whisper._MODELS["tiny"].split("/")[-2]
+    assert sha[:16] in weight_cache.mmap_cache_path("tiny").name
+
+
+def test_skipping_weight_init_only_affects_this_thread():
+    initialized = []
+
+    def build():
+        initialized.append(torch.nn.Linear(64, 64).weight.abs().sum().item() > 0)
+
+    with weight_cache._SkipWeightInit():
+        other = threading.Thread(target=build)
+        other.start()
+        other.join()
+        skipped = torch.nn.Linear(64, 64)
+
+    assert initialized == [True]
+    assert torch.nn.init.kaiming_uniform_.__module__ == "torch.nn.init"
+    assert skipped.weight.shape == (64, 64)
@@ -0,0 +1,79 @@
+import dataclasses
+import threading
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+import torch
+
+from src.config import WhisperConfig
+from src.transcriber import Transcriber
+from src.worker_pool import TranscriptionPool, _start_method, partition_cpus
+from tests.test_quantization import DIMS, tiny_model
+
+
+@pytest.fixture
+def checkpoint(tmp_path):
+    # A file path, so the workers can load it without downloading anything
+    path = tmp_path / "tiny.pt"
+    torch.save(
+        {"dims": dataclasses.asdict(DIMS), "model_state_dict": tiny_model().state_dict()}, path
+    )
+    return str(path)
+
+
+def test_partition_cpus_splits_evenly():
+    with patch("src.worker_pool.os.sched_getaffinity", return_value={0, 1, 2, 3}, create=True):
+        assert partition_cpus(2, 2) == [[0, 1], [2, 3]]
+
+
+def test_workers_are_never_forked():
+    assert _start_method() in ("forkserver", "spawn")
+
+
+def test_pool_started_from_a_thread_maps_chunks_in_order(checkpoint):
+    config = WhisperConfig(model=checkpoint, device="cpu", language="en", threads_per_worker=1)
+    rng = np.random.default_rng(0)
+    chunks = [(0.1 * rng.standard_normal(16000 * n)).astype(np.float32) for n in (1, 2, 3)]
+    expected = [Transcriber(config)._decode(Transcriber(config)._load_model(), c) for c in chunks]
+
+    results = []
+
+    def run():
+        # Another thread is alive while the pool starts, like in the pipeline
+        with TranscriptionPool(config, workers=2) as pool:
+            results.extend(pool.map_audio(chunks))
+
+    runner = threading.Thread(target=run)
+    runner.start()
+    runner.join(120)
+
+    assert [r["text"] for r in results] == [r["text"] for r in expected]
+
+
+@pytest.mark.parametrize("precision, mapped", [("fp32", True), ("int8", False)])
+def test_pool_caps_workers_by_model_and_decode_memory(
+    checkpoint, isolate_memory_governor, precision, mapped
+):
+    config = WhisperConfig(
+        model=checkpoint, device="cpu", precision=precision, threads_per_worker=1
+    )
+    pool = TranscriptionPool(config, workers=4, audio_seconds=60)
+
+    with (
+        patch.object(isolate_memory_governor, "workers_that_fit", return_value=1) as fit,
+        patch("src.worker_pool.ProcessPoolExecutor"),
+    ):
+        pool.start()
+
+    key, requested, seconds, model_mb = fit.call_args.args
+    assert (requested, seconds) == (4, 60)
+    # Several workers always map one copy of the weights, written by the parent
+    assert pool.config.fast_load and not config.fast_load
+    if mapped:
+        assert model_mb == 0
+    else:
+        # Quantized weights are private to each worker
+        assert model_mb == isolate_memory_governor.load_mb(key) > 0
+    assert pool.workers == 1
+    pool.close()